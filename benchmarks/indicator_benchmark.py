@@ -0,0 +1,63 @@
+import argparse
+import time
+
+from indicators import batch_indicators, indicator_base, momentum_indicators, trend_indicators, volatility_indicators
+from indicators.indicator_base import apply_indicators
+from indicators.indicator_records import build_indicator_records, records_to_dict
+from mock_exchange.rest_server import SyntheticMarket
+from services.candle_store import klines_to_records
+
+INDICATOR_MODULES = [indicator_base, trend_indicators, momentum_indicators, volatility_indicators]
+
+
+def make_coins_data(coin_count, candle_limit, seed):
+    # One USDT pair per coin with the candle records the data fetcher would pass on
+    market = SyntheticMarket(symbol_count=coin_count, seed=seed)
+    return {
+        symbol: {"candlesticks": {symbol: klines_to_records(market.klines(symbol, candle_limit))}}
+        for symbol in market.base_prices
+    }
+
+
+def set_backend(backend):
+    for module in INDICATOR_MODULES:
+        module.config["INDICATOR_BACKEND"] = backend
+
+
+def run_backend(backend, coins_data, repeats, tail_length=1):
+    set_backend(backend)
+    batch_indicators.config["INDICATOR_TAIL_LENGTH"] = tail_length
+
+    # Keep the fastest run to leave out warm-up and noise from other processes
+    best = float("inf")
+    indicators = None
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        indicators = apply_indicators(coins_data)
+        best = min(best, time.perf_counter() - started_at)
+
+    return best, records_to_dict(build_indicator_records(indicators))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the pandas, NumPy and batch indicator backends")
+    parser.add_argument("--coins", type=int, default=200, help="Number of coins to calculate indicators for")
+    parser.add_argument("--candles", type=int, default=26, help="Candles per coin, like CANDLESTICK_LIMIT")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per backend, the fastest one is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes the coins are split over")
+    args = parser.parse_args()
+
+    coins = make_coins_data(args.coins, args.candles, args.seed)
+    indicator_base.config["PARALLEL_INDICATORS"] = {"WORKERS": args.workers, "MIN_COINS_PER_WORKER": 1}
+
+    results = {}
+    # The batch backend once with whole series and once with only the last values
+    runs = [("pandas", "pandas", 1), ("numpy", "numpy", 1), ("batch full", "batch", 0), ("batch tail", "batch", 1)]
+    for name, backend_name, tail_length in runs:
+        elapsed, results[name] = run_backend(backend_name, coins, args.repeats, tail_length)
+        print(f"{name:>10}: {elapsed * 1000:.1f} ms for {len(coins)} coins, "
+              f"{elapsed / len(coins) * 1e6:.0f} µs per coin")
+
+    # Indicators are rounded in their records, so every backend must give exactly the same output
+    print(f"Identical indicator records: {all(result == results['pandas'] for result in results.values())}")
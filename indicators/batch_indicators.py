@@ -0,0 +1,195 @@
+import numpy as np
+
+from indicators import indicator_graph
+from indicators.indicator_graph import IndicatorGraph
+from indicators.indicator_selection import is_selected
+from indicators.momentum_indicators import simplify_momentum_indicators
+from indicators.trend_indicators import simplify_trend_indicators
+from indicators.volatility_indicators import simplify_volatility_indicators
+from utils.file_utils import load_config_values
+
+config = load_config_values("TREND_INDICATORS", "MOMENTUM_INDICATORS", "VOLATILITY_INDICATORS",
+                            "INDICATOR_TAIL_LENGTH")
+
+
+def stack_prices(price_lists, matrix=None):
+    # Align the latest candle of every coin in the last column, shorter histories start with NaN.
+    # The matrix can be given, e.g. in shared memory, it must have room for the longest history.
+    lengths = np.array([len(prices) for prices in price_lists], dtype=np.int64)
+    if matrix is None:
+        matrix = np.empty((len(price_lists), lengths.max(initial=0)))
+    matrix[...] = np.nan
+    for row, prices in zip(matrix, price_lists):
+        if len(prices):
+            row[-len(prices):] = prices
+
+    return matrix, lengths
+
+
+def add_indicator(indicators, name, result, mask):
+    # Keep the rows of every coin, together with the coins that have enough candles for the indicator
+    if result is not None:
+        indicators[name] = (result, mask)
+
+
+def calculate_trend_batch(graph, lengths, selected_indicators=None):
+    indicators = {}
+    try:
+        trend_config = config['TREND_INDICATORS']
+
+        # Simple and Exponential Moving Averages
+        sma_period = trend_config['SMA_WINDOW']
+        if is_selected('SMA', selected_indicators):
+            add_indicator(indicators, 'SMA', indicator_graph.calculate_sma(graph, sma_period), lengths >= sma_period)
+        ema_period = trend_config['EMA_WINDOW']
+        if is_selected('EMA', selected_indicators):
+            add_indicator(indicators, 'EMA', indicator_graph.calculate_ema(graph, ema_period), lengths >= ema_period)
+
+        # MACD
+        macd_config = trend_config['MACD']
+        if is_selected('MACD', selected_indicators):
+            add_indicator(
+                indicators, 'MACD',
+                indicator_graph.calculate_macd(graph, macd_config['SHORT_WINDOW'], macd_config['LONG_WINDOW'],
+                                               macd_config['SIGNAL_WINDOW']),
+                lengths >= macd_config['LONG_WINDOW'],
+            )
+
+        # Ichimoku Cloud, none of its lines is simplified so it is skipped when only the last values are needed
+        if is_selected('Ichimoku', selected_indicators) and graph.tail_length is None:
+            ichimoku_config = trend_config['ICHIMOKU']
+            windows = (ichimoku_config['TENKAN_WINDOW'], ichimoku_config['KIJUN_WINDOW'],
+                       ichimoku_config['SENKOU_B_WINDOW'])
+            add_indicator(
+                indicators, 'Ichimoku',
+                indicator_graph.calculate_ichimoku_cloud(graph, *windows, ichimoku_config['SENKOU_SHIFT']),
+                lengths >= max(windows),
+            )
+
+    except Exception as e:
+        print(f"Error in calculating basic indicators: {e}")
+
+    return indicators
+
+
+def calculate_momentum_batch(graph, lengths, selected_indicators=None):
+    indicators = {}
+    try:
+        momentum_config = config['MOMENTUM_INDICATORS']
+
+        # Relative Strength Index (RSI)
+        rsi_period = momentum_config['RSI_WINDOW']
+        if is_selected('RSI', selected_indicators):
+            add_indicator(indicators, 'RSI', indicator_graph.calculate_rsi(graph, rsi_period), lengths >= rsi_period)
+
+        # Stochastic Oscillator
+        stochastic_window = momentum_config['STOCHASTIC']['WINDOW']
+        if is_selected('StochasticOscillator', selected_indicators):
+            add_indicator(
+                indicators, 'StochasticOscillator',
+                indicator_graph.calculate_stochastic_oscillator(graph, stochastic_window,
+                                                                momentum_config['STOCHASTIC']['SMOOTH_WINDOW']),
+                lengths >= stochastic_window,
+            )
+
+        # Williams %R
+        williams_r_window = momentum_config['WILLIAMS_R_WINDOW']
+        if is_selected('Williams%R', selected_indicators):
+            add_indicator(indicators, 'Williams%R',
+                          indicator_graph.calculate_williams_r(graph, williams_r_window),
+                          lengths >= williams_r_window)
+
+        # Commodity Channel Index (CCI)
+        cci_window = momentum_config['CCI_WINDOW']
+        if is_selected('CCI', selected_indicators):
+            add_indicator(indicators, 'CCI', indicator_graph.calculate_cci(graph, cci_window),
+                          lengths >= cci_window)
+
+    except Exception as e:
+        print(f"Error in calculating momentum indicators: {e}")
+
+    return indicators
+
+
+def calculate_volatility_batch(graph, lengths, selected_indicators=None):
+    indicators = {}
+    try:
+        volatility_config = config['VOLATILITY_INDICATORS']
+
+        # Bollinger Bands
+        if is_selected('BollingerBands', selected_indicators) and 'BOLLINGER_BANDS' in volatility_config:
+            bollinger_window = volatility_config['BOLLINGER_BANDS']['WINDOW']
+            add_indicator(
+                indicators, 'BollingerBands',
+                indicator_graph.calculate_bollinger_bands(graph, bollinger_window,
+                                                          volatility_config['BOLLINGER_BANDS']['NUM_STD_DEV']),
+                lengths >= bollinger_window,
+            )
+
+        # Average True Range (ATR)
+        atr_window = volatility_config['ATR_WINDOW']
+        if is_selected('ATR', selected_indicators):
+            add_indicator(indicators, 'ATR', indicator_graph.calculate_atr(graph, atr_window),
+                          lengths >= atr_window)
+
+    except KeyError as e:
+        print(f"Missing config key: {e}")
+    except Exception as e:
+        print(f"Error in calculating volatility indicators: {e}")
+
+    return indicators
+
+
+def select_row(result, row):
+    # Row of a single coin from an indicator, or from each part of a multi-line indicator
+    if isinstance(result, dict):
+        return {key: select_row(value, row) for key, value in result.items()}
+    return result[row]
+
+
+def select_coin_indicators(batch_indicators, row):
+    return {
+        name: select_row(result, row)
+        for name, (result, mask) in batch_indicators.items()
+        if mask[row]
+    }
+
+
+def calculate_batch_indicators(prices, selected_indicators=None):
+    # Prices per coin as (highs, lows, closes), every indicator is calculated once for all coins
+    coins = list(prices)
+    if not coins:
+        return {}
+
+    highs, lengths = stack_prices([prices[coin][0] for coin in coins])
+    lows, _ = stack_prices([prices[coin][1] for coin in coins])
+    closes, _ = stack_prices([prices[coin][2] for coin in coins])
+
+    return calculate_matrix_indicators(coins, highs, lows, closes, lengths, selected_indicators)
+
+
+def calculate_matrix_indicators(coins, highs, lows, closes, lengths, selected_indicators=None):
+    # Intermediates such as rolling extremes and true range are shared by every indicator that needs them.
+    # Only the last values are simplified, so with a tail length the earlier ones are never calculated. The pandas
+    # and NumPy backends calculate one coin at a time without the graph and have no tail mode.
+    graph = IndicatorGraph(highs, lows, closes, config['INDICATOR_TAIL_LENGTH'] or None)
+    trend = calculate_trend_batch(graph, lengths, selected_indicators)
+    momentum = calculate_momentum_batch(graph, lengths, selected_indicators)
+    volatility = calculate_volatility_batch(graph, lengths, selected_indicators)
+    print(f"Indicator graph report: {graph.get_report()}")
+
+    # Simplify the rows of each coin like the indicators of a single coin
+    indicators = {}
+    for row, coin in enumerate(coins):
+        try:
+            # The simplify functions only read the latest close, which is in the last column
+            close_prices = closes[row, -1:].tolist() if lengths[row] else []
+            indicators[coin] = {
+                'trend': simplify_trend_indicators(select_coin_indicators(trend, row), close_prices),
+                'momentum': simplify_momentum_indicators(select_coin_indicators(momentum, row)),
+                'volatility': simplify_volatility_indicators(select_coin_indicators(volatility, row), close_prices)
+            }
+        except Exception as e:
+            print(f"Error calculating indicators for {coin}: {e}")
+
+    return indicators
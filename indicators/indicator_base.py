@@ -1,66 +1,154 @@
+import time
+
 import numpy as np
 
+from indicators.batch_indicators import calculate_batch_indicators, calculate_matrix_indicators
+from indicators.indicator_cache import IndicatorCache, get_cache_key, get_settings_hash
+from indicators.indicator_records import build_indicator_records, records_to_dict
+from indicators.indicator_selection import get_selection_report, select_indicators
 from indicators.momentum_indicators import calculate_momentum_indicators, simplify_momentum_indicators
+from indicators.parallel_indicators import calculate_in_parallel
 from indicators.trend_indicators import calculate_trend_indicators, simplify_trend_indicators
+from indicators.streaming_indicators import StreamingIndicators, include_open_candle
 from indicators.volatility_indicators import calculate_volatility_indicators, simplify_volatility_indicators
-from utils.file_utils import save_data_to_file
+from utils.file_utils import save_data_to_file, load_config_values, get_data_path
+
+config = load_config_values("INDICATOR_BACKEND", "INDICATOR_QUOTE_ASSETS", "STREAMING_INDICATORS",
+                            "PARALLEL_INDICATORS", "INDICATOR_CACHE")
+
+# Indicator states carried from one cycle to the next, only created by the streaming backend
+streaming_indicators = None
+
+# Indicators of unchanged candles, created by the first cycle with the cache enabled
+indicator_cache = None
+
 
+def calculate_indicators(coins_data, required_fields=None):
+    # Only calculate the indicators producing a required field, e.g. the fields read by the scoring systems
+    selected_indicators = select_indicators(required_fields)
+    print(f"Indicator selection: {get_selection_report(selected_indicators, len(coins_data))}")
 
-def calculate_indicators(coins_data):
-    # Get indicators
-    indicators = apply_indicators(coins_data)
+    # Get indicators, coins with unchanged candles come from the cache. The streaming backend has to see every
+    # candle to keep its states up to date, and only processes the new candles anyway.
+    if config['INDICATOR_CACHE']['MAX_ENTRIES'] > 0 and config['INDICATOR_BACKEND'] != 'streaming':
+        indicators = apply_cached_indicators(coins_data, selected_indicators)
+    else:
+        indicators = apply_indicators(coins_data, selected_indicators)
 
-    # Clean indicators
-    cleaned_indicators = clean_indicators(indicators)
+    # Typed records with plain, rounded values
+    indicator_records = build_indicator_records(indicators)
 
     # Save indicators to a file
-    save_data_to_file(cleaned_indicators, "indicators", "indicators")
+    save_data_to_file(records_to_dict(indicator_records), "indicators", "indicators")
+
+    # Return the indicator records
+    return indicator_records
+
+
+def get_quote_asset(coin_data, coin, pair):
+    # Quote asset of a pair the coin is the base asset of, None for pairs where the coin is the quote asset
+    metadata = coin_data.get("pair_metadata", {}).get(pair)
+    if metadata is not None:
+        return metadata["quoteAsset"] if metadata["baseAsset"] == coin else None
+    return pair[len(coin):] if pair.startswith(coin) and pair != coin else None
+
 
-    # Return the cleaned_indicators
-    return cleaned_indicators
+def select_primary_pair(coin_data, coin):
+    # Pair the indicators of a coin are calculated on: the first configured quote asset the coin is traded in,
+    # otherwise the pair with the most candles, preferring pairs where the coin is the base asset
+    candlestick_data = coin_data.get("candlesticks", {})
+    quote_assets = config['INDICATOR_QUOTE_ASSETS']
 
+    def rank(pair):
+        quote_asset = get_quote_asset(coin_data, coin, pair)
+        preference = quote_assets.index(quote_asset) if quote_asset in quote_assets else len(quote_assets)
+        return preference, quote_asset is None, -len(candlestick_data[pair])
 
-def extract_ohlc_prices(coins_data, coin):
+    pairs = [pair for pair, data_list in candlestick_data.items() if len(data_list)]
+    return min(pairs, key=rank) if pairs else None
+
+
+def extract_ohlc_prices(coins_data, coin, pair=None):
     # Use `get` to avoid KeyError if coin is missing, return empty dictionary if coin not found
-    candlestick_data = coins_data.get(coin, {}).get("candlesticks", {})
+    coin_data = coins_data.get(coin, {})
+    if pair is None:
+        pair = select_primary_pair(coin_data, coin)
 
-    # Lists to store prices
-    high_prices = []
-    low_prices = []
-    close_prices = []
+    # The candles of one pair only, pairs in other quote assets are not a continuation of the same series
+    data_list = coin_data.get("candlesticks", {}).get(pair, [])
 
-    # Loop through all candlestick data for each pair and extract high, low, and close prices
-    for pair, data_list in candlestick_data.items():
-        high_prices.extend([float(ohlcv[2]) for ohlcv in data_list])
-        low_prices.extend([float(ohlcv[3]) for ohlcv in data_list])
-        close_prices.extend([float(ohlcv[4]) for ohlcv in data_list])
+    # Candle records already hold parsed prices, one contiguous float64 array is copied out per price
+    if isinstance(data_list, np.ndarray):
+        return tuple(np.ascontiguousarray(data_list[field]) for field in ("high", "low", "close"))
+
+    # Raw klines are parsed in one pass, strings are converted like `float` does
+    prices = np.array([ohlcv[2:5] for ohlcv in data_list], dtype=np.float64).reshape(-1, 3).T.copy()
+    high_prices, low_prices, close_prices = prices
 
     return high_prices, low_prices, close_prices
 
 
-def clean_indicators(indicators):
-    def convert_value(value):
-        # Convert NumPy scalars to Python types
-        if isinstance(value, (np.float64, np.float32)):
-            return round(float(value), 4)
-        elif isinstance(value, (np.int64, np.int32, np.int_)):
-            return int(value)
-        elif isinstance(value, np.bool_):
-            return bool(value)
-        elif isinstance(value, dict):
-            return {k: convert_value(v) for k, v in value.items()}
-        elif isinstance(value, list):
-            return [convert_value(v) for v in value]
-        elif isinstance(value, float):
-            return round(value, 4)
-        else:
-            return value
-
-    # Clean the entire indicators dictionary
-    return {coin: convert_value(data) for coin, data in indicators.items()}
-
-
-def apply_indicators(coins_data):
+def get_indicator_cache():
+    global indicator_cache
+
+    # Continue with the results of the last run, if they were saved
+    if indicator_cache is None:
+        indicator_cache = IndicatorCache(config['INDICATOR_CACHE']['MAX_ENTRIES'])
+        cache_file = config['INDICATOR_CACHE']['CACHE_FILE']
+        if cache_file:
+            indicator_cache.load(get_data_path(cache_file))
+
+    return indicator_cache
+
+
+def apply_cached_indicators(coins_data, selected_indicators=None):
+    cache = get_indicator_cache()
+    settings_hash = get_settings_hash(config['INDICATOR_BACKEND'], selected_indicators)
+    cached = {}
+    keys = {}
+
+    # Look up every coin by the fingerprint of the candles of its primary pair
+    for coin, data in coins_data.items():
+        pair = select_primary_pair(data, coin)
+        if pair is None:
+            continue
+        keys[coin] = get_cache_key(pair, data["candlesticks"][pair], settings_hash)
+        indicators = cache.get(keys[coin])
+        if indicators is not None:
+            cached[coin] = indicators
+
+    # Calculate the other coins with the configured backend and keep their results
+    calculated = apply_indicators({coin: data for coin, data in coins_data.items() if coin not in cached},
+                                  selected_indicators)
+    for coin, indicators in calculated.items():
+        if coin in keys:
+            cache.put(keys[coin], indicators)
+
+    print(f"Indicator cache: {cache.get_report()}")
+
+    # Only rewrite the cache file when entries were added
+    cache_file = config['INDICATOR_CACHE']['CACHE_FILE']
+    if cache_file and calculated:
+        cache.save(get_data_path(cache_file))
+
+    # Keep the order of the coins
+    return {coin: cached[coin] if coin in cached else calculated[coin]
+            for coin in coins_data if coin in cached or coin in calculated}
+
+
+def apply_indicators(coins_data, selected_indicators=None):
+    # Calculate each indicator once for all coins instead of once per coin
+    if config['INDICATOR_BACKEND'] == 'batch':
+        return apply_batch_indicators(coins_data, selected_indicators)
+
+    # Only process the candles that closed since the last cycle
+    if config['INDICATOR_BACKEND'] == 'streaming':
+        return apply_streaming_indicators(coins_data, selected_indicators)
+
+    # Shard the coins over worker processes
+    if config['PARALLEL_INDICATORS']['WORKERS'] > 1:
+        return apply_parallel_indicators(coins_data, selected_indicators)
+
     indicators = {}
 
     # Loop through each coin
@@ -75,23 +163,117 @@ def apply_indicators(coins_data):
                 continue
 
             # Calculate indicators
-            trend_indicators = calculate_trend_indicators(high_prices, low_prices, close_prices)
-            momentum_indicators = calculate_momentum_indicators(high_prices, low_prices, close_prices)
-            volatility_indicators = calculate_volatility_indicators(high_prices, low_prices, close_prices)
-
-            # Simplify the data into the latest value or actionable signals
-            simplified_trend = simplify_trend_indicators(trend_indicators, close_prices)
-            simplified_momentum = simplify_momentum_indicators(momentum_indicators)
-            simplified_volatility = simplify_volatility_indicators(volatility_indicators, close_prices)
-
-            # Combine simplified indicators into the final structure
-            indicators[coin] = {
-                'trend': simplified_trend,
-                'momentum': simplified_momentum,
-                'volatility': simplified_volatility
-            }
+            indicators[coin] = calculate_coin_indicators(high_prices, low_prices, close_prices, selected_indicators)
 
         except Exception as e:
             print(f"Error calculating indicators for {coin}: {e}")
 
     return indicators
+
+
+def calculate_coin_indicators(high_prices, low_prices, close_prices, selected_indicators=None):
+    trend_indicators = calculate_trend_indicators(high_prices, low_prices, close_prices, selected_indicators)
+    momentum_indicators = calculate_momentum_indicators(high_prices, low_prices, close_prices, selected_indicators)
+    volatility_indicators = calculate_volatility_indicators(high_prices, low_prices, close_prices,
+                                                            selected_indicators)
+
+    # Simplify the data into the latest value or actionable signals
+    simplified_trend = simplify_trend_indicators(trend_indicators, close_prices)
+    simplified_momentum = simplify_momentum_indicators(momentum_indicators)
+    simplified_volatility = simplify_volatility_indicators(volatility_indicators, close_prices)
+
+    # Combine simplified indicators into the final structure
+    return {
+        'trend': simplified_trend,
+        'momentum': simplified_momentum,
+        'volatility': simplified_volatility
+    }
+
+
+def calculate_rows_indicators(coins, highs, lows, closes, lengths, selected_indicators=None):
+    # Per-coin calculation of right-aligned price rows, like the batch backend receives them
+    indicators = {}
+    for row, coin in enumerate(coins):
+        try:
+            start = highs.shape[-1] - lengths[row]
+            indicators[coin] = calculate_coin_indicators(highs[row, start:].tolist(), lows[row, start:].tolist(),
+                                                         closes[row, start:].tolist(), selected_indicators)
+        except Exception as e:
+            print(f"Error calculating indicators for {coin}: {e}")
+
+    return indicators
+
+
+def collect_prices(coins_data):
+    prices = {}
+
+    # Collect the prices of every coin with enough data
+    for coin in coins_data:
+        high_prices, low_prices, close_prices = extract_ohlc_prices(coins_data, coin)
+        if len(close_prices) < 2:
+            print(f"Not enough close prices for {coin}, skipping...")
+            continue
+        prices[coin] = (high_prices, low_prices, close_prices)
+
+    return prices
+
+
+def apply_batch_indicators(coins_data, selected_indicators=None):
+    return calculate_batch_indicators(collect_prices(coins_data), selected_indicators)
+
+
+def apply_parallel_indicators(coins_data, selected_indicators=None):
+    # Every worker calculates a block of coins with the configured backend
+    if config['INDICATOR_BACKEND'] == 'batch':
+        matrix_function = calculate_matrix_indicators
+    else:
+        matrix_function = calculate_rows_indicators
+    parallel_config = config['PARALLEL_INDICATORS']
+    return calculate_in_parallel(collect_prices(coins_data), matrix_function, selected_indicators,
+                                 parallel_config['WORKERS'], parallel_config['MIN_COINS_PER_WORKER'])
+
+
+def get_streaming_indicators():
+    global streaming_indicators
+
+    # Continue from the last checkpoint, if there is one
+    if streaming_indicators is None:
+        streaming_indicators = StreamingIndicators()
+        checkpoint_file = config['STREAMING_INDICATORS']['CHECKPOINT_FILE']
+        if checkpoint_file:
+            streaming_indicators.load(get_data_path(checkpoint_file))
+
+    return streaming_indicators
+
+
+def apply_streaming_indicators(coins_data, selected_indicators=None):
+    states = get_streaming_indicators()
+    now_ms = int(time.time() * 1000)
+    indicators = {}
+
+    for coin, data in coins_data.items():
+        try:
+            # The states follow the same pair the other backends calculate the indicators on
+            pair = select_primary_pair(data, coin)
+            state = None
+            if pair is not None:
+                klines = data["candlesticks"][pair]
+                state = include_open_candle(states.update(pair, klines, now_ms), klines, now_ms)
+
+            # Validate there are enough candles for indicator calculation, the open one included like in the other
+            # backends
+            if state is None or state.count < 2:
+                print(f"Not enough close prices for {coin}, skipping...")
+                continue
+
+            indicators[coin] = state.get_indicators(selected_indicators)
+
+        except Exception as e:
+            print(f"Error calculating indicators for {coin}: {e}")
+
+    # Save the states so a restart continues without replaying the history
+    checkpoint_file = config['STREAMING_INDICATORS']['CHECKPOINT_FILE']
+    if checkpoint_file:
+        states.save(get_data_path(checkpoint_file))
+
+    return indicators
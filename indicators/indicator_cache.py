@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from indicators.streaming_indicators import get_settings
+from utils.file_utils import to_json_value
+
+
+def get_settings_hash(backend, selected_indicators=None):
+    # Results calculated by another backend, with other indicator parameters or another selection are never served.
+    # The backends do not give identical numbers, e.g. the NumPy kernels and the streaming states round differently
+    # than pandas.
+    settings = {
+        **get_settings(),
+        "BACKEND": backend,
+        "SELECTED": None if selected_indicators is None else sorted(selected_indicators),
+    }
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+
+def get_cache_key(symbol, candles, settings_hash):
+    # The last candle holds its open and close time, so the interval and last close time are part of the key.
+    # Its prices are too, as the last candle is usually still open and changes until it closes.
+    last_candle = candles[-1].tolist() if isinstance(candles, np.ndarray) else list(candles[-1])
+    fingerprint = json.dumps([symbol, len(candles), last_candle, settings_hash], default=str)
+    return hashlib.sha1(fingerprint.encode()).hexdigest()
+
+
+class IndicatorCache:
+    # Simplified indicators by candle fingerprint, the least recently used entries are dropped first
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, indicators):
+        self.entries[key] = indicators
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_report(self):
+        # Hits and misses since the last report, e.g. of one cycle
+        lookups = self.hits + self.misses
+        report = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.entries),
+        }
+        self.hits = 0
+        self.misses = 0
+        return report
+
+    def save(self, file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # Write a temporary file first, so an interrupted save never leaves a broken cache file
+        temporary_path = f"{file_path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(list(self.entries.items()), file, default=to_json_value)
+        os.replace(temporary_path, file_path)
+
+    def load(self, file_path):
+        if not os.path.exists(file_path):
+            return False
+
+        # Entries are saved from least to most recently used
+        with open(file_path, "r") as file:
+            for key, indicators in json.load(file):
+                self.put(key, indicators)
+        return True
@@ -0,0 +1,253 @@
+import numpy as np
+
+from indicators import numpy_kernels
+
+# Prices the graph starts from, every other node is calculated from them
+INPUT_NODES = ("high", "low", "close")
+
+
+def format_node(key):
+    # Readable name of a node, e.g. "rolling_max(high, 14)" or "ewm_mean(macd_line(12, 26), 9)"
+    name, params = key[0], key[1:]
+    if not params:
+        return name
+    return f"{name}({', '.join(format_node(param) if isinstance(param, tuple) else str(param) for param in params)})"
+
+
+def take_last(values, length):
+    # Last `length` values of a node, all of them for a length of None
+    if length is None or length >= values.shape[-1]:
+        return values
+    return values[..., -length:]
+
+
+def extend(length, count):
+    # Length a source needs so `count` earlier values are available too
+    return None if length is None else length + count
+
+
+def check_window(window, minimum):
+    # Same validation as the indicator functions
+    if not isinstance(window, int) or window < minimum:
+        raise ValueError(f"window must be an integer >= {minimum}")
+
+
+def calculate_price_diff(graph, length):
+    # The first candle has no difference
+    return take_last(np.diff(graph.get("close", length=extend(length, 1)), axis=-1, prepend=np.nan), length)
+
+
+def calculate_gain(graph, length):
+    price_diff = graph.get("price_diff", length=length)
+    return np.where(price_diff > 0, price_diff, 0.0)
+
+
+def calculate_loss(graph, length):
+    price_diff = graph.get("price_diff", length=length)
+    return np.where(price_diff < 0, -price_diff, 0.0)
+
+
+def calculate_typical_price(graph, length):
+    return (graph.get("high", length=length) + graph.get("low", length=length) + graph.get("close", length=length)) / 3
+
+
+def calculate_true_range(graph, length):
+    # Largest of the three ranges, ignoring the missing previous close of the first candle
+    highs = graph.get("high", length=length)
+    lows = graph.get("low", length=length)
+    previous_closes = take_last(numpy_kernels.shift(graph.get("close", length=extend(length, 1)), 1), length)
+    return np.fmax(np.fmax(highs - lows, np.abs(highs - previous_closes)), np.abs(lows - previous_closes))
+
+
+def calculate_midpoint(graph, window, length):
+    # Midpoint of the highest high and lowest low, the base of every Ichimoku line
+    return (graph.get("rolling_max", ("high",), window, length=length) +
+            graph.get("rolling_min", ("low",), window, length=length)) / 2
+
+
+def calculate_macd_line(graph, short_window, long_window, length):
+    return (graph.get("ewm_mean", ("close",), short_window, length=length) -
+            graph.get("ewm_mean", ("close",), long_window, length=length))
+
+
+def calculate_percent_k(graph, window, length):
+    # Position of the close between the lowest low and highest high, shared by Stochastic and Williams %R
+    highest_high = graph.get("rolling_max", ("high",), window, length=length)
+    lowest_low = graph.get("rolling_min", ("low",), window, length=length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ((graph.get("close", length=length) - lowest_low) / (highest_high - lowest_low)) * 100
+
+
+def rolling_node(reduce):
+    # Windowed reduction of another node, which only needs the `window - 1` source values before the output
+    def calculate(graph, source, window, length):
+        return take_last(reduce(graph.get(*source, length=extend(length, window - 1)), window), length)
+    return calculate
+
+
+def calculate_ewm_mean(graph, source, span, length):
+    # Every earlier value counts towards an exponential mean, so it always runs over the whole source
+    return take_last(numpy_kernels.ewm_mean(graph.get(*source), span), length)
+
+
+# Intermediates by name, each is called with the graph, the parameters of the node and the number of values needed
+NODES = {
+    "price_diff": calculate_price_diff,
+    "gain": calculate_gain,
+    "loss": calculate_loss,
+    "typical_price": calculate_typical_price,
+    "true_range": calculate_true_range,
+    "midpoint": calculate_midpoint,
+    "macd_line": calculate_macd_line,
+    "percent_k": calculate_percent_k,
+    "rolling_mean": rolling_node(numpy_kernels.rolling_mean),
+    "rolling_std": rolling_node(numpy_kernels.rolling_std),
+    "rolling_max": rolling_node(numpy_kernels.rolling_max),
+    "rolling_min": rolling_node(numpy_kernels.rolling_min),
+    "rolling_mean_deviation": rolling_node(numpy_kernels.rolling_mean_deviation),
+    "ewm_mean": calculate_ewm_mean,
+}
+
+
+class IndicatorGraph:
+    # Intermediates of one set of prices (a single coin or one row per coin), each calculated once.
+    # With a tail length, indicators only get their last values, calculated from the trailing windows alone.
+    def __init__(self, highs, lows, closes, tail_length=None):
+        self.tail_length = tail_length
+        self.values = {
+            ("high",): numpy_kernels.as_array(highs),
+            ("low",): numpy_kernels.as_array(lows),
+            ("close",): numpy_kernels.as_array(closes),
+        }
+        self.lengths = {key: None for key in self.values}
+        self.computed = []
+        self.reused = {}
+
+    def get(self, name, *params, length=None):
+        key = (name, *params)
+
+        # Serve the last values of a node that was calculated for at least as many values
+        cached_length = self.lengths.get(key, 0)
+        if key in self.values and (cached_length is None or (length is not None and cached_length >= length)):
+            if name not in INPUT_NODES:
+                self.reused[key] = self.reused.get(key, 0) + 1
+            return take_last(self.values[key], length)
+
+        value = NODES[name](self, *params, length=length)
+        self.values[key] = value
+        self.lengths[key] = length
+        self.computed.append(key)
+        return value
+
+    def get_report(self):
+        # Which intermediates were calculated, and how often one was served again instead of recalculated
+        return {
+            "computed": len(self.computed),
+            "reused": sum(self.reused.values()),
+            "reused_nodes": {format_node(key): count for key, count in self.reused.items()},
+        }
+
+
+def calculate_sma(graph, window=14):
+    check_window(window, 1)
+    return graph.get("rolling_mean", ("close",), window, length=graph.tail_length)
+
+
+def calculate_ema(graph, window=14):
+    check_window(window, 1)
+    return graph.get("ewm_mean", ("close",), window, length=graph.tail_length)
+
+
+def calculate_macd(graph, short_window=12, long_window=26, signal_window=9):
+    # The signal line needs the whole MACD line, whose last values are then reused
+    signal_line = graph.get("ewm_mean", ("macd_line", short_window, long_window), signal_window,
+                            length=graph.tail_length)
+    macd_line = graph.get("macd_line", short_window, long_window, length=graph.tail_length)
+
+    return {
+        'macd_line': macd_line,
+        'signal_line': signal_line,
+        'histogram': macd_line - signal_line
+    }
+
+
+def calculate_ichimoku_cloud(graph, tenkan_window=9, kijun_window=26, senkou_b_window=52, senkou_shift=26):
+    length = graph.tail_length
+    shifted_length = extend(length, senkou_shift)
+
+    # The spans of the last candles are the midpoints of `senkou_shift` candles before them
+    tenkan_sen = graph.get("midpoint", tenkan_window, length=shifted_length)
+    kijun_sen = graph.get("midpoint", kijun_window, length=shifted_length)
+    senkou_b = graph.get("midpoint", senkou_b_window, length=shifted_length)
+
+    return {
+        'tenkan_sen': take_last(tenkan_sen, length),
+        'kijun_sen': take_last(kijun_sen, length),
+        'senkou_span_a': take_last(numpy_kernels.shift((tenkan_sen + kijun_sen) / 2, senkou_shift), length),
+        'senkou_span_b': take_last(numpy_kernels.shift(senkou_b, senkou_shift), length),
+        'chikou_span': take_last(numpy_kernels.shift(graph.get("close"), -senkou_shift), length)
+    }
+
+
+def calculate_rsi(graph, window=14):
+    check_window(window, 1)
+
+    # If window size is 1, return NaN for all values
+    if window == 1:
+        return np.full(graph.get("close", length=graph.tail_length).shape, np.nan)
+
+    gain = graph.get("rolling_mean", ("gain",), window, length=graph.tail_length)
+    loss = graph.get("rolling_mean", ("loss",), window, length=graph.tail_length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def calculate_stochastic_oscillator(graph, window=14, smooth_window=3):
+    check_window(window, 2)
+
+    # Smooth %K first, so its last values are reused for %K itself
+    percent_d = graph.get("rolling_mean", ("percent_k", window), smooth_window, length=graph.tail_length)
+
+    return {
+        '%K': graph.get("percent_k", window, length=graph.tail_length),
+        '%D': percent_d  # Smoothed %K
+    }
+
+
+def calculate_williams_r(graph, window=14):
+    check_window(window, 2)
+
+    highest_high = graph.get("rolling_max", ("high",), window, length=graph.tail_length)
+    lowest_low = graph.get("rolling_min", ("low",), window, length=graph.tail_length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ((highest_high - graph.get("close", length=graph.tail_length)) / (highest_high - lowest_low)) * -100
+
+
+def calculate_cci(graph, window=20):
+    check_window(window, 2)
+
+    # Windowed nodes first, so the typical prices they need also cover the last values
+    tp_sma = graph.get("rolling_mean", ("typical_price",), window, length=graph.tail_length)
+    tp_mean_deviation = graph.get("rolling_mean_deviation", ("typical_price",), window, length=graph.tail_length)
+    typical_price = graph.get("typical_price", length=graph.tail_length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (typical_price - tp_sma) / (0.015 * tp_mean_deviation)
+
+
+def calculate_bollinger_bands(graph, window=20, num_std_dev=2):
+    check_window(window, 1)
+
+    middle_band = graph.get("rolling_mean", ("close",), window, length=graph.tail_length)
+    std_dev = graph.get("rolling_std", ("close",), window, length=graph.tail_length)
+
+    return {
+        'middle_band': middle_band,
+        'upper_band': middle_band + (std_dev * num_std_dev),
+        'lower_band': middle_band - (std_dev * num_std_dev)
+    }
+
+
+def calculate_atr(graph, window=14):
+    check_window(window, 1)
+    return graph.get("rolling_mean", ("true_range",), window, length=graph.tail_length)
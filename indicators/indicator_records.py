@@ -0,0 +1,118 @@
+import re
+
+from indicators.indicator_selection import INDICATOR_FIELDS
+
+# Fields holding a flag or a signal name, every other simplified field is a number
+FLAG_FIELDS = {'above_SMA', 'close_above_upper', 'close_below_lower'}
+SIGNAL_FIELDS = {'MACD_trend', 'RSI_signal', 'Stochastic_signal', 'Williams%R_signal', 'CCI_signal'}
+
+# Numbers are rounded like the indicators were always saved and scored
+DECIMALS = 4
+
+
+def to_number(value):
+    return None if value is None else round(float(value), DECIMALS)
+
+
+def to_flag(value):
+    return None if value is None else bool(value)
+
+
+def to_signal(value):
+    return value
+
+
+def get_converter(field):
+    # Conversion of a NumPy or Python value into the plain type of the field, chosen once per field
+    if field in FLAG_FIELDS:
+        return to_flag
+    if field in SIGNAL_FIELDS:
+        return to_signal
+    return to_number
+
+
+def slot_name(field):
+    # Attribute a field is stored in, e.g. "Stochastic_%K" in "Stochastic__K"
+    return re.sub(r"\W", "_", field)
+
+
+class IndicatorRecord:
+    # Simplified indicators of one category with a slot per field. Fields that were not calculated stay unset,
+    # so reading them raises a KeyError like the dicts these records replace.
+    __slots__ = ()
+    FIELDS = {}
+
+    def __init__(self, values):
+        for field, value in values.items():
+            slot, converter = self.FIELDS[field]
+            setattr(self, slot, converter(value))
+
+    def __getitem__(self, field):
+        try:
+            return getattr(self, self.FIELDS[field][0])
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __contains__(self, field):
+        return field in self.FIELDS and hasattr(self, self.FIELDS[field][0])
+
+    def get(self, field, default=None):
+        return self[field] if field in self else default
+
+    def to_dict(self):
+        # Only the calculated fields, in the order of INDICATOR_FIELDS
+        return {field: getattr(self, slot) for field, (slot, _) in self.FIELDS.items() if hasattr(self, slot)}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+def make_record_class(name, category):
+    fields = {
+        field: (slot_name(field), get_converter(field))
+        for indicator_fields in INDICATOR_FIELDS[category].values() for field in indicator_fields
+    }
+    return type(name, (IndicatorRecord,), {"__slots__": tuple(slot for slot, _ in fields.values()), "FIELDS": fields})
+
+
+TrendRecord = make_record_class("TrendRecord", 'trend')
+MomentumRecord = make_record_class("MomentumRecord", 'momentum')
+VolatilityRecord = make_record_class("VolatilityRecord", 'volatility')
+
+
+class CoinIndicators:
+    # Records of the three categories of one coin, read like the nested dicts, e.g. indicators['trend']['SMA']
+    __slots__ = ('trend', 'momentum', 'volatility')
+
+    def __init__(self, trend, momentum, volatility):
+        self.trend = trend
+        self.momentum = momentum
+        self.volatility = volatility
+
+    def __getitem__(self, category):
+        if category not in self.__slots__:
+            raise KeyError(category)
+        return getattr(self, category)
+
+    def to_dict(self):
+        return {category: getattr(self, category).to_dict() for category in self.__slots__}
+
+    def __repr__(self):
+        return f"CoinIndicators({self.to_dict()})"
+
+
+def build_indicator_records(indicators):
+    # Typed records of the simplified indicators of every coin, each value is converted once by the type of its field
+    return {
+        coin: CoinIndicators(
+            TrendRecord(data.get('trend', {})),
+            MomentumRecord(data.get('momentum', {})),
+            VolatilityRecord(data.get('volatility', {})),
+        )
+        for coin, data in indicators.items()
+    }
+
+
+def records_to_dict(indicator_records):
+    # Plain values only, ready to be written as JSON
+    return {coin: record.to_dict() for coin, record in indicator_records.items()}
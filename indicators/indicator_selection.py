@@ -0,0 +1,51 @@
+# Simplified fields each indicator produces, Ichimoku is calculated but none of its lines is simplified
+INDICATOR_FIELDS = {
+    'trend': {
+        'SMA': ['SMA', 'above_SMA'],
+        'EMA': ['EMA'],
+        'MACD': ['MACD_current', 'MACD_signal', 'MACD_histogram', 'MACD_trend'],
+        'Ichimoku': [],
+    },
+    'momentum': {
+        'RSI': ['RSI', 'RSI_signal'],
+        'StochasticOscillator': ['Stochastic_%K', 'Stochastic_%D', 'Stochastic_signal'],
+        'Williams%R': ['Williams%R', 'Williams%R_signal'],
+        'CCI': ['CCI', 'CCI_signal'],
+    },
+    'volatility': {
+        'BollingerBands': ['Bollinger_width', 'close_above_upper', 'close_below_lower'],
+        'ATR': ['ATR'],
+    },
+}
+
+
+def select_indicators(required_fields=None):
+    # Indicators producing at least one of the required fields per category, every indicator without requirements
+    if required_fields is None:
+        return None
+
+    selected_indicators = set()
+    for category, fields in required_fields.items():
+        indicators = INDICATOR_FIELDS.get(category, {})
+        for field in fields:
+            names = [name for name, indicator_fields in indicators.items() if field in indicator_fields]
+            if not names:
+                raise ValueError(f"No indicator produces the field '{category}.{field}'")
+            selected_indicators.update(names)
+
+    return selected_indicators
+
+
+def is_selected(name, selected_indicators):
+    return selected_indicators is None or name in selected_indicators
+
+
+def get_selection_report(selected_indicators, coin_count):
+    # Indicators calculated and left out this cycle, with the number of per-coin calculations saved
+    all_indicators = [name for indicators in INDICATOR_FIELDS.values() for name in indicators]
+    skipped = [name for name in all_indicators if not is_selected(name, selected_indicators)]
+    return {
+        "calculated": [name for name in all_indicators if is_selected(name, selected_indicators)],
+        "skipped": skipped,
+        "skipped_calculations": len(skipped) * coin_count,
+    }
@@ -1,13 +1,19 @@
-import pandas as pd
+import sys
 
+from indicators.indicator_selection import is_selected
+from indicators.numpy_kernels import get_last_value, rolling_mean_deviation, select_backend
 from utils.file_utils import load_config_values
+from utils.import_utils import lazy_import
 
-config = load_config_values("MOMENTUM_INDICATORS")
+config = load_config_values("MOMENTUM_INDICATORS", "INDICATOR_BACKEND")
+
+# Only the pandas backend needs pandas, the other backends never load it
+pd = lazy_import("pandas")
 
 
 def calculate_rsi(prices, window=14):
     # Check if prices are provided and have sufficient length
-    if not prices or len(prices) < window:
+    if len(prices) == 0 or len(prices) < window:
         return None
 
     # Validate the window parameter
@@ -83,10 +89,8 @@ def calculate_cci(highs, lows, closes, window=20):
     # Calculate SMA of Typical Price
     tp_sma = typical_price.rolling(window=window).mean()
 
-    # Calculate Mean Deviation (manually)
-    mean_deviation = typical_price.rolling(window=window).apply(
-        lambda x: pd.Series(x).sub(x.mean()).abs().mean(), raw=False
-    )
+    # Calculate Mean Deviation over all windows at once
+    mean_deviation = pd.Series(rolling_mean_deviation(typical_price.to_numpy(), window), index=typical_price.index)
 
     # Calculate CCI
     cci = (typical_price - tp_sma) / (0.015 * mean_deviation)
@@ -94,34 +98,40 @@ def calculate_cci(highs, lows, closes, window=20):
     return cci
 
 
-def calculate_momentum_indicators(high_prices, low_prices, close_prices):
+def calculate_momentum_indicators(high_prices, low_prices, close_prices, selected_indicators=None):
     indicators = {}
     try:
+        # Use the pandas functions below or the NumPy kernels with the same results
+        backend = select_backend(config['INDICATOR_BACKEND'], sys.modules[__name__])
+
         # Relative Strength Index (RSI)
         rsi_period = config['MOMENTUM_INDICATORS']['RSI_WINDOW']
-        if len(close_prices) >= rsi_period:
-            indicators['RSI'] = calculate_rsi(close_prices, rsi_period)
+        if is_selected('RSI', selected_indicators) and len(close_prices) >= rsi_period:
+            indicators['RSI'] = backend.calculate_rsi(close_prices, rsi_period)
 
         # Stochastic Oscillator
         stochastic_config = config['MOMENTUM_INDICATORS']['STOCHASTIC']
         stochastic_window = stochastic_config['WINDOW']
         smooth_window = stochastic_config['SMOOTH_WINDOW']
-        if len(high_prices) >= stochastic_window and len(low_prices) >= stochastic_window and len(close_prices) >= stochastic_window:
-            indicators['StochasticOscillator'] = calculate_stochastic_oscillator(
+        if is_selected('StochasticOscillator', selected_indicators) and \
+                len(high_prices) >= stochastic_window and len(low_prices) >= stochastic_window and len(close_prices) >= stochastic_window:
+            indicators['StochasticOscillator'] = backend.calculate_stochastic_oscillator(
                 high_prices, low_prices, close_prices, stochastic_window, smooth_window
             )
 
         # Williams %R
         williams_r_window = config['MOMENTUM_INDICATORS']['WILLIAMS_R_WINDOW']
-        if len(high_prices) >= williams_r_window and len(low_prices) >= williams_r_window and len(close_prices) >= williams_r_window:
-            indicators['Williams%R'] = calculate_williams_r(
+        if is_selected('Williams%R', selected_indicators) and \
+                len(high_prices) >= williams_r_window and len(low_prices) >= williams_r_window and len(close_prices) >= williams_r_window:
+            indicators['Williams%R'] = backend.calculate_williams_r(
                 high_prices, low_prices, close_prices, williams_r_window
             )
 
         # Commodity Channel Index (CCI)
         cci_window = config['MOMENTUM_INDICATORS']['CCI_WINDOW']
-        if len(high_prices) >= cci_window and len(low_prices) >= cci_window and len(close_prices) >= cci_window:
-            indicators['CCI'] = calculate_cci(
+        if is_selected('CCI', selected_indicators) and \
+                len(high_prices) >= cci_window and len(low_prices) >= cci_window and len(close_prices) >= cci_window:
+            indicators['CCI'] = backend.calculate_cci(
                 high_prices, low_prices, close_prices, cci_window
             )
 
@@ -137,8 +147,8 @@ def simplify_momentum_indicators(momentum_indicators):
     # RSI: Extract the latest value and add thresholds
     if "RSI" in momentum_indicators and momentum_indicators["RSI"] is not None:
         rsi_series = momentum_indicators["RSI"]
-        if not rsi_series.empty:
-            simplified["RSI"] = rsi_series.iloc[-1]
+        if len(rsi_series) > 0:
+            simplified["RSI"] = get_last_value(rsi_series)
             # Determine RSI signal (oversold, overbought, or neutral)
             if simplified["RSI"] < 30:
                 simplified["RSI_signal"] = "oversold"
@@ -154,10 +164,10 @@ def simplify_momentum_indicators(momentum_indicators):
         if "%K" in stochastic and "%D" in stochastic:
             # Safely retrieve the latest value of %K and %D
             simplified["Stochastic_%K"] = (
-                stochastic["%K"].iloc[-1] if not stochastic["%K"].empty else None
+                get_last_value(stochastic["%K"]) if len(stochastic["%K"]) > 0 else None
             )
             simplified["Stochastic_%D"] = (
-                stochastic["%D"].iloc[-1] if not stochastic["%D"].empty else None
+                get_last_value(stochastic["%D"]) if len(stochastic["%D"]) > 0 else None
             )
 
             # Check if the latest %K indicates an overbought or oversold condition
@@ -172,8 +182,8 @@ def simplify_momentum_indicators(momentum_indicators):
     # Williams %R: Add signal for overbought/oversold conditions
     if "Williams%R" in momentum_indicators and momentum_indicators["Williams%R"] is not None:
         williams_r_series = momentum_indicators["Williams%R"]
-        if not williams_r_series.empty:
-            simplified["Williams%R"] = williams_r_series.iloc[-1]
+        if len(williams_r_series) > 0:
+            simplified["Williams%R"] = get_last_value(williams_r_series)
             simplified["Williams%R_signal"] = (
                 "oversold" if simplified["Williams%R"] > -20
                 else "overbought" if simplified["Williams%R"] < -80
@@ -183,8 +193,8 @@ def simplify_momentum_indicators(momentum_indicators):
     # Commodity Channel Index (CCI)
     if "CCI" in momentum_indicators and momentum_indicators["CCI"] is not None:
         cci_series = momentum_indicators["CCI"]
-        if not cci_series.empty:
-            simplified["CCI"] = cci_series.iloc[-1]
+        if len(cci_series) > 0:
+            simplified["CCI"] = get_last_value(cci_series)
             simplified["CCI_signal"] = (
                 "overbought" if simplified["CCI"] > 100
                 else "oversold" if simplified["CCI"] < -100
@@ -0,0 +1,314 @@
+import sys
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Kernels work along the last axis, so they take a single series as well as one row per coin.
+# Windows follow pandas: a value is only set once the whole window is filled, NaN inside a window gives NaN.
+
+
+def as_array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def series_length(values):
+    # Number of candles, also when the values hold one row per coin
+    return values.shape[-1] if isinstance(values, np.ndarray) else len(values)
+
+
+def pad_left(values, count):
+    # Prepend `count` NaN values to restore the input length after a windowed reduction
+    padding = np.full(values.shape[:-1] + (count,), np.nan)
+    return np.concatenate([padding, values], axis=-1)
+
+
+def rolling_reduce(values, window, reduce):
+    values = as_array(values)
+    if values.shape[-1] < window:
+        return np.full(values.shape, np.nan)
+
+    return pad_left(reduce(sliding_window_view(values, window, axis=-1)), window - 1)
+
+
+def rolling_mean(values, window):
+    return rolling_reduce(values, window, lambda windows: windows.mean(axis=-1))
+
+
+def rolling_std(values, window):
+    # Sample standard deviation like pandas, undefined for a window of one value
+    if window < 2:
+        return np.full(as_array(values).shape, np.nan)
+    return rolling_reduce(values, window, lambda windows: windows.std(axis=-1, ddof=1))
+
+
+def rolling_max(values, window):
+    return rolling_reduce(values, window, lambda windows: windows.max(axis=-1))
+
+
+def rolling_min(values, window):
+    return rolling_reduce(values, window, lambda windows: windows.min(axis=-1))
+
+
+def shift(values, periods):
+    # Move values forward (positive periods) or backward (negative periods), filling the gap with NaN
+    values = as_array(values)
+    shifted = np.full(values.shape, np.nan)
+    if periods == 0:
+        shifted[...] = values
+    elif abs(periods) < values.shape[-1]:
+        if periods > 0:
+            shifted[..., periods:] = values[..., :-periods]
+        else:
+            shifted[..., :periods] = values[..., -periods:]
+    return shifted
+
+
+def ewm_mean(values, span):
+    # Same recursion and rounding as pandas `ewm(span=span, adjust=False).mean()`, leading NaN values are skipped
+    values = as_array(values)
+    alpha = 1 / (1 + (span - 1) / 2)
+    old_wt_factor = 1 - alpha
+
+    if values.ndim == 1:
+        # Plain floats are much faster than NumPy scalars for a single short series
+        result = []
+        weighted = float("nan")
+        old_wt = 1.0
+        for current in values.tolist():
+            if weighted == weighted:
+                old_wt *= old_wt_factor
+                if current == current:
+                    if weighted != current:
+                        weighted = (old_wt * weighted + alpha * current) / (old_wt + alpha)
+                    old_wt = 1.0
+            elif current == current:
+                weighted = current
+            result.append(weighted)
+        return np.array(result)
+
+    # One recursion step for every row at once
+    result = np.empty(values.shape)
+    weighted = np.full(values.shape[:-1], np.nan)
+    old_wt = np.ones(values.shape[:-1])
+    with np.errstate(invalid="ignore"):
+        for i in range(values.shape[-1]):
+            current = values[..., i]
+            has_weighted = ~np.isnan(weighted)
+            is_observation = ~np.isnan(current)
+
+            old_wt = np.where(has_weighted, old_wt * old_wt_factor, old_wt)
+            blended = (old_wt * weighted + alpha * current) / (old_wt + alpha)
+            weighted = np.where(has_weighted & is_observation & (weighted != current), blended, weighted)
+            weighted = np.where(~has_weighted & is_observation, current, weighted)
+            old_wt = np.where(has_weighted & is_observation, 1.0, old_wt)
+
+            result[..., i] = weighted
+
+    return result
+
+
+def calculate_sma(prices, window=14):
+    if series_length(prices) == 0:
+        return None
+
+    # Validate the window parameter
+    if not isinstance(window, int) or window < 1:
+        raise ValueError("window must be an integer >= 1")
+
+    return rolling_mean(prices, window)
+
+
+def calculate_ema(prices, window=14):
+    if series_length(prices) == 0:
+        return None
+
+    # Validate the window parameter
+    if not isinstance(window, int) or window < 1:
+        raise ValueError("window must be >= 1")
+
+    return ewm_mean(prices, window)
+
+
+def calculate_macd(prices, short_window=12, long_window=26, signal_window=9):
+    if series_length(prices) == 0 or series_length(prices) < long_window:
+        return None
+
+    prices = as_array(prices)
+    macd_line = ewm_mean(prices, short_window) - ewm_mean(prices, long_window)
+    signal_line = ewm_mean(macd_line, signal_window)
+
+    return {
+        'macd_line': macd_line,
+        'signal_line': signal_line,
+        'histogram': macd_line - signal_line
+    }
+
+
+def calculate_ichimoku_cloud(highs, lows, closes, tenkan_window=9, kijun_window=26, senkou_b_window=52, senkou_shift=26):
+    if series_length(highs) < max(tenkan_window, kijun_window, senkou_b_window):
+        return None
+
+    highs = as_array(highs)
+    lows = as_array(lows)
+
+    # Midpoint of the highest high and lowest low over each window
+    tenkan_sen = (rolling_max(highs, tenkan_window) + rolling_min(lows, tenkan_window)) / 2
+    kijun_sen = (rolling_max(highs, kijun_window) + rolling_min(lows, kijun_window)) / 2
+    senkou_b = (rolling_max(highs, senkou_b_window) + rolling_min(lows, senkou_b_window)) / 2
+
+    return {
+        'tenkan_sen': tenkan_sen,
+        'kijun_sen': kijun_sen,
+        'senkou_span_a': shift((tenkan_sen + kijun_sen) / 2, senkou_shift),
+        'senkou_span_b': shift(senkou_b, senkou_shift),
+        'chikou_span': shift(closes, -senkou_shift)
+    }
+
+
+def calculate_rsi(prices, window=14):
+    # Check if prices are provided and have sufficient length
+    if series_length(prices) == 0 or series_length(prices) < window:
+        return None
+
+    # Validate the window parameter
+    if not isinstance(window, int) or window < 1:
+        raise ValueError("window must be an integer >= 1")
+
+    prices = as_array(prices)
+
+    # If window size is 1, return NaN for all values
+    if window == 1:
+        return np.full(prices.shape, np.nan)
+
+    # Gains and losses per candle, the first candle has no difference and counts as zero like in pandas
+    delta = np.diff(prices, axis=-1, prepend=np.nan)
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), window)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def calculate_stochastic_oscillator(highs, lows, closes, window=14, smooth_window=3):
+    if series_length(highs) < window or series_length(lows) < window or series_length(closes) < window:
+        return None
+
+    # Validate the window parameter
+    if not isinstance(window, int) or window < 2:
+        raise ValueError("window must be an integer >= 2")
+
+    highest_high = rolling_max(highs, window)
+    lowest_low = rolling_min(lows, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_k = ((as_array(closes) - lowest_low) / (highest_high - lowest_low)) * 100
+
+    return {
+        '%K': percent_k,
+        '%D': rolling_mean(percent_k, smooth_window)  # Smoothed %K
+    }
+
+
+def calculate_williams_r(highs, lows, closes, window=14):
+    if series_length(highs) < window or series_length(lows) < window or series_length(closes) < window:
+        return None
+
+    # Validate the window parameter
+    if not isinstance(window, int) or window < 2:
+        raise ValueError("window must be an integer >= 2")
+
+    highest_high = rolling_max(highs, window)
+    lowest_low = rolling_min(lows, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ((highest_high - as_array(closes)) / (highest_high - lowest_low)) * -100
+
+
+# Windows whose deviations are held in memory at once by `rolling_mean_deviation`
+MEAN_DEVIATION_CHUNK_SIZE = 65536
+
+
+def mean_deviation(windows):
+    # Mean absolute deviation of each window from its own mean
+    return np.abs(windows - windows.mean(axis=-1, keepdims=True)).mean(axis=-1)
+
+
+def rolling_mean_deviation(values, window, chunk_size=MEAN_DEVIATION_CHUNK_SIZE):
+    values = as_array(values)
+    if values.shape[-1] < window:
+        return np.full(values.shape, np.nan)
+
+    # The windows are a view on the values, only the deviations of one chunk of windows are materialized
+    windows = sliding_window_view(values, window, axis=-1)
+    result = np.empty(windows.shape[:-1])
+    rows = int(np.prod(windows.shape[:-2], dtype=np.int64))
+    step = max(chunk_size // max(rows, 1), 1)
+    for start in range(0, windows.shape[-2], step):
+        result[..., start:start + step] = mean_deviation(windows[..., start:start + step, :])
+
+    return pad_left(result, window - 1)
+
+
+def calculate_cci(highs, lows, closes, window=20):
+    if series_length(highs) < window or series_length(lows) < window or series_length(closes) < window:
+        return None
+
+    # Validate the window parameter
+    if not isinstance(window, int) or window < 2:
+        raise ValueError("window must be an integer >= 2")
+
+    typical_price = (as_array(highs) + as_array(lows) + as_array(closes)) / 3
+    tp_sma = rolling_mean(typical_price, window)
+    tp_mean_deviation = rolling_mean_deviation(typical_price, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (typical_price - tp_sma) / (0.015 * tp_mean_deviation)
+
+
+def calculate_bollinger_bands(prices, window=20, num_std_dev=2):
+    if series_length(prices) == 0 or series_length(prices) < window:
+        return None
+
+    # Validate the window parameter
+    if not isinstance(window, int) or window < 1:
+        raise ValueError("window must be an integer >= 1")
+
+    middle_band = rolling_mean(prices, window)
+    std_dev = rolling_std(prices, window)
+
+    return {
+        'middle_band': middle_band,
+        'upper_band': middle_band + (std_dev * num_std_dev),
+        'lower_band': middle_band - (std_dev * num_std_dev)
+    }
+
+
+def calculate_atr(highs, lows, closes, window=14):
+    if series_length(highs) < window or series_length(lows) < window or series_length(closes) < window:
+        return None
+
+    # Validate the window parameter
+    if not isinstance(window, int) or window < 1:
+        raise ValueError("window must be an integer >= 1")
+
+    highs = as_array(highs)
+    lows = as_array(lows)
+    previous_closes = shift(closes, 1)
+
+    # Largest of the three ranges, ignoring the missing previous close of the first candle
+    true_range = np.fmax(np.fmax(highs - lows, np.abs(highs - previous_closes)), np.abs(lows - previous_closes))
+
+    return rolling_mean(true_range, window)
+
+
+def get_last_value(values):
+    # Latest value of a pandas Series or a NumPy array
+    return np.asarray(values)[-1]
+
+
+def select_backend(backend, pandas_module):
+    # Modules with the same indicator functions, either these kernels or the pandas implementations
+    if backend in ("numpy", "batch"):
+        return sys.modules[__name__]
+    if backend == "pandas":
+        return pandas_module
+    raise ValueError(f"Unknown indicator backend '{backend}'")
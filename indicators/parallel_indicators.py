@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from indicators.batch_indicators import stack_prices
+
+# Worker processes, started by the first parallel calculation and reused by every later cycle
+executor = None
+executor_workers = 0
+
+
+def get_executor(workers):
+    global executor, executor_workers
+
+    # Start over when the number of workers changed
+    if executor is None or executor_workers != workers:
+        if executor is not None:
+            executor.shutdown()
+        executor = ProcessPoolExecutor(max_workers=workers)
+        executor_workers = workers
+
+    return executor
+
+
+def split_rows(count, shard_count):
+    # Contiguous row ranges of (almost) equal size, so the shards together keep the coin order
+    bounds = np.linspace(0, count, shard_count + 1).astype(np.int64).tolist()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def calculate_shard(shared_name, shape, start, stop, coins, lengths, matrix_function, selected_indicators):
+    # Runs in a worker process, the parent process owns and removes the shared memory block
+    shared_block = shared_memory.SharedMemory(name=shared_name)
+    try:
+        # Views on the rows of this shard, no prices are copied into the worker
+        prices = np.ndarray(shape, dtype=np.float64, buffer=shared_block.buf)
+        return matrix_function(coins, prices[0, start:stop], prices[1, start:stop], prices[2, start:stop], lengths,
+                               selected_indicators)
+    finally:
+        shared_block.close()
+
+
+def calculate_in_parallel(prices, matrix_function, selected_indicators=None, workers=1, min_coins_per_worker=1):
+    # Prices per coin as (highs, lows, closes), `matrix_function` calculates the indicators of a block of rows
+    coins = list(prices)
+    shard_count = min(workers, len(coins) // max(min_coins_per_worker, 1))
+
+    # Too few coins to be worth sending them to other processes
+    if shard_count < 2:
+        highs, lengths = stack_prices([prices[coin][0] for coin in coins])
+        lows, _ = stack_prices([prices[coin][1] for coin in coins])
+        closes, _ = stack_prices([prices[coin][2] for coin in coins])
+        return matrix_function(coins, highs, lows, closes, lengths, selected_indicators)
+
+    # Highs, lows and closes of every coin in one shared block, the workers read their rows from it
+    width = max(len(prices[coin][2]) for coin in coins)
+    shape = (3, len(coins), width)
+    shared_block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shared_block.buf)
+        for index in range(3):
+            _, lengths = stack_prices([prices[coin][index] for coin in coins], matrix[index])
+        del matrix
+
+        futures = [
+            get_executor(workers).submit(calculate_shard, shared_block.name, shape, start, stop, coins[start:stop],
+                                         lengths[start:stop], matrix_function, selected_indicators)
+            for start, stop in split_rows(len(coins), shard_count)
+        ]
+
+        # Merge the shards in their order, so the result does not depend on which worker finished first
+        indicators = {}
+        for future in futures:
+            indicators.update(future.result())
+
+    finally:
+        shared_block.close()
+        shared_block.unlink()
+
+    print(f"Calculated the indicators of {len(coins)} coins in {shard_count} worker processes")
+    return indicators
@@ -0,0 +1,550 @@
+import json
+import math
+import os
+from collections import deque
+
+import numpy as np
+
+from indicators.indicator_selection import is_selected
+from indicators.momentum_indicators import simplify_momentum_indicators
+from indicators.trend_indicators import simplify_trend_indicators
+from indicators.volatility_indicators import simplify_volatility_indicators
+from utils.file_utils import load_config_values
+
+config = load_config_values("TREND_INDICATORS", "MOMENTUM_INDICATORS", "VOLATILITY_INDICATORS")
+
+NAN = float("nan")
+
+# Updates between two exact recalculations of a running sum, so rounding errors cannot build up
+RESYNC_INTERVAL = 1000
+
+
+def divide(numerator, denominator):
+    # Division with the NaN and infinity results of NumPy instead of an exception
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+def encode_value(value):
+    # Deques and nested states as plain lists and dictionaries for JSON checkpoints
+    if isinstance(value, StreamingState):
+        return {"state": type(value).__name__, "values": value.to_dict()}
+    if isinstance(value, deque):
+        return {"deque": [encode_value(item) for item in value], "maxlen": value.maxlen}
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def copy_value(value):
+    # Nested states and lists of them are copied, the items of deques are never changed in place and are shared
+    if isinstance(value, StreamingState):
+        return value.copy()
+    if isinstance(value, deque):
+        return deque(value, maxlen=value.maxlen)
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
+def decode_value(value):
+    if isinstance(value, dict) and "state" in value:
+        return STATE_CLASSES[value["state"]].from_dict(value["values"])
+    if isinstance(value, dict) and "deque" in value:
+        return deque([decode_value(item) for item in value["deque"]], maxlen=value["maxlen"])
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
+
+
+class StreamingState:
+    # Every state is made of its attributes, so a checkpoint restores it exactly
+    def to_dict(self):
+        return {name: encode_value(value) for name, value in vars(self).items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls.__new__(cls)
+        for name, value in data.items():
+            setattr(state, name, decode_value(value))
+        return state
+
+    def copy(self):
+        # Independent state, updating it leaves this one unchanged
+        state = type(self).__new__(type(self))
+        for name, value in vars(self).items():
+            setattr(state, name, copy_value(value))
+        return state
+
+
+class RollingWindow(StreamingState):
+    # Last `window` values with running sums around a reference value, which keeps the variance accurate
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.reference = None
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.invalid_count = 0
+        self.updates = 0
+
+    def add(self, value, sign):
+        if not math.isfinite(value):
+            self.invalid_count += sign
+            return
+        if self.reference is None:
+            self.reference = value
+        offset = value - self.reference
+        self.total += sign * offset
+        self.total_squares += sign * offset * offset
+
+    def resync(self):
+        # Recalculate the sums exactly around the current mean
+        finite_values = [value for value in self.values if math.isfinite(value)]
+        self.reference = math.fsum(finite_values) / len(finite_values) if finite_values else None
+        self.total = math.fsum(value - self.reference for value in finite_values)
+        self.total_squares = math.fsum((value - self.reference) ** 2 for value in finite_values)
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            self.add(self.values[0], -1)
+        self.values.append(value)
+        self.add(value, 1)
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            self.resync()
+
+    def is_ready(self):
+        # A value is only set once the whole window is filled with numbers, like pandas
+        return len(self.values) == self.window and self.invalid_count == 0
+
+    def mean(self):
+        if not self.is_ready():
+            return NAN
+        return self.reference + self.total / self.window
+
+    def std(self):
+        # Sample standard deviation, undefined for a window of one value
+        if not self.is_ready() or self.window < 2:
+            return NAN
+        variance = (self.total_squares - self.total * self.total / self.window) / (self.window - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def mean_deviation(self):
+        # Needs every value of the window, so it costs O(window) instead of O(1)
+        mean = self.mean()
+        if mean != mean:
+            return NAN
+        return sum(abs(value - mean) for value in self.values) / self.window
+
+
+class RollingExtreme(StreamingState):
+    # Maximum (or minimum) of the last `window` values with a monotonic deque of (index, value) pairs
+    def __init__(self, window, is_maximum):
+        self.window = window
+        self.is_maximum = is_maximum
+        self.candidates = deque()
+        self.count = 0
+        self.last_nan_index = None
+
+    def update(self, value):
+        index = self.count
+        self.count += 1
+
+        if value != value:
+            self.last_nan_index = index
+        else:
+            # Drop the values that can never be the extreme again
+            while self.candidates and (
+                self.candidates[-1][1] <= value if self.is_maximum else self.candidates[-1][1] >= value
+            ):
+                self.candidates.pop()
+            self.candidates.append([index, value])
+
+        # Drop the values that left the window
+        while self.candidates and self.candidates[0][0] <= index - self.window:
+            self.candidates.popleft()
+
+    def value(self):
+        if self.count < self.window or not self.candidates:
+            return NAN
+        if self.last_nan_index is not None and self.last_nan_index > self.count - 1 - self.window:
+            return NAN
+        return self.candidates[0][1]
+
+
+class Ema(StreamingState):
+    # Same recursion and rounding as pandas `ewm(span=span, adjust=False).mean()`
+    def __init__(self, span):
+        self.alpha = 1 / (1 + (span - 1) / 2)
+        self.weighted = NAN
+        self.old_wt = 1.0
+
+    def update(self, value):
+        if self.weighted == self.weighted:
+            self.old_wt *= 1 - self.alpha
+            if value == value:
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + self.alpha * value) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif value == value:
+            self.weighted = value
+        return self.weighted
+
+
+class Macd(StreamingState):
+    def __init__(self, short_window, long_window, signal_window):
+        self.short_ema = Ema(short_window)
+        self.long_ema = Ema(long_window)
+        self.signal_ema = Ema(signal_window)
+        self.macd_line = NAN
+        self.signal_line = NAN
+
+    def update(self, price):
+        self.macd_line = self.short_ema.update(price) - self.long_ema.update(price)
+        self.signal_line = self.signal_ema.update(self.macd_line)
+
+    def value(self):
+        return {
+            'macd_line': self.macd_line,
+            'signal_line': self.signal_line,
+            'histogram': self.macd_line - self.signal_line
+        }
+
+
+class Rsi(StreamingState):
+    # Rolling means of gains and losses like `calculate_rsi`, the first candle counts as a zero difference
+    def __init__(self, window):
+        self.window = window
+        self.previous_close = None
+        self.gains = RollingWindow(window)
+        self.losses = RollingWindow(window)
+
+    def update(self, close):
+        delta = NAN if self.previous_close is None else close - self.previous_close
+        self.previous_close = close
+        self.gains.update(delta if delta > 0 else 0.0)
+        self.losses.update(-delta if delta < 0 else 0.0)
+
+    def value(self):
+        if self.window == 1:
+            return NAN
+        gain = self.gains.mean()
+        loss = self.losses.mean()
+        if gain != gain or loss != loss:
+            return NAN
+        return 100 - (100 / (1 + divide(gain, loss)))
+
+
+class Stochastic(StreamingState):
+    def __init__(self, window, smooth_window):
+        self.highest_high = RollingExtreme(window, True)
+        self.lowest_low = RollingExtreme(window, False)
+        self.percent_d = RollingWindow(smooth_window)
+        self.percent_k = NAN
+
+    def update(self, high, low, close):
+        self.highest_high.update(high)
+        self.lowest_low.update(low)
+        lowest_low = self.lowest_low.value()
+        self.percent_k = divide(close - lowest_low, self.highest_high.value() - lowest_low) * 100
+        self.percent_d.update(self.percent_k)
+
+    def value(self):
+        return {
+            '%K': self.percent_k,
+            '%D': self.percent_d.mean()  # Smoothed %K
+        }
+
+
+class WilliamsR(StreamingState):
+    def __init__(self, window):
+        self.highest_high = RollingExtreme(window, True)
+        self.lowest_low = RollingExtreme(window, False)
+        self.last_close = NAN
+
+    def update(self, high, low, close):
+        self.highest_high.update(high)
+        self.lowest_low.update(low)
+        self.last_close = close
+
+    def value(self):
+        highest_high = self.highest_high.value()
+        return divide(highest_high - self.last_close, highest_high - self.lowest_low.value()) * -100
+
+
+class Cci(StreamingState):
+    def __init__(self, window):
+        self.typical_prices = RollingWindow(window)
+        self.typical_price = NAN
+
+    def update(self, high, low, close):
+        self.typical_price = (high + low + close) / 3
+        self.typical_prices.update(self.typical_price)
+
+    def value(self):
+        return divide(self.typical_price - self.typical_prices.mean(), 0.015 * self.typical_prices.mean_deviation())
+
+
+class Ichimoku(StreamingState):
+    # Latest values of each line, the senkou spans are the midpoints of `senkou_shift` candles ago
+    def __init__(self, tenkan_window, kijun_window, senkou_b_window, senkou_shift):
+        self.extremes = [
+            [RollingExtreme(window, True), RollingExtreme(window, False)]
+            for window in (tenkan_window, kijun_window, senkou_b_window)
+        ]
+        self.senkou_a_history = deque(maxlen=senkou_shift + 1)
+        self.senkou_b_history = deque(maxlen=senkou_shift + 1)
+
+    def update(self, high, low):
+        midpoints = []
+        for highest_high, lowest_low in self.extremes:
+            highest_high.update(high)
+            lowest_low.update(low)
+            midpoints.append((highest_high.value() + lowest_low.value()) / 2)
+        self.senkou_a_history.append((midpoints[0] + midpoints[1]) / 2)
+        self.senkou_b_history.append(midpoints[2])
+
+    def value(self):
+        is_shifted = len(self.senkou_a_history) == self.senkou_a_history.maxlen
+        return {
+            'tenkan_sen': (self.extremes[0][0].value() + self.extremes[0][1].value()) / 2,
+            'kijun_sen': (self.extremes[1][0].value() + self.extremes[1][1].value()) / 2,
+            'senkou_span_a': self.senkou_a_history[0] if is_shifted else NAN,
+            'senkou_span_b': self.senkou_b_history[0] if is_shifted else NAN,
+            'chikou_span': NAN  # The close of a future candle
+        }
+
+
+class Bollinger(StreamingState):
+    def __init__(self, window, num_std_dev):
+        self.prices = RollingWindow(window)
+        self.num_std_dev = num_std_dev
+
+    def update(self, price):
+        self.prices.update(price)
+
+    def value(self):
+        middle_band = self.prices.mean()
+        std_dev = self.prices.std()
+        return {
+            'middle_band': middle_band,
+            'upper_band': middle_band + (std_dev * self.num_std_dev),
+            'lower_band': middle_band - (std_dev * self.num_std_dev)
+        }
+
+
+class Atr(StreamingState):
+    def __init__(self, window):
+        self.previous_close = NAN
+        self.true_ranges = RollingWindow(window)
+
+    def update(self, high, low, close):
+        # Largest of the three ranges, ignoring the missing previous close of the first candle
+        ranges = [high - low, abs(high - self.previous_close), abs(low - self.previous_close)]
+        self.true_ranges.update(max(value for value in ranges if value == value))
+        self.previous_close = close
+
+    def value(self):
+        return self.true_ranges.mean()
+
+
+def get_settings():
+    # Parameters of every indicator, a checkpoint made with other parameters cannot be continued
+    return {
+        'TREND_INDICATORS': config['TREND_INDICATORS'],
+        'MOMENTUM_INDICATORS': config['MOMENTUM_INDICATORS'],
+        'VOLATILITY_INDICATORS': config['VOLATILITY_INDICATORS'],
+    }
+
+
+def include_open_candle(state, klines, now_ms):
+    # The other backends include the candle that is still open. It changes until it closes, so it is added to a copy
+    # and the state itself only ever advances by closed candles.
+    if state is None or len(klines) == 0:
+        return state
+    open_candle = klines[-1]
+    if open_candle[6] < now_ms or (state.last_open_time is not None and open_candle[0] <= state.last_open_time):
+        return state
+
+    preview = state.copy()
+    preview.update(float(open_candle[2]), float(open_candle[3]), float(open_candle[4]))
+    return preview
+
+
+def as_series(value):
+    # One-value arrays, so the simplify functions read the latest value like from a full series
+    if isinstance(value, dict):
+        return {key: as_series(item) for key, item in value.items()}
+    return np.array([value])
+
+
+class IndicatorState(StreamingState):
+    # All indicators of one trading pair, updated with each closed candle
+    def __init__(self):
+        trend_config = config['TREND_INDICATORS']
+        momentum_config = config['MOMENTUM_INDICATORS']
+        volatility_config = config['VOLATILITY_INDICATORS']
+        macd_config = trend_config['MACD']
+        ichimoku_config = trend_config['ICHIMOKU']
+
+        self.count = 0
+        self.last_open_time = None
+        self.interval = None
+        self.last_close = NAN
+
+        # Minimum number of candles for each indicator, like in the per-coin calculation
+        ichimoku_windows = (ichimoku_config['TENKAN_WINDOW'], ichimoku_config['KIJUN_WINDOW'],
+                            ichimoku_config['SENKOU_B_WINDOW'])
+        self.min_candles = {
+            'SMA': trend_config['SMA_WINDOW'],
+            'EMA': trend_config['EMA_WINDOW'],
+            'MACD': macd_config['LONG_WINDOW'],
+            'Ichimoku': max(ichimoku_windows),
+            'RSI': momentum_config['RSI_WINDOW'],
+            'StochasticOscillator': momentum_config['STOCHASTIC']['WINDOW'],
+            'Williams%R': momentum_config['WILLIAMS_R_WINDOW'],
+            'CCI': momentum_config['CCI_WINDOW'],
+            'ATR': volatility_config['ATR_WINDOW'],
+        }
+
+        self.sma = RollingWindow(trend_config['SMA_WINDOW'])
+        self.ema = Ema(trend_config['EMA_WINDOW'])
+        self.macd = Macd(macd_config['SHORT_WINDOW'], macd_config['LONG_WINDOW'], macd_config['SIGNAL_WINDOW'])
+        self.ichimoku = Ichimoku(*ichimoku_windows, ichimoku_config['SENKOU_SHIFT'])
+        self.rsi = Rsi(momentum_config['RSI_WINDOW'])
+        self.stochastic = Stochastic(momentum_config['STOCHASTIC']['WINDOW'],
+                                     momentum_config['STOCHASTIC']['SMOOTH_WINDOW'])
+        self.williams_r = WilliamsR(momentum_config['WILLIAMS_R_WINDOW'])
+        self.cci = Cci(momentum_config['CCI_WINDOW'])
+        self.atr = Atr(volatility_config['ATR_WINDOW'])
+        self.bollinger = None
+        if 'BOLLINGER_BANDS' in volatility_config:
+            bollinger_config = volatility_config['BOLLINGER_BANDS']
+            self.min_candles['BollingerBands'] = bollinger_config['WINDOW']
+            self.bollinger = Bollinger(bollinger_config['WINDOW'], bollinger_config['NUM_STD_DEV'])
+
+    def update(self, high, low, close):
+        self.count += 1
+        self.last_close = close
+
+        self.sma.update(close)
+        self.ema.update(close)
+        self.macd.update(close)
+        self.ichimoku.update(high, low)
+        self.rsi.update(close)
+        self.stochastic.update(high, low, close)
+        self.williams_r.update(high, low, close)
+        self.cci.update(high, low, close)
+        self.atr.update(high, low, close)
+        if self.bollinger is not None:
+            self.bollinger.update(close)
+
+    def is_ready(self, name, selected_indicators=None):
+        return (is_selected(name, selected_indicators) and name in self.min_candles and
+                self.count >= self.min_candles[name])
+
+    def get_indicators(self, selected_indicators=None):
+        # Latest values in the layout of the calculate_* functions, then simplified like every other backend
+        trend = {}
+        for name, value in [('SMA', self.sma.mean()), ('EMA', self.ema.weighted), ('MACD', self.macd.value()),
+                            ('Ichimoku', self.ichimoku.value())]:
+            if self.is_ready(name, selected_indicators):
+                trend[name] = as_series(value)
+
+        momentum = {}
+        for name, value in [('RSI', self.rsi.value()), ('StochasticOscillator', self.stochastic.value()),
+                            ('Williams%R', self.williams_r.value()), ('CCI', self.cci.value())]:
+            if self.is_ready(name, selected_indicators):
+                momentum[name] = as_series(value)
+
+        volatility = {}
+        if self.bollinger is not None and self.is_ready('BollingerBands', selected_indicators):
+            volatility['BollingerBands'] = as_series(self.bollinger.value())
+        if self.is_ready('ATR', selected_indicators):
+            volatility['ATR'] = as_series(self.atr.value())
+
+        close_prices = [self.last_close]
+        return {
+            'trend': simplify_trend_indicators(trend, close_prices),
+            'momentum': simplify_momentum_indicators(momentum),
+            'volatility': simplify_volatility_indicators(volatility, close_prices)
+        }
+
+
+# Classes a checkpoint can hold, by name
+STATE_CLASSES = {
+    state_class.__name__: state_class
+    for state_class in [RollingWindow, RollingExtreme, Ema, Macd, Rsi, Stochastic, WilliamsR, Cci, Ichimoku,
+                        Bollinger, Atr, IndicatorState]
+}
+
+
+class StreamingIndicators:
+    # Indicator states per trading pair, each closed candle is processed exactly once
+    def __init__(self):
+        self.states = {}
+
+    def update(self, symbol, klines, now_ms):
+        if len(klines) == 0:
+            return self.states.get(symbol)
+
+        # Candle records are read in the field order of a kline, as Python numbers
+        if isinstance(klines, np.ndarray):
+            klines = klines.tolist()
+
+        state = self.states.get(symbol)
+        interval = klines[0][6] - klines[0][0] + 1
+
+        # The candles must continue the state, otherwise candles are missing or the interval changed and it starts over.
+        # A first candle right after the last processed one continues it, e.g. when only new candles are passed.
+        if state is not None and state.last_open_time is not None and (
+                state.interval != interval or klines[0][0] > state.last_open_time + state.interval):
+            state = None
+        if state is None:
+            state = IndicatorState()
+            state.interval = interval
+            self.states[symbol] = state
+
+        for kline in klines:
+            # Skip processed candles and stop at the candle that is still open
+            if state.last_open_time is not None and kline[0] <= state.last_open_time:
+                continue
+            if kline[6] >= now_ms:
+                break
+            state.update(float(kline[2]), float(kline[3]), float(kline[4]))
+            state.last_open_time = kline[0]
+
+        return state
+
+    def save(self, file_path):
+        checkpoint = {
+            "settings": get_settings(),
+            "states": {symbol: state.to_dict() for symbol, state in self.states.items()},
+        }
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # Write a temporary file first, so an interrupted save never leaves a broken checkpoint
+        temporary_path = f"{file_path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(checkpoint, file)
+        os.replace(temporary_path, file_path)
+
+    def load(self, file_path):
+        # Keep the states empty when there is no checkpoint or it was made with other indicator parameters
+        if not os.path.exists(file_path):
+            return False
+
+        with open(file_path, "r") as file:
+            checkpoint = json.load(file)
+        if checkpoint.get("settings") != get_settings():
+            return False
+
+        self.states = {
+            symbol: IndicatorState.from_dict(state) for symbol, state in checkpoint["states"].items()
+        }
+        return True
@@ -1,12 +1,18 @@
-import pandas as pd
+import sys
 
+from indicators.indicator_selection import is_selected
+from indicators.numpy_kernels import get_last_value, select_backend
 from utils.file_utils import load_config_values
+from utils.import_utils import lazy_import
 
-config = load_config_values("TREND_INDICATORS")
+config = load_config_values("TREND_INDICATORS", "INDICATOR_BACKEND")
+
+# Only the pandas backend needs pandas, the other backends never load it
+pd = lazy_import("pandas")
 
 
 def calculate_sma(prices, window=14):
-    if not prices:
+    if len(prices) == 0:
         return None
 
     # Validate the window parameter
@@ -18,7 +24,7 @@ def calculate_sma(prices, window=14):
 
 
 def calculate_ema(prices, window=14):
-    if not prices:
+    if len(prices) == 0:
         return None
 
     # Validate the window parameter
@@ -30,7 +36,7 @@ def calculate_ema(prices, window=14):
 
 
 def calculate_macd(prices, short_window=12, long_window=26, signal_window=9):
-    if not prices or len(prices) < long_window:
+    if len(prices) == 0 or len(prices) < long_window:
         return None
     prices_series = pd.Series(prices)
     short_ema = prices_series.ewm(span=short_window, adjust=False).mean()
@@ -80,26 +86,29 @@ def calculate_ichimoku_cloud(highs, lows, closes, tenkan_window=9, kijun_window=
     }
 
 
-def calculate_trend_indicators(high_prices, low_prices, close_prices):
+def calculate_trend_indicators(high_prices, low_prices, close_prices, selected_indicators=None):
     indicators = {}
     try:
+        # Use the pandas functions below or the NumPy kernels with the same results
+        backend = select_backend(config['INDICATOR_BACKEND'], sys.modules[__name__])
+
         # Simple Moving Average (SMA)
         sma_period = config['TREND_INDICATORS']['SMA_WINDOW']
-        if len(close_prices) >= sma_period:
-            indicators['SMA'] = calculate_sma(close_prices, sma_period)
+        if is_selected('SMA', selected_indicators) and len(close_prices) >= sma_period:
+            indicators['SMA'] = backend.calculate_sma(close_prices, sma_period)
 
         # Exponential Moving Average (EMA)
         ema_period = config['TREND_INDICATORS']['EMA_WINDOW']
-        if len(close_prices) >= ema_period:
-            indicators['EMA'] = calculate_ema(close_prices, ema_period)
+        if is_selected('EMA', selected_indicators) and len(close_prices) >= ema_period:
+            indicators['EMA'] = backend.calculate_ema(close_prices, ema_period)
 
         # MACD
         macd_config = config['TREND_INDICATORS']['MACD']
         macd_short_window = macd_config['SHORT_WINDOW']
         macd_long_window = macd_config['LONG_WINDOW']
         macd_signal_window = macd_config['SIGNAL_WINDOW']
-        if len(close_prices) >= macd_long_window:
-            indicators['MACD'] = calculate_macd(close_prices, macd_short_window, macd_long_window, macd_signal_window)
+        if is_selected('MACD', selected_indicators) and len(close_prices) >= macd_long_window:
+            indicators['MACD'] = backend.calculate_macd(close_prices, macd_short_window, macd_long_window, macd_signal_window)
 
         # Calculate Ichimoku Cloud
         ichimoku_config = config['TREND_INDICATORS']['ICHIMOKU']
@@ -107,9 +116,10 @@ def calculate_trend_indicators(high_prices, low_prices, close_prices):
         kijun_window = ichimoku_config['KIJUN_WINDOW']
         senkou_b_window = ichimoku_config['SENKOU_B_WINDOW']
         senkou_shift = ichimoku_config['SENKOU_SHIFT']
-        if len(high_prices) >= max(tenkan_window, kijun_window, senkou_b_window):
-            indicators['Ichimoku'] = calculate_ichimoku_cloud(high_prices, low_prices, close_prices, tenkan_window, kijun_window,
-                                                              senkou_b_window, senkou_shift)
+        if is_selected('Ichimoku', selected_indicators) and \
+                len(high_prices) >= max(tenkan_window, kijun_window, senkou_b_window):
+            indicators['Ichimoku'] = backend.calculate_ichimoku_cloud(high_prices, low_prices, close_prices, tenkan_window,
+                                                                      kijun_window, senkou_b_window, senkou_shift)
 
     except Exception as e:
         print(f"Error in calculating basic indicators: {e}")
@@ -123,16 +133,16 @@ def simplify_trend_indicators(trend_indicators, close_prices):
     # Extract the latest value for each trend indicator
     if "SMA" in trend_indicators and trend_indicators["SMA"] is not None:
         sma_series = trend_indicators["SMA"]
-        if not sma_series.empty:
-            simplified["SMA"] = sma_series.iloc[-1]  # Latest SMA value
+        if len(sma_series) > 0:
+            simplified["SMA"] = get_last_value(sma_series)  # Latest SMA value
 
             # Check if close price is above or below the SMA
             simplified["above_SMA"] = close_prices[-1] > simplified["SMA"]
 
     if "EMA" in trend_indicators and trend_indicators["EMA"] is not None:
         ema_series = trend_indicators["EMA"]
-        if not ema_series.empty:
-            simplified["EMA"] = ema_series.iloc[-1]  # Latest EMA value
+        if len(ema_series) > 0:
+            simplified["EMA"] = get_last_value(ema_series)  # Latest EMA value
 
     # MACD: Add signal direction (e.g., bullish or bearish crossover)
     if "MACD" in trend_indicators and trend_indicators["MACD"]:
@@ -144,9 +154,9 @@ def simplify_trend_indicators(trend_indicators, close_prices):
         histogram = macd_data.get("histogram")
 
         if macd_line is not None and signal_line is not None:
-            simplified["MACD_current"] = macd_line.iloc[-1]
-            simplified["MACD_signal"] = signal_line.iloc[-1]
-            simplified["MACD_histogram"] = histogram.iloc[-1] if histogram is not None else None
+            simplified["MACD_current"] = get_last_value(macd_line)
+            simplified["MACD_signal"] = get_last_value(signal_line)
+            simplified["MACD_histogram"] = get_last_value(histogram) if histogram is not None else None
 
             # Determine the trend based on MACD and Signal line values
             simplified["MACD_trend"] = (
@@ -1,12 +1,18 @@
-import pandas as pd
+import sys
 
+from indicators.indicator_selection import is_selected
+from indicators.numpy_kernels import get_last_value, select_backend
 from utils.file_utils import load_config_values
+from utils.import_utils import lazy_import
 
-config = load_config_values("VOLATILITY_INDICATORS")
+config = load_config_values("VOLATILITY_INDICATORS", "INDICATOR_BACKEND")
+
+# Only the pandas backend needs pandas, the other backends never load it
+pd = lazy_import("pandas")
 
 
 def calculate_bollinger_bands(prices, window=20, num_std_dev=2):
-    if not prices or len(prices) < window:
+    if len(prices) == 0 or len(prices) < window:
         return None
 
     # Validate the window parameter
@@ -50,26 +56,30 @@ def calculate_atr(highs, lows, closes, window=14):
     return atr
 
 
-def calculate_volatility_indicators(high_prices, low_prices, close_prices):
+def calculate_volatility_indicators(high_prices, low_prices, close_prices, selected_indicators=None):
     indicators = {}
     try:
+        # Use the pandas functions below or the NumPy kernels with the same results
+        backend = select_backend(config['INDICATOR_BACKEND'], sys.modules[__name__])
+
         # Bollinger Bands
-        if 'BOLLINGER_BANDS' in config['VOLATILITY_INDICATORS']:
+        if is_selected('BollingerBands', selected_indicators) and 'BOLLINGER_BANDS' in config['VOLATILITY_INDICATORS']:
             bollinger_config = config['VOLATILITY_INDICATORS']['BOLLINGER_BANDS']
             bollinger_window = bollinger_config['WINDOW']
             num_std_dev = bollinger_config['NUM_STD_DEV']
 
             if len(close_prices) >= bollinger_window:
-                indicators['BollingerBands'] = calculate_bollinger_bands(close_prices, bollinger_window, num_std_dev)
+                indicators['BollingerBands'] = backend.calculate_bollinger_bands(close_prices, bollinger_window, num_std_dev)
             else:
                 print(f"Not enough data for Bollinger Bands: Requires at least {bollinger_window} data points")
 
         # Average True Range (ATR)
         atr_window = config['VOLATILITY_INDICATORS']['ATR_WINDOW']
-        if len(high_prices) >= atr_window and len(low_prices) >= atr_window and len(close_prices) >= atr_window:
-            indicators['ATR'] = calculate_atr(high_prices, low_prices, close_prices, atr_window)
-        else:
-            print(f"Not enough data for ATR: Requires at least {atr_window} data points")
+        if is_selected('ATR', selected_indicators):
+            if len(high_prices) >= atr_window and len(low_prices) >= atr_window and len(close_prices) >= atr_window:
+                indicators['ATR'] = backend.calculate_atr(high_prices, low_prices, close_prices, atr_window)
+            else:
+                print(f"Not enough data for ATR: Requires at least {atr_window} data points")
 
     except KeyError as e:
         print(f"Missing config key: {e}")
@@ -94,22 +104,22 @@ def simplify_volatility_indicators(volatility_indicators, close_prices):
             middle_band = bands["middle_band"]
 
             # Ensure the series are not empty before accessing the last value
-            if not upper_band.empty and not lower_band.empty and not middle_band.empty:
+            if len(upper_band) > 0 and len(lower_band) > 0 and len(middle_band) > 0:
                 # Calculate the Bollinger Band width
-                simplified["Bollinger_width"] = upper_band.iloc[-1] - lower_band.iloc[-1]
+                simplified["Bollinger_width"] = get_last_value(upper_band) - get_last_value(lower_band)
 
                 # Check if the close price is above or below the bands
-                last_close = close_prices[-1] if close_prices else None
+                last_close = close_prices[-1] if len(close_prices) else None
                 if last_close is not None:
-                    simplified["close_above_upper"] = last_close > upper_band.iloc[-1]
-                    simplified["close_below_lower"] = last_close < lower_band.iloc[-1]
+                    simplified["close_above_upper"] = last_close > get_last_value(upper_band)
+                    simplified["close_below_lower"] = last_close < get_last_value(lower_band)
 
     # ATR (Average True Range): Include volatility signal
     if "ATR" in volatility_indicators:
         atr_series = volatility_indicators["ATR"]
 
         # Ensure ATR series is not empty
-        if not atr_series.empty:
-            simplified["ATR"] = atr_series.iloc[-1]
+        if len(atr_series) > 0:
+            simplified["ATR"] = get_last_value(atr_series)
 
     return simplified
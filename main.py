@@ -1,14 +1,35 @@
+import time
+
 from indicators.indicator_base import calculate_indicators
 from order_execution.executor_base import make_transactions
-from services.data_fetcher import get_coins_data
+from services.binance_auth import get_client, get_session, rate_limiter, snapshot_mode
+from services.data_fetcher import get_coins_data, start_market_stream
+from services.http_session import get_connection_stats
+from services.snapshot import list_snapshots
 from strategies.base_strategy import analyze_coins
+from strategies.scoring_systems import REQUIRED_INDICATOR_FIELDS
+from utils.file_utils import get_data_path, load_config_values, reload_config_values
 
-if __name__ == "__main__":
+config = load_config_values("MARKET_STREAM", "SNAPSHOT")
+
+snapshot_directory = get_data_path(config["SNAPSHOT"]["DIRECTORY"])
+
+
+def reload_config():
+    # Keep the values of before when the changed file can't be used
+    try:
+        if reload_config_values():
+            print("Reloaded the changed config file")
+    except Exception as e:
+        print(f"Keeping the current config, the changed config file can't be loaded: {e}")
+
+
+def run_cycle():
     # Fetch coins data and wallet balance
     coins_data, wallet_balance = get_coins_data()
 
-    # Calculate indicators for each coin
-    coins_indicators = calculate_indicators(coins_data)
+    # Calculate the indicators the scoring systems read for each coin
+    coins_indicators = calculate_indicators(coins_data, REQUIRED_INDICATOR_FIELDS)
 
     # Analyze the indicators for each coin
     analyzed_coins = analyze_coins(coins_indicators, wallet_balance)
@@ -16,5 +37,35 @@ if __name__ == "__main__":
     # Make transactions
     make_transactions(analyzed_coins, wallet_balance, coins_data)
 
+    # Save every response of this cycle so it can be replayed offline
+    if snapshot_mode == "record":
+        print(f"Saved market snapshot to {get_client().save(snapshot_directory)}")
+
+    # Report how much of the request weight budget was used and how often we had to wait for it
+    print(f"Rate limiter metrics: {rate_limiter.get_metrics()}")
+
+    # Report how many requests reused an open connection instead of setting up a new one
+    if get_session() is not None:
+        print(f"HTTP connection metrics: {get_connection_stats(get_session())}")
+
     # Track portfolio
     # TODO: Implement portfolio tracking
+
+
+if __name__ == "__main__":
+    if snapshot_mode == "replay":
+        # Run one offline cycle per recorded snapshot, without any network access
+        for snapshot_path in list_snapshots(snapshot_directory):
+            print(f"Replaying market snapshot {snapshot_path}")
+            get_client().load(snapshot_path)
+            run_cycle()
+    elif config["MARKET_STREAM"]["ENABLED"] and snapshot_mode == "live":
+        # Keep market data current in memory and analyze it on a fixed interval
+        start_market_stream()
+        while True:
+            if config["MARKET_STREAM"]["RELOAD_CONFIG"]:
+                reload_config()
+            run_cycle()
+            time.sleep(config["MARKET_STREAM"]["CYCLE_INTERVAL_SECONDS"])
+    else:
+        run_cycle()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import time
+
+from mock_exchange.rest_server import MockExchangeServer, create_market
+
+
+def run_load_test(server, cycles):
+    # The client reads the API url when it is created, so the bot is imported only once the server runs
+    os.environ["BINANCE_BASE_URL"] = server.url
+    os.environ.setdefault("BINANCE_API_KEY", "mock_key")
+    os.environ.setdefault("BINANCE_API_SECRET", "mock_secret")
+
+    from services import data_fetcher
+    from services.binance_auth import get_session, rate_limiter
+    from services.http_session import get_connection_stats
+
+    # Keep the synthetic market out of the real caches in data/
+    data_fetcher.candle_store = None
+    data_fetcher.exchange_info_cache.ttl_seconds = 0
+
+    for cycle in range(cycles):
+        started_at = time.perf_counter()
+
+        all_symbols_data = data_fetcher.fetch_all_symbols_data()
+        potential_coins = data_fetcher.filter_potential_coins(all_symbols_data)
+        coins_data = data_fetcher.fetch_coins_data(all_symbols_data, potential_coins)
+
+        elapsed = time.perf_counter() - started_at
+        pairs = sum(len(coin_data["pairings"]) for coin_data in coins_data.values())
+        print(f"Cycle {cycle + 1}: {len(all_symbols_data['active_symbols'])} active symbols, "
+              f"{len(potential_coins)} potential coins, {pairs} candle requests in {elapsed:.2f} seconds "
+              f"({pairs / elapsed:.1f} pairs/s)")
+
+    print(f"Server metrics: {server.get_metrics()}")
+    print(f"Rate limiter metrics: {rate_limiter.get_metrics()}")
+    print(f"HTTP connection metrics: {get_connection_stats(get_session())}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the data fetcher against a local mock exchange")
+    parser.add_argument("--symbols", type=int, default=2000, help="Number of synthetic symbols")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic market")
+    parser.add_argument("--snapshot", help="Serve a recorded snapshot instead of synthetic data")
+    parser.add_argument("--cycles", type=int, default=3, help="Number of fetch cycles to run")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Maximum random seconds added on top")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with a 503")
+    parser.add_argument("--weight-limit", type=int, default=6000, help="Request weight allowed per minute")
+    args = parser.parse_args()
+
+    mock_server = MockExchangeServer(create_market(args.symbols, args.seed, args.snapshot), latency=args.latency,
+                                     jitter=args.jitter, error_rate=args.error_rate,
+                                     weight_limit=args.weight_limit, seed=args.seed).start()
+    try:
+        run_load_test(mock_server, args.cycles)
+    finally:
+        mock_server.stop()
@@ -0,0 +1,348 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from services.candle_store import interval_to_milliseconds
+from services.rate_limiter import get_request_weight
+from services.snapshot import get_request_key, load_snapshot
+
+# Spot endpoints used by the bot, mapped to the client method that calls them
+ENDPOINTS = {
+    ("GET", "/api/v3/exchangeInfo"): "exchange_info",
+    ("GET", "/api/v3/ticker/price"): "ticker_price",
+    ("GET", "/api/v3/ticker/24hr"): "ticker_24hr",
+    ("GET", "/api/v3/klines"): "klines",
+    ("GET", "/api/v3/account"): "account",
+    ("POST", "/api/v3/order/test"): "new_order_test",
+    ("POST", "/api/v3/order"): "new_order",
+}
+
+# Length of the window the exchange counts request weight in
+WEIGHT_WINDOW_SECONDS = 60
+
+DEFAULT_KLINES_LIMIT = 500
+MAX_KLINES_LIMIT = 1000
+
+
+def select_klines(klines, limit, start_time=None, end_time=None):
+    # Same selection as the exchange, the first candles from the start time or otherwise the latest ones, both up to
+    # the end time
+    if end_time is not None:
+        klines = [kline for kline in klines if kline[0] <= end_time]
+    if start_time is not None:
+        return [kline for kline in klines if kline[0] >= start_time][:limit]
+    return klines[-limit:]
+
+
+def make_symbol_filters(price):
+    # Filters in the layout of the exchange, enough for orders to pass validation
+    tick_size = 10 ** (len(str(int(price))) - 6)
+    return [
+        {"filterType": "PRICE_FILTER", "minPrice": f"{tick_size:.8f}", "maxPrice": "1000000.00000000",
+         "tickSize": f"{tick_size:.8f}"},
+        {"filterType": "LOT_SIZE", "minQty": "0.00001000", "maxQty": "9000000.00000000", "stepSize": "0.00001000"},
+        {"filterType": "NOTIONAL", "minNotional": "5.00000000", "applyMinToMarket": True,
+         "maxNotional": "9000000.00000000", "applyMaxToMarket": False, "avgPriceMins": 5},
+        {"filterType": "TRAILING_DELTA", "minTrailingAboveDelta": 10, "maxTrailingAboveDelta": 2000,
+         "minTrailingBelowDelta": 10, "maxTrailingBelowDelta": 2000},
+    ]
+
+
+class SyntheticMarket:
+    def __init__(self, symbol_count=100, seed=0, interval="1h", candle_count=MAX_KLINES_LIMIT):
+        self.seed = seed
+        self.interval_ms = interval_to_milliseconds(interval)
+        self.candle_count = candle_count
+        self.candles = {}
+        self.lock = threading.Lock()
+        rng = random.Random(seed)
+
+        # Coins quoted in USDT, with every fifth coin also quoted in BTC
+        self.base_prices = {}
+        symbols = []
+        for i in range(symbol_count):
+            base_asset = f"COIN{i}"
+            quote_asset = "BTC" if i % 5 == 4 else "USDT"
+            symbol = f"{base_asset}{quote_asset}"
+            self.base_prices[symbol] = round(rng.uniform(0.01, 1000), 4)
+            symbols.append({
+                "symbol": symbol,
+                "status": "TRADING" if rng.random() > 0.05 else "BREAK",
+                "baseAsset": base_asset,
+                "quoteAsset": quote_asset,
+                "baseAssetPrecision": 8,
+                "quotePrecision": 8,
+                "filters": make_symbol_filters(self.base_prices[symbol]),
+            })
+        self.exchange_info = {"timezone": "UTC", "serverTime": int(time.time() * 1000), "symbols": symbols}
+
+        # 24 hour statistics derived from the generated candles
+        self.prices = []
+        self.stats = []
+        for symbol in self.base_prices:
+            day = self.klines(symbol, 24)
+            open_price, last_price = float(day[0][1]), float(day[-1][4])
+            self.prices.append({"symbol": symbol, "price": day[-1][4]})
+            self.stats.append({
+                "symbol": symbol,
+                "priceChangePercent": f"{(last_price - open_price) / open_price * 100:.3f}",
+                "openPrice": day[0][1],
+                "lastPrice": day[-1][4],
+                "highPrice": f"{max(float(kline[2]) for kline in day):.8f}",
+                "lowPrice": f"{min(float(kline[3]) for kline in day):.8f}",
+                "volume": f"{sum(float(kline[5]) for kline in day):.8f}",
+                "quoteVolume": f"{sum(float(kline[7]) for kline in day):.8f}",
+                "bidPrice": f"{last_price * 0.999:.8f}",
+                "askPrice": f"{last_price * 1.001:.8f}",
+            })
+
+        self.account = {"balances": [
+            {"asset": "USDT", "free": "1000.00000000", "locked": "0.00000000"},
+            {"asset": "COIN0", "free": "1.00000000", "locked": "0.00000000"},
+        ]}
+
+    def klines(self, symbol, limit, start_time=None, end_time=None):
+        # Generate the candles of a symbol once per interval, so the server keeps up with many clients. The handler
+        # threads share the candles, so only one of them generates a symbol and none reads it half replaced.
+        last_open_time = int(time.time() * 1000) // self.interval_ms * self.interval_ms
+        with self.lock:
+            if symbol not in self.candles or self.candles[symbol][0] != last_open_time:
+                self.candles[symbol] = (last_open_time, self.generate_klines(symbol, last_open_time))
+            klines = self.candles[symbol][1]
+
+        return select_klines(klines, limit, start_time, end_time)
+
+    def generate_klines(self, symbol, last_open_time):
+        # Random walk per symbol, the same seed always produces the same candles
+        rng = random.Random(f"{self.seed}:{symbol}")
+        first_open_time = last_open_time - (self.candle_count - 1) * self.interval_ms
+
+        klines = []
+        close_price = self.base_prices[symbol]
+        for i in range(self.candle_count):
+            open_time = first_open_time + i * self.interval_ms
+            open_price = close_price
+            close_price = max(open_price * (1 + rng.gauss(0, 0.02)), 1e-8)
+            high_price = max(open_price, close_price) * (1 + rng.random() * 0.01)
+            low_price = min(open_price, close_price) * (1 - rng.random() * 0.01)
+            volume = rng.uniform(10, 1000)
+            klines.append([
+                open_time, f"{open_price:.8f}", f"{high_price:.8f}", f"{low_price:.8f}", f"{close_price:.8f}",
+                f"{volume:.8f}", open_time + self.interval_ms - 1, f"{volume * close_price:.8f}",
+                rng.randint(10, 1000), f"{volume / 2:.8f}", f"{volume * close_price / 2:.8f}", "0",
+            ])
+
+        return klines
+
+
+class SnapshotMarket:
+    def __init__(self, responses):
+        # Serve the latest recorded response of each endpoint
+        def latest(method_name):
+            return responses[get_request_key(method_name, (), {})][-1]
+
+        self.exchange_info = latest("exchange_info")
+        self.prices = latest("ticker_price")
+        self.stats = latest("ticker_24hr")
+        self.account = latest("account")
+
+        # Merge every recorded candle request by symbol and open time
+        candles = {}
+        for key, recorded in responses.items():
+            method_name, _, kwargs = json.loads(key)
+            if method_name == "klines":
+                for klines in recorded:
+                    candles.setdefault(kwargs["symbol"], {}).update((kline[0], kline) for kline in klines)
+        self.candles = {symbol: [klines[open_time] for open_time in sorted(klines)] for symbol, klines in candles.items()}
+
+    def klines(self, symbol, limit, start_time=None, end_time=None):
+        return select_klines(self.candles.get(symbol, []), limit, start_time, end_time)
+
+
+class MockExchangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def log_message(self, *_):
+        # Keep load tests quiet
+        pass
+
+    def send_json(self, status, data, used_weight, headers=None):
+        body = json.dumps(data, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-MBX-USED-WEIGHT-1M", str(used_weight))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_request(self, http_method):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        method_name = ENDPOINTS.get((http_method, url.path))
+        server = self.server
+
+        if method_name is None:
+            self.send_json(404, {"code": -1000, "msg": f"Unknown endpoint {http_method} {url.path}"}, 0)
+            return
+
+        # Count the request weight like the exchange and reject requests over the limit
+        weight = get_request_weight(method_name, {"symbol": params["symbol"]} if "symbol" in params else {})
+        used_weight, retry_after = server.use_weight(weight)
+        if retry_after:
+            server.count("rate_limited")
+            self.send_json(429, {"code": -1003, "msg": "Too much request weight used; please use the websocket."},
+                           used_weight, {"Retry-After": str(retry_after)})
+            return
+
+        # Simulate the network and the exchange's processing time
+        time.sleep(server.get_latency())
+
+        if server.should_fail():
+            server.count("errors")
+            self.send_json(503, {"code": -1001, "msg": "Internal error; unable to process your request."},
+                           used_weight)
+            return
+
+        try:
+            data = self.get_response(method_name, params)
+        except KeyError as e:
+            self.send_json(400, {"code": -1121, "msg": f"Invalid symbol {e}."}, used_weight)
+            return
+
+        server.count("requests")
+        self.send_json(200, data, used_weight)
+
+    def get_response(self, method_name, params):
+        market = self.server.market
+
+        if method_name == "exchange_info":
+            return market.exchange_info
+        if method_name in ("ticker_price", "ticker_24hr"):
+            tickers = market.prices if method_name == "ticker_price" else market.stats
+            if "symbol" in params:
+                return {ticker["symbol"]: ticker for ticker in tickers}[params["symbol"]]
+            return tickers
+        if method_name == "klines":
+            limit = min(int(params.get("limit", DEFAULT_KLINES_LIMIT)), MAX_KLINES_LIMIT)
+            start_time = int(params["startTime"]) if "startTime" in params else None
+            end_time = int(params["endTime"]) if "endTime" in params else None
+            return market.klines(params["symbol"], limit, start_time, end_time)
+        if method_name == "account":
+            return market.account
+
+        # Test orders are only validated, real orders are acknowledged without being matched
+        if method_name == "new_order_test":
+            return {}
+        return {"symbol": params.get("symbol"), "orderId": self.server.next_order_id(), "status": "NEW"}
+
+
+class MockExchangeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, market, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 weight_limit=6000, seed=None, clock=time.monotonic):
+        super().__init__((host, port), MockExchangeHandler)
+        self.market = market
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.weight_limit = weight_limit
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+        # Weight used in the current window
+        self.window_start = clock()
+        self.used_weight = 0
+        self.order_id = 0
+
+        # Metrics
+        self.metrics = {"requests": 0, "errors": 0, "rate_limited": 0, "weight_used": 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    def use_weight(self, weight):
+        with self.lock:
+            now = self.clock()
+            if now - self.window_start >= WEIGHT_WINDOW_SECONDS:
+                self.window_start = now
+                self.used_weight = 0
+
+            # The exchange counts rejected requests as well
+            self.used_weight += weight
+            self.metrics["weight_used"] += weight
+            if self.used_weight > self.weight_limit:
+                return self.used_weight, max(int(self.window_start + WEIGHT_WINDOW_SECONDS - now) + 1, 1)
+
+            return self.used_weight, 0
+
+    def get_latency(self):
+        with self.lock:
+            return self.latency + self.rng.uniform(0, self.jitter)
+
+    def should_fail(self):
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+    def count(self, metric):
+        with self.lock:
+            self.metrics[metric] += 1
+
+    def next_order_id(self):
+        with self.lock:
+            self.order_id += 1
+            return self.order_id
+
+    def get_metrics(self):
+        with self.lock:
+            return dict(self.metrics)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def create_market(symbol_count=100, seed=0, snapshot_path=None):
+    # Recorded snapshots take precedence over generated data
+    if snapshot_path:
+        return SnapshotMarket(load_snapshot(snapshot_path))
+    return SyntheticMarket(symbol_count, seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Binance spot endpoints used by the bot locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--symbols", type=int, default=100, help="Number of synthetic symbols")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic market")
+    parser.add_argument("--snapshot", help="Serve a recorded snapshot instead of synthetic data")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added on top")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with a 503")
+    parser.add_argument("--weight-limit", type=int, default=6000, help="Request weight allowed per minute")
+    args = parser.parse_args()
+
+    server = MockExchangeServer(create_market(args.symbols, args.seed, args.snapshot), args.host, args.port,
+                                args.latency, args.jitter, args.error_rate, args.weight_limit, args.seed)
+    print(f"Serving {len(server.market.exchange_info['symbols'])} symbols on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,199 @@
+import argparse
+import base64
+import hashlib
+import json
+import socketserver
+import struct
+import threading
+import time
+
+# Magic value from RFC 6455 used to answer the opening handshake
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_TEXT = 0x1
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def encode_frame(payload, opcode=OPCODE_TEXT):
+    # Frames sent by a server are never masked
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 2 ** 16:
+        header += bytes([126]) + struct.pack("!H", length)
+    else:
+        header += bytes([127]) + struct.pack("!Q", length)
+
+    return header + payload
+
+
+def read_exactly(connection, size):
+    data = b""
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by the client")
+        data += chunk
+    return data
+
+
+def read_frame(connection):
+    first_byte, second_byte = read_exactly(connection, 2)
+    opcode = first_byte & 0x0F
+    length = second_byte & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", read_exactly(connection, 2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", read_exactly(connection, 8))[0]
+
+    # Frames sent by a client are always masked
+    mask = read_exactly(connection, 4) if second_byte & 0x80 else b"\x00\x00\x00\x00"
+    payload = read_exactly(connection, length)
+    payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+    return opcode, payload
+
+
+class StreamReplayHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        if not self.handshake():
+            return
+
+        self.send_lock = threading.Lock()
+        self.subscribed = threading.Event()
+        self.closed = threading.Event()
+        self.server.connections += 1
+
+        # Answer subscriptions and control frames while the frames are replayed
+        reader = threading.Thread(target=self.read_messages, daemon=True)
+        reader.start()
+
+        try:
+            self.replay()
+        except OSError:
+            pass
+        finally:
+            self.closed.set()
+            self.request.close()
+
+    def handshake(self):
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                return False
+            request += chunk
+
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        accept = base64.b64encode(
+            hashlib.sha1((headers["sec-websocket-key"] + WEBSOCKET_GUID).encode()).digest()
+        ).decode()
+        self.request.sendall(
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+        return True
+
+    def send(self, payload, opcode=OPCODE_TEXT):
+        with self.send_lock:
+            self.request.sendall(encode_frame(payload, opcode))
+
+    def read_messages(self):
+        try:
+            while not self.closed.is_set():
+                opcode, payload = read_frame(self.request)
+                if opcode == OPCODE_TEXT:
+                    message = json.loads(payload)
+                    if message.get("method") == "SUBSCRIBE":
+                        self.server.subscriptions.extend(message.get("params", []))
+                        self.send(json.dumps({"result": None, "id": message.get("id")}))
+                        self.subscribed.set()
+                elif opcode == OPCODE_PING:
+                    self.send(payload, OPCODE_PONG)
+                elif opcode == OPCODE_CLOSE:
+                    self.send(payload[:2], OPCODE_CLOSE)
+                    break
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.closed.set()
+
+    def replay(self):
+        # Start replaying once the client has subscribed to its streams
+        if not self.subscribed.wait(timeout=self.server.subscribe_timeout):
+            return
+
+        for frame in self.server.frames:
+            if self.closed.is_set():
+                return
+            self.send(frame)
+            time.sleep(self.server.frame_interval)
+
+        # Either drop the connection to exercise reconnects, or keep it open until the client leaves
+        if self.server.close_after_replay:
+            self.send(struct.pack("!H", 1000), OPCODE_CLOSE)
+        else:
+            self.closed.wait()
+
+
+class StreamReplayServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, frames, host="127.0.0.1", port=0, frame_interval=0.0, close_after_replay=False,
+                 subscribe_timeout=10.0):
+        super().__init__((host, port), StreamReplayHandler)
+        self.frames = [frame if isinstance(frame, str) else json.dumps(frame) for frame in frames]
+        self.frame_interval = frame_interval
+        self.close_after_replay = close_after_replay
+        self.subscribe_timeout = subscribe_timeout
+
+        # Metrics
+        self.connections = 0
+        self.subscriptions = []
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"ws://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def load_frames(file_path):
+    # Recorded frames are stored one raw message per line
+    with open(file_path, "r") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded Binance stream frames over a local WebSocket")
+    parser.add_argument("frames", help="File with one recorded stream message per line")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between replayed frames")
+    parser.add_argument("--close-after-replay", action="store_true", help="Drop each connection after the replay")
+    args = parser.parse_args()
+
+    server = StreamReplayServer(load_frames(args.frames), args.host, args.port, args.interval, args.close_after_replay)
+    print(f"Replaying {len(server.frames)} frames on {server.url}")
+    server.serve_forever()
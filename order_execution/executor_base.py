@@ -1,4 +1,4 @@
-from services.binance_auth import client
+from services.binance_auth import get_client
 from services.wallet_info import fetch_wallet_balance
 from utils.file_utils import save_data_to_file, load_config_values
 from utils.order_execution import check_coin_balance, extract_filter_parameters, round_number, format_price, validate_quantity
@@ -94,12 +94,12 @@ def buy_coin_with_usdt(coin_to_buy, amount_to_use, coins_data):
     # Define the trading pair
     trading_pair = f"{coin_to_buy}USDT"
 
-    # Extract filters for the trading pair
-    filters = coins_data[coin_to_buy]['pair_metadata'][trading_pair]['filters']
-    filter_params = extract_filter_parameters(filters)
+    # Use the filters parsed by the symbol index, parse them here only when they are missing
+    pair_metadata = coins_data[coin_to_buy]['pair_metadata'][trading_pair]
+    filter_params = pair_metadata.get('filter_params') or extract_filter_parameters(pair_metadata['filters'])
 
     # Get the current price from the market
-    current_price = float(client.ticker_price(symbol=trading_pair)['price'])
+    current_price = float(get_client().ticker_price(symbol=trading_pair)['price'])
 
     # Calculate, process and validate quantity
     quantity = calculate_quantity(
@@ -124,7 +124,7 @@ def buy_coin_with_usdt(coin_to_buy, amount_to_use, coins_data):
     try:
         # NOTE: Remove the test part whenever needed
         # Place a buy order
-        buy_order = client.new_order_test(
+        buy_order = get_client().new_order_test(
             symbol=trading_pair,
             side='BUY',
             type='MARKET',
@@ -140,7 +140,7 @@ def buy_coin_with_usdt(coin_to_buy, amount_to_use, coins_data):
         # TODO: Take profit and stop loss should cancel each other whenever executed
 
         # Place the take-profit order (take-profit-limit)
-        take_profit_order = client.new_order_test(
+        take_profit_order = get_client().new_order_test(
             symbol=trading_pair,
             side='SELL',
             type='TAKE_PROFIT_LIMIT',
@@ -156,7 +156,7 @@ def buy_coin_with_usdt(coin_to_buy, amount_to_use, coins_data):
         save_data_to_file(take_profit_order, "transactions", "take_profit_order")
 
         # Place the stop-loss order (stop-loss-limit)
-        stop_loss_order = client.new_order_test(
+        stop_loss_order = get_client().new_order_test(
             symbol=trading_pair,
             side='SELL',
             type='STOP_LOSS_LIMIT',
@@ -181,12 +181,12 @@ def sell_coin_for_usdt(coin_to_sell, amount_to_use, coins_data, wallet_balance):
         # Define the trading pair
         trading_pair = f"{coin_to_sell}USDT"
 
-        # Extract filters for the trading pair
-        filters = coins_data[coin_to_sell]['pair_metadata'][trading_pair]['filters']
-        filter_params = extract_filter_parameters(filters)
+        # Use the filters parsed by the symbol index, parse them here only when they are missing
+        pair_metadata = coins_data[coin_to_sell]['pair_metadata'][trading_pair]
+        filter_params = pair_metadata.get('filter_params') or extract_filter_parameters(pair_metadata['filters'])
 
         # Get the current price from the market
-        current_price = float(client.ticker_price(symbol=trading_pair)['price'])
+        current_price = float(get_client().ticker_price(symbol=trading_pair)['price'])
 
         # Find the coin_to_sell in the wallet
         coin_balance = check_coin_balance(wallet_balance, coin_to_sell)
@@ -200,7 +200,7 @@ def sell_coin_for_usdt(coin_to_sell, amount_to_use, coins_data, wallet_balance):
         )
 
         # Place a sell order
-        order = client.new_order_test(
+        order = get_client().new_order_test(
             symbol=trading_pair,
             side='SELL',
             type='MARKET',
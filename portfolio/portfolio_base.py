@@ -1,12 +1,12 @@
 import csv
-from services.binance_auth import client
+from services.binance_auth import get_client
 from utils.file_utils import save_data_to_file, load_data_from_file
 
 
 # NOTE: The whole file is not being used yet
 def get_wallet_info():
     # Fetch wallet info
-    wallet_info = client.account()
+    wallet_info = get_client().account()
 
     wallet_balance = []
 
@@ -17,7 +17,7 @@ def get_wallet_info():
     ]
 
     # Fetch coin prices
-    prices = {price['symbol']: float(price['price']) for price in client.ticker_price()}
+    prices = {price['symbol']: float(price['price']) for price in get_client().ticker_price()}
 
     # Process balances
     for balance in wallet_info['balances']:
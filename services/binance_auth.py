@@ -1,21 +1,92 @@
 import logging
 import os
+import threading
 
-from binance.lib.utils import config_logging
-from binance.spot import Spot
-from dotenv import load_dotenv
+from services.rate_limiter import RateLimiter, RateLimitedClient
+from services.snapshot import RecordingClient, ReplayClient
+from utils.file_utils import load_config_values
 
-# Configure logging
-config_logging(logging, logging.INFO)
-load_dotenv()
+config = load_config_values("RATE_LIMITS", "SNAPSHOT", "HTTP_CONNECTIONS", "DATA_FETCHING")
 
-# Set up API keys
-API_KEY = os.getenv("BINANCE_API_KEY")
-API_SECRET = os.getenv("BINANCE_API_SECRET")
+# Either talk to the exchange (live), record every response of a cycle (record) or run offline (replay)
+snapshot_mode = config["SNAPSHOT"]["MODE"]
 
-# Validate API keys
-if not API_KEY or not API_SECRET:
-    raise ValueError("Binance API credentials are missing. Please check your .env file.")
+# Share one request weight budget between every call made through the client
+rate_limiter = RateLimiter(
+    weight_limit=config["RATE_LIMITS"]["WEIGHT_LIMIT_PER_MINUTE"],
+    safety_margin=config["RATE_LIMITS"]["SAFETY_MARGIN"],
+)
 
-# Initialize the Binance client
-client = Spot(api_key=API_KEY, api_secret=API_SECRET)
+# Client and its HTTP session (replayed cycles have none), created by the first `get_client` call
+client = None
+session = None
+client_lock = threading.Lock()
+
+
+def create_client():
+    # The Binance connector and its HTTP stack are only loaded once the exchange is used
+    from binance.lib.utils import config_logging
+    from binance.spot import Spot
+    from dotenv import load_dotenv
+
+    from services.http_session import configure_session
+
+    # Configure logging
+    config_logging(logging, logging.INFO)
+    load_dotenv()
+
+    if snapshot_mode == "replay":
+        # Serve the responses of recorded snapshots, loaded one cycle at a time
+        return ReplayClient(), None
+
+    # Set up API keys
+    api_key = os.getenv("BINANCE_API_KEY")
+    api_secret = os.getenv("BINANCE_API_SECRET")
+
+    # Optional API url, e.g. the local mock exchange in mock_exchange/rest_server.py
+    base_url = os.getenv("BINANCE_BASE_URL")
+    spot_options = {"base_url": base_url} if base_url else {}
+
+    # Validate API keys, replayed cycles never reach the exchange
+    if not api_key or not api_secret:
+        raise ValueError("Binance API credentials are missing. Please check your .env file.")
+
+    # Initialize the Binance client, with the used weight returned next to each response
+    spot_client = Spot(api_key=api_key, api_secret=api_secret, show_limit_usage=True, **spot_options)
+
+    # Give every concurrent candlestick request its own keep-alive connection
+    configure_session(
+        spot_client.session,
+        pool_size=max(config["HTTP_CONNECTIONS"]["POOL_SIZE"], config["DATA_FETCHING"]["MAX_CONCURRENT_REQUESTS"]),
+        max_hosts=config["HTTP_CONNECTIONS"]["MAX_HOSTS"],
+        compression=config["HTTP_CONNECTIONS"]["COMPRESSION"],
+    )
+
+    rate_limited_client = RateLimitedClient(
+        spot_client,
+        rate_limiter,
+        max_retries=config["RATE_LIMITS"]["MAX_RETRIES"],
+    )
+
+    # Keep a copy of every response so the cycle can be replayed later
+    if snapshot_mode == "record":
+        return RecordingClient(rate_limited_client), spot_client.session
+
+    return rate_limited_client, spot_client.session
+
+
+def get_client():
+    global client, session
+
+    # Concurrent candlestick requests may ask for the client at the same time, it is only created once
+    if client is None:
+        with client_lock:
+            if client is None:
+                client, session = create_client()
+
+    return client
+
+
+def get_session():
+    get_client()
+    return session
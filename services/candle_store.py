@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+
+# One fixed-size record per candle, following the field order of a Binance kline
+CANDLE_RECORD_DTYPE = np.dtype([
+    ("open_time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+    ("close_time", "<i8"),
+    ("quote_volume", "<f8"),
+    ("trades", "<i8"),
+    ("taker_buy_base_volume", "<f8"),
+    ("taker_buy_quote_volume", "<f8"),
+])
+
+# Length of each kline interval in milliseconds
+INTERVAL_UNITS_MS = {"s": 1000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def interval_to_milliseconds(interval):
+    return int(interval[:-1]) * INTERVAL_UNITS_MS[interval[-1]]
+
+
+def klines_to_records(klines):
+    # Parse the string-valued klines into records in a single pass
+    field_count = len(CANDLE_RECORD_DTYPE.names)
+    return np.array([tuple(kline[:field_count]) for kline in klines], dtype=CANDLE_RECORD_DTYPE)
+
+
+def records_to_klines(records):
+    # Convert records back into the kline layout returned by the exchange
+    return [
+        [
+            open_time, str(open_price), str(high), str(low), str(close), str(volume), close_time,
+            str(quote_volume), trades, str(taker_buy_base_volume), str(taker_buy_quote_volume), "0",
+        ]
+        for (
+            open_time, open_price, high, low, close, volume, close_time,
+            quote_volume, trades, taker_buy_base_volume, taker_buy_quote_volume,
+        ) in records.tolist()
+    ]
+
+
+class CandleStore:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, symbol, interval):
+        return os.path.join(self.directory, interval, f"{symbol}.bin")
+
+    def count(self, symbol, interval):
+        path = self._path(symbol, interval)
+        if not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // CANDLE_RECORD_DTYPE.itemsize
+
+    def load(self, symbol, interval, limit=None):
+        # Read only the last `limit` records from the end of the segment file
+        count = self.count(symbol, interval)
+        if count == 0:
+            return np.empty(0, dtype=CANDLE_RECORD_DTYPE)
+
+        start = 0 if limit is None else max(count - limit, 0)
+        return np.fromfile(
+            self._path(symbol, interval),
+            dtype=CANDLE_RECORD_DTYPE,
+            count=count - start,
+            offset=start * CANDLE_RECORD_DTYPE.itemsize,
+        )
+
+    def first_open_time(self, symbol, interval):
+        if self.count(symbol, interval) == 0:
+            return None
+        first_record = np.fromfile(self._path(symbol, interval), dtype=CANDLE_RECORD_DTYPE, count=1)
+        return int(first_record["open_time"][0])
+
+    def last_open_time(self, symbol, interval):
+        last_record = self.load(symbol, interval, limit=1)
+        return int(last_record["open_time"][0]) if len(last_record) else None
+
+    def append(self, symbol, interval, klines):
+        if not klines:
+            return
+
+        records = klines_to_records(klines)
+        path = self._path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Drop stored candles that the new ones replace (e.g. the candle that was still open)
+        count = self.count(symbol, interval)
+        if count:
+            open_times = np.memmap(path, dtype=CANDLE_RECORD_DTYPE, mode="r", shape=(count,))["open_time"]
+            keep = int(np.searchsorted(open_times, records["open_time"][0], side="left"))
+            del open_times
+            if keep < count:
+                os.truncate(path, keep * CANDLE_RECORD_DTYPE.itemsize)
+
+        with open(path, "ab") as file:
+            records.tofile(file)
+
+    def prepend(self, symbol, interval, klines):
+        # Older candles go before the stored ones, which means rewriting the segment file
+        first_open_time = self.first_open_time(symbol, interval)
+        records = klines_to_records(klines)
+        if first_open_time is not None:
+            records = records[records["open_time"] < first_open_time]
+        if len(records) == 0:
+            return
+
+        path = self._path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write a temporary file first, so an interrupted rewrite never loses the stored candles
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as file:
+            records.tofile(file)
+            self.load(symbol, interval).tofile(file)
+        os.replace(temporary_path, path)
+
+    def reset(self, symbol, interval):
+        path = self._path(symbol, interval)
+        if os.path.exists(path):
+            os.remove(path)
@@ -1,8 +1,63 @@
-from services.binance_auth import client
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.binance_auth import get_client, snapshot_mode
+from services.candle_store import CandleStore, interval_to_milliseconds, klines_to_records, records_to_klines
+from services.exchange_info_cache import ExchangeInfoCache
+from services.market_screener import load_ticker_table, screen_tickers
+from services.market_stream import MarketState, MarketStream
 from services.wallet_info import fetch_wallet_balance
-from utils.file_utils import save_data_to_file, load_config_values
+from utils.file_utils import save_data_to_file, load_config_values, get_data_path
 
-config = load_config_values("PRICE_CHANGE_THRESHOLD", "PRICE_RANGE_VOLATILITY_THRESHOLD")
+config = load_config_values("PRICE_CHANGE_THRESHOLD", "PRICE_RANGE_VOLATILITY_THRESHOLD", "MIN_QUOTE_VOLUME",
+                            "QUOTE_ASSETS", "MAX_SPREAD", "DATA_FETCHING", "EXCHANGE_INFO_CACHE",
+                            "MARKET_STREAM")
+
+# Snapshots must hold every response of a cycle, so nothing is served from local caches while recording or replaying
+use_local_caches = snapshot_mode == "live"
+
+# Keep downloaded candles on disk so each cycle only fetches the new ones
+candle_store = None
+if config["DATA_FETCHING"]["USE_CANDLE_STORE"] and use_local_caches:
+    candle_store = CandleStore(get_data_path("candles"))
+
+# Maximum number of candles the exchange returns for a single request
+MAX_KLINES_PER_REQUEST = 1000
+
+# Pairs and intervals the exchange has no older candles of than the stored ones
+complete_histories = set()
+
+
+def fetch_exchange_info():
+    return get_client().exchange_info()
+
+
+# Reuse the exchange info and the symbol index built from it until it expires
+exchange_info_cache = ExchangeInfoCache(
+    fetch_exchange_info,
+    os.path.join(get_data_path("cache"), "exchange_info.json"),
+    config["EXCHANGE_INFO_CACHE"]["TTL_SECONDS"] if use_local_caches else 0,
+)
+
+# Stream keeping candles and tickers current in memory, only set once `start_market_stream` is called
+market_stream = None
+
+
+def start_market_stream():
+    global market_stream
+
+    # Candles of new pairs are backfilled over REST, as are gaps after a reconnect
+    market_state = MarketState(config["DATA_FETCHING"]["CANDLESTICK_LIMIT"])
+    market_stream = MarketStream(
+        market_state,
+        fetch_klines_from_rest,
+        config["MARKET_STREAM"]["STREAM_URL"],
+        config["DATA_FETCHING"]["CANDLESTICK_INTERVAL"],
+    )
+    market_stream.start([])
+
+    return market_stream
 
 
 def get_coins_data():
@@ -30,97 +85,153 @@ def get_coins_data():
 
 
 def fetch_all_symbols_data():
-    # Fetch exchange information (metadata for symbols)
-    exchange_info = client.exchange_info()
-    active_symbols = {symbol['symbol'] for symbol in exchange_info['symbols'] if symbol['status'] == 'TRADING'}
+    # Fetch exchange information (metadata for symbols) and the index of its active symbols
+    exchange_info, active_symbols, symbol_index = exchange_info_cache.get()
+
+    if market_stream is not None and market_stream.market_state.mini_tickers:
+        # Read prices and 24-hour statistics kept current by the market stream
+        prices = market_stream.market_state.get_prices()
+        stats = market_stream.market_state.get_ticker_stats()
+    else:
+        # Fetch current market prices (real-time data) and 24-hour market statistics
+        prices = get_client().ticker_price()
+        stats = get_client().ticker_24hr()
 
-    # Fetch current market prices (real-time data)
-    prices = client.ticker_price()
     trading_prices = [price for price in prices if price['symbol'] in active_symbols]
-
-    # Fetch 24-hour market statistics
-    stats = client.ticker_24hr()
     trading_stats = [stat for stat in stats if stat['symbol'] in active_symbols]
 
     # Return all data in a dictionary
     return {
         "exchange_info": exchange_info,  # Full exchange metadata
         "active_symbols": active_symbols,  # Set of active trading pairs
+        "symbol_index": symbol_index,  # Pairs, metadata and filters of active symbols
         "prices": trading_prices,  # Filtered price data
         "stats": trading_stats,  # Filtered 24-hour stats
     }
 
 
 def filter_potential_coins(all_symbols_data):
-    # Define filter thresholds
-    price_change_threshold = config["PRICE_CHANGE_THRESHOLD"]
-    price_range_volatility_threshold = config["PRICE_RANGE_VOLATILITY_THRESHOLD"]
-
-    # Extract relevant data from input
-    symbols = all_symbols_data["exchange_info"]["symbols"]
-    active_symbols = all_symbols_data["active_symbols"]
-    stats = all_symbols_data["stats"]
-
-    # Map symbols to their respective base and quote assets using symbols
-    symbol_mapping = {
-        symbol_data['symbol']: {
-            'baseAsset': symbol_data['baseAsset'],
-            'quoteAsset': symbol_data['quoteAsset']
-        }
-        for symbol_data in symbols
-    }
-
-    # Filter symbols based on criteria
-    filtered_symbols = [
-        stat['symbol']
-        for stat in stats
-        if stat['symbol'] in active_symbols and
-           abs(float(stat['priceChangePercent'])) > price_change_threshold and
-           (float(stat['highPrice']) - float(stat['lowPrice'])) / float(
-            stat['lowPrice']) > price_range_volatility_threshold
-    ]
+    # Load the 24-hour stats of active symbols into columns
+    ticker_table = load_ticker_table(all_symbols_data["stats"], all_symbols_data["symbol_index"])
+
+    # Apply every screen to all symbols at once
+    mask = screen_tickers(
+        ticker_table,
+        price_change_threshold=config["PRICE_CHANGE_THRESHOLD"],
+        price_range_volatility_threshold=config["PRICE_RANGE_VOLATILITY_THRESHOLD"],
+        min_quote_volume=config["MIN_QUOTE_VOLUME"],
+        quote_assets=config["QUOTE_ASSETS"],
+        max_spread=config["MAX_SPREAD"],
+    )
 
     # Extract unique coins from the symbols
-    potential_coins = {symbol_mapping[symbol]['baseAsset'] for symbol in filtered_symbols}
+    potential_coins = set(ticker_table["base_asset"][mask])
 
     return potential_coins
 
 
+def fetch_pair_candlesticks(pair):
+    # Fetch the latest candlesticks for a single trading pair, as candle records (see CANDLE_RECORD_DTYPE)
+    interval = config["DATA_FETCHING"]["CANDLESTICK_INTERVAL"]
+    limit = config["DATA_FETCHING"]["CANDLESTICK_LIMIT"]
+
+    if candle_store is None:
+        return klines_to_records(get_client().klines(symbol=pair, interval=interval, limit=limit))
+
+    return sync_pair_candlesticks(pair, interval, limit)
+
+
+def sync_pair_candlesticks(pair, interval, limit):
+    last_open_time = candle_store.last_open_time(pair, interval)
+
+    # Start over when the stored candles are too old to be continued with a single request
+    if last_open_time is not None:
+        missing_candles = (time.time() * 1000 - last_open_time) // interval_to_milliseconds(interval)
+        if missing_candles >= MAX_KLINES_PER_REQUEST:
+            candle_store.reset(pair, interval)
+            last_open_time = None
+
+    if last_open_time is None:
+        # Seed the store with the full history
+        new_candles = get_client().klines(symbol=pair, interval=interval, limit=limit)
+    else:
+        # Only fetch candles from the last stored one onwards, it was most likely still open when stored
+        new_candles = get_client().klines(symbol=pair, interval=interval, startTime=last_open_time,
+                                          limit=MAX_KLINES_PER_REQUEST)
+
+    candle_store.append(pair, interval, new_candles)
+
+    # The limit may have been raised since the store was seeded
+    if last_open_time is not None:
+        backfill_pair_candlesticks(pair, interval, limit)
+
+    return candle_store.load(pair, interval, limit)
+
+
+def backfill_pair_candlesticks(pair, interval, limit):
+    # Fetch the candles before the first stored one until the store holds `limit` candles
+    stored_count = candle_store.count(pair, interval)
+    while stored_count < limit and (pair, interval) not in complete_histories:
+        request_limit = min(limit - stored_count, MAX_KLINES_PER_REQUEST)
+        older_candles = get_client().klines(symbol=pair, interval=interval,
+                                            endTime=candle_store.first_open_time(pair, interval) - 1,
+                                            limit=request_limit)
+        candle_store.prepend(pair, interval, older_candles)
+
+        # Fewer candles than requested, the pair was not listed any earlier
+        previous_count, stored_count = stored_count, candle_store.count(pair, interval)
+        if stored_count - previous_count < request_limit:
+            complete_histories.add((pair, interval))
+
+
+def fetch_candlesticks(trading_pairs):
+    if market_stream is None:
+        return fetch_candlesticks_from_rest(trading_pairs)
+
+    # Subscribe to the pairs that are not streamed yet, then read all candles from memory
+    market_stream.subscribe(trading_pairs)
+    return {pair: klines_to_records(market_stream.market_state.get_candlesticks(pair)) for pair in trading_pairs}
+
+
+def fetch_candlesticks_from_rest(trading_pairs):
+    # Remove duplicates while keeping the order (e.g. BTCETH is shared by BTC and ETH)
+    unique_pairs = list(dict.fromkeys(trading_pairs))
+    if not unique_pairs:
+        return {}
+
+    # Fetch all pairs at once, bounded by the configured number of concurrent requests
+    max_workers = min(config["DATA_FETCHING"]["MAX_CONCURRENT_REQUESTS"], len(unique_pairs))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        candlesticks = list(executor.map(fetch_pair_candlesticks, unique_pairs))
+
+    return dict(zip(unique_pairs, candlesticks))
+
+
+def fetch_klines_from_rest(trading_pairs):
+    # The market stream keeps its candles in the kline layout of the stream events
+    return {pair: records_to_klines(records) for pair, records in fetch_candlesticks_from_rest(trading_pairs).items()}
+
+
 def fetch_coins_data(all_symbols_data, potential_and_wallet_coins):
     coins_data = {}
 
     # Extract data from all_symbols_data
-    symbols = all_symbols_data["exchange_info"]["symbols"]
-    active_symbols = all_symbols_data["active_symbols"]
+    symbol_index = all_symbols_data["symbol_index"]
     prices = {price["symbol"]: float(price["price"]) for price in all_symbols_data["prices"]}
-    stats = {stat["symbol"]: stat for stat in all_symbols_data["stats"] if stat["symbol"] in active_symbols}
+    stats = {stat["symbol"]: stat for stat in all_symbols_data["stats"] if stat["symbol"] in symbol_index}
 
     for coin in potential_and_wallet_coins:
         if coin == "USDT":
             continue
 
-        pairings = [symbol for symbol in symbols if symbol['baseAsset'] == coin or symbol['quoteAsset'] == coin]
-        trading_pairs = [pair['symbol'] for pair in pairings if pair['symbol'] in active_symbols]
+        trading_pairs = symbol_index.get_pairs(coin)
 
-        # Collect metadata for each pair
+        # Collect metadata and parsed filters for each pair
         pair_metadata = {
-            pair['symbol']: {
-                "baseAsset": pair["baseAsset"],
-                "quoteAsset": pair["quoteAsset"],
-                "pricePrecision": pair["baseAssetPrecision"],
-                "qtyPrecision": pair["quotePrecision"],
-                "filters": pair["filters"],
-            }
-            for pair in pairings if pair["symbol"] in active_symbols
+            pair: {**symbol_index.metadata[pair], "filter_params": symbol_index.get_filter_params(pair)}
+            for pair in trading_pairs
         }
 
-        # Initialize data collector
-        candlestick_data = {}
-
-        # Collect data for each pairing
-        for pair in trading_pairs:
-            candlestick_data[pair] = client.klines(symbol=pair, interval='1h', limit=26)
-
         # Store everything in the coin data
         coins_data[coin] = {
             "pairings": trading_pairs,  # Active trading pairs
@@ -131,7 +242,14 @@ def fetch_coins_data(all_symbols_data, potential_and_wallet_coins):
             "market_stats": {  # 24-hour market stats
                 pair: stats.get(pair, {}) for pair in trading_pairs
             },
-            "candlesticks": candlestick_data,  # Candlesticks (OHLC data)
         }
 
+    # Collect candlesticks for every pairing of every coin in one concurrent batch
+    all_trading_pairs = [pair for coin_data in coins_data.values() for pair in coin_data["pairings"]]
+    candlesticks = fetch_candlesticks(all_trading_pairs)
+
+    # Attach candlesticks (OHLC data) to each coin
+    for coin_data in coins_data.values():
+        coin_data["candlesticks"] = {pair: candlesticks[pair] for pair in coin_data["pairings"]}
+
     return coins_data
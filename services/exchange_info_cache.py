@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import time
+
+from services.symbol_index import SymbolIndex
+
+
+def get_active_symbols(exchange_info):
+    return {symbol['symbol'] for symbol in exchange_info['symbols'] if symbol['status'] == 'TRADING'}
+
+
+def get_checksum(exchange_info):
+    # Only the symbols matter, the payload also carries a server time that changes on every call
+    return hashlib.sha256(json.dumps(exchange_info['symbols'], sort_keys=True).encode()).hexdigest()
+
+
+class ExchangeInfoCache:
+    def __init__(self, fetch_exchange_info, file_path, ttl_seconds, clock=time.time):
+        self.fetch_exchange_info = fetch_exchange_info
+        self.file_path = file_path
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+
+        # Current snapshot
+        self.exchange_info = None
+        self.active_symbols = None
+        self.symbol_index = None
+        self.checksum = None
+        self.fetched_at = None
+
+        # Metrics
+        self.metrics = {"hits": 0, "downloads": 0, "changes": 0}
+
+    def is_fresh(self):
+        return self.fetched_at is not None and self.clock() - self.fetched_at < self.ttl_seconds
+
+    def get(self):
+        # Use the persisted copy when nothing is loaded in memory yet
+        if self.exchange_info is None and self.ttl_seconds > 0:
+            self.load()
+
+        if self.is_fresh():
+            self.metrics["hits"] += 1
+        else:
+            self.refresh()
+
+        return self.exchange_info, self.active_symbols, self.symbol_index
+
+    def refresh(self):
+        exchange_info = self.fetch_exchange_info()
+        checksum = get_checksum(exchange_info)
+        self.metrics["downloads"] += 1
+
+        # Rebuild the index and its parsed filters only when the symbols have changed
+        if checksum != self.checksum:
+            if self.checksum is not None:
+                self.metrics["changes"] += 1
+                print("Exchange info has changed, rebuilding the symbol index")
+            self.set_snapshot(exchange_info, checksum)
+
+        self.exchange_info = exchange_info
+        self.fetched_at = self.clock()
+
+        if self.ttl_seconds > 0:
+            self.save()
+
+    def set_snapshot(self, exchange_info, checksum, filter_params=None):
+        self.exchange_info = exchange_info
+        self.checksum = checksum
+        self.active_symbols = get_active_symbols(exchange_info)
+        self.symbol_index = SymbolIndex(exchange_info['symbols'], self.active_symbols)
+
+        # Reuse the filters parsed before the snapshot was persisted, or parse them up front when caching
+        if filter_params is not None:
+            self.symbol_index.filter_params.update(filter_params)
+        elif self.ttl_seconds > 0:
+            self.symbol_index.parse_all_filters()
+
+    def load(self):
+        if not os.path.exists(self.file_path):
+            return
+
+        try:
+            with open(self.file_path, "r") as file:
+                cached = json.load(file)
+            self.set_snapshot(cached["exchange_info"], cached["checksum"], cached["filter_params"])
+            self.fetched_at = cached["fetched_at"]
+        except (ValueError, KeyError) as e:
+            print(f"Ignoring unreadable exchange info cache: {e}")
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with open(self.file_path, "w") as file:
+            json.dump({
+                "fetched_at": self.fetched_at,
+                "checksum": self.checksum,
+                "filter_params": self.symbol_index.filter_params,
+                "exchange_info": self.exchange_info,
+            }, file)
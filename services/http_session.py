@@ -0,0 +1,34 @@
+from requests.adapters import HTTPAdapter
+
+
+def configure_session(session, pool_size, max_hosts=4, block=True, compression=True):
+    # Keep one pool of keep-alive connections per host, large enough for every concurrent request
+    adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size, pool_block=block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # Large responses like the exchange info and 24h tickers shrink several times when compressed
+    session.headers["Accept-Encoding"] = "gzip, deflate" if compression else "identity"
+    session.headers["Connection"] = "keep-alive"
+
+    return adapter
+
+
+def get_connection_stats(session):
+    # Every pool counts the connections it opened and the requests sent over them
+    connections_opened = 0
+    requests_sent = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+                requests_sent += pool.num_requests
+
+    return {
+        "requests": requests_sent,
+        "connections_opened": connections_opened,
+        "connections_reused": max(requests_sent - connections_opened, 0),
+        "reuse_ratio": 1 - connections_opened / requests_sent if requests_sent else 0.0,
+    }
@@ -0,0 +1,55 @@
+import numpy as np
+
+# Numeric 24h ticker fields loaded into columns, missing fields become NaN
+TICKER_NUMERIC_FIELDS = {
+    "price_change_percent": "priceChangePercent",
+    "high_price": "highPrice",
+    "low_price": "lowPrice",
+    "quote_volume": "quoteVolume",
+    "bid_price": "bidPrice",
+    "ask_price": "askPrice",
+}
+
+
+def load_ticker_table(stats, symbol_index):
+    # Keep only the tickers of active symbols
+    stats = [stat for stat in stats if stat['symbol'] in symbol_index]
+    fields = list(TICKER_NUMERIC_FIELDS.values())
+
+    # Parse every numeric field of every ticker in a single conversion
+    values = np.array(
+        [[stat.get(field, "nan") for field in fields] for stat in stats],
+        dtype=np.float64,
+    ).reshape(len(stats), len(fields))
+
+    table = {name: values[:, i] for i, name in enumerate(TICKER_NUMERIC_FIELDS)}
+    table["symbol"] = np.array([stat['symbol'] for stat in stats], dtype=object)
+    table["base_asset"] = np.array([symbol_index.metadata[stat['symbol']]['baseAsset'] for stat in stats], dtype=object)
+    table["quote_asset"] = np.array([symbol_index.metadata[stat['symbol']]['quoteAsset'] for stat in stats],
+                                    dtype=object)
+
+    return table
+
+
+def screen_tickers(table, price_change_threshold, price_range_volatility_threshold, min_quote_volume=0,
+                   quote_assets=None, max_spread=0):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Price moved enough in the last 24 hours
+        mask = np.abs(table["price_change_percent"]) > price_change_threshold
+
+        # Daily range is wide enough relative to the low price
+        price_range = (table["high_price"] - table["low_price"]) / table["low_price"]
+        mask &= price_range > price_range_volatility_threshold
+
+        # Optional screens, disabled when their threshold is empty or zero
+        if min_quote_volume:
+            mask &= table["quote_volume"] >= min_quote_volume
+
+        if quote_assets:
+            mask &= np.isin(table["quote_asset"], list(quote_assets))
+
+        if max_spread:
+            mid_price = (table["ask_price"] + table["bid_price"]) / 2
+            mask &= (table["ask_price"] - table["bid_price"]) / mid_price <= max_spread
+
+    return mask
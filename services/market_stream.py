@@ -0,0 +1,236 @@
+import json
+import threading
+import time
+
+from utils.import_utils import lazy_import
+
+# The websocket client is only loaded once a stream connects
+websocket_stream = lazy_import("binance.websocket.spot.websocket_stream")
+
+# Binance accepts at most 1024 streams per connection, subscribe in smaller batches
+STREAMS_PER_SUBSCRIPTION = 100
+
+
+def kline_event_to_kline(kline):
+    # Convert a kline stream event into the layout returned by the REST klines endpoint
+    return [
+        kline["t"], kline["o"], kline["h"], kline["l"], kline["c"], kline["v"], kline["T"],
+        kline["q"], kline["n"], kline["V"], kline["Q"], "0",
+    ]
+
+
+class MarketState:
+    def __init__(self, candle_limit):
+        self.candle_limit = candle_limit
+        self.lock = threading.Lock()
+
+        # Latest market data per symbol
+        self.candlesticks = {}
+        self.mini_tickers = {}
+        self.book_tickers = {}
+        self.last_update = None
+
+    def set_candlesticks(self, symbol, klines):
+        # Merge candles by open time, newer data replaces the stored candle
+        with self.lock:
+            candles = {kline[0]: kline for kline in self.candlesticks.get(symbol, [])}
+            candles.update((kline[0], kline) for kline in klines)
+            self.candlesticks[symbol] = [candles[open_time] for open_time in sorted(candles)][-self.candle_limit:]
+
+    def get_candlesticks(self, symbol):
+        with self.lock:
+            return list(self.candlesticks.get(symbol, []))
+
+    def has_candlesticks(self, symbol):
+        with self.lock:
+            return symbol in self.candlesticks
+
+    def apply_message(self, message):
+        # Combined streams wrap each event as {"stream": ..., "data": ...}
+        if isinstance(message, dict) and "stream" in message:
+            message = message["data"]
+
+        # All market mini tickers arrive as a list of events
+        events = message if isinstance(message, list) else [message]
+
+        for event in events:
+            if not isinstance(event, dict) or "result" in event:
+                # Subscription responses carry no market data
+                continue
+
+            event_type = event.get("e")
+            if event_type == "kline":
+                self.set_candlesticks(event["s"], [kline_event_to_kline(event["k"])])
+            elif event_type == "24hrMiniTicker":
+                with self.lock:
+                    self.mini_tickers[event["s"]] = event
+            elif "b" in event and "a" in event and "u" in event:
+                # Book ticker events have no event type
+                with self.lock:
+                    self.book_tickers[event["s"]] = event
+            else:
+                continue
+
+            self.last_update = time.time()
+
+    def get_prices(self):
+        with self.lock:
+            return [{"symbol": symbol, "price": ticker["c"]} for symbol, ticker in self.mini_tickers.items()]
+
+    def get_ticker_stats(self):
+        # Build 24h stats in the layout of the REST ticker endpoint from the mini tickers
+        with self.lock:
+            stats = []
+            for symbol, ticker in self.mini_tickers.items():
+                open_price = float(ticker["o"])
+                close_price = float(ticker["c"])
+                stat = {
+                    "symbol": symbol,
+                    "priceChangePercent": str((close_price - open_price) / open_price * 100 if open_price else 0.0),
+                    "openPrice": ticker["o"],
+                    "lastPrice": ticker["c"],
+                    "highPrice": ticker["h"],
+                    "lowPrice": ticker["l"],
+                    "volume": ticker["v"],
+                    "quoteVolume": ticker["q"],
+                }
+
+                book_ticker = self.book_tickers.get(symbol)
+                if book_ticker:
+                    stat["bidPrice"] = book_ticker["b"]
+                    stat["askPrice"] = book_ticker["a"]
+
+                stats.append(stat)
+
+            return stats
+
+
+class MarketStream:
+    def __init__(self, market_state, fetch_candlesticks, stream_url, interval, reconnect_delay=1.0,
+                 max_reconnect_delay=30.0):
+        self.market_state = market_state
+        self.fetch_candlesticks = fetch_candlesticks
+        self.stream_url = stream_url
+        self.interval = interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.symbols = []
+        self.client = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.reconnecting = False
+
+        # Set by the callbacks of the websocket client, whose connection is not part of its public interface
+        self.connected = False
+
+        # Metrics
+        self.metrics = {"messages": 0, "connections": 0, "reconnects": 0, "backfills": 0}
+
+    def start(self, symbols):
+        self.stopped.clear()
+        self.connect()
+        self.subscribe(symbols)
+
+    def connect(self):
+        self.client = websocket_stream.SpotWebsocketStreamClient(
+            stream_url=self.stream_url,
+            on_message=self.on_message,
+            on_open=self.on_open,
+            on_close=self.on_disconnect,
+            on_error=self.on_disconnect,
+            is_combined=True,
+        )
+        self.metrics["connections"] += 1
+
+        # Mini tickers of all symbols keep the 24h stats and prices current
+        self.client.subscribe(["!miniTicker@arr"])
+
+    def get_streams(self, symbols):
+        streams = []
+        for symbol in symbols:
+            streams.append(f"{symbol.lower()}@kline_{self.interval}")
+            streams.append(f"{symbol.lower()}@bookTicker")
+        return streams
+
+    def subscribe(self, symbols):
+        with self.lock:
+            new_symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self.symbols]
+            self.symbols.extend(new_symbols)
+
+        if not new_symbols:
+            return
+
+        # Subscribe first, then backfill, so that no candle falls in between
+        self.send_subscriptions(new_symbols)
+        self.backfill(new_symbols)
+
+    def send_subscriptions(self, symbols):
+        streams = self.get_streams(symbols)
+        for i in range(0, len(streams), STREAMS_PER_SUBSCRIPTION):
+            self.client.subscribe(streams[i:i + STREAMS_PER_SUBSCRIPTION])
+
+    def backfill(self, symbols):
+        # Fill the candles the stream has not delivered (yet) with the REST client
+        for symbol, klines in self.fetch_candlesticks(symbols).items():
+            self.market_state.set_candlesticks(symbol, klines)
+        self.metrics["backfills"] += 1
+
+    def on_message(self, _, message):
+        self.metrics["messages"] += 1
+
+        # A malformed message must not be reported as a connection error
+        try:
+            self.market_state.apply_message(json.loads(message))
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Skipping malformed market stream message: {e}")
+
+    def on_open(self, *_):
+        self.connected = True
+
+    def on_disconnect(self, *_):
+        self.connected = False
+        if self.stopped.is_set():
+            return
+
+        with self.lock:
+            if self.reconnecting:
+                return
+            self.reconnecting = True
+
+        threading.Thread(target=self.reconnect, daemon=True).start()
+
+    def reconnect(self):
+        delay = self.reconnect_delay
+        while not self.stopped.is_set():
+            self.stopped.wait(delay)
+            if self.stopped.is_set():
+                break
+
+            try:
+                self.connect()
+                with self.lock:
+                    symbols = list(self.symbols)
+                self.send_subscriptions(symbols)
+                self.backfill(symbols)
+                self.metrics["reconnects"] += 1
+                break
+            except Exception as e:
+                print(f"Market stream reconnect failed, retrying in {delay} seconds: {e}")
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+        with self.lock:
+            self.reconnecting = False
+
+        # The new connection may have dropped again while it was being subscribed
+        if self.client is not None and not self.connected:
+            self.on_disconnect()
+
+    def stop(self):
+        self.stopped.set()
+        if self.client is not None:
+            # Closing a connection the exchange has just dropped fails before the client noticed the drop
+            try:
+                self.client.stop()
+            except OSError as e:
+                print(f"Market stream connection was already closed: {e}")
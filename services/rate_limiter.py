@@ -0,0 +1,183 @@
+import heapq
+import itertools
+import threading
+import time
+
+from binance.error import ClientError
+
+# Request weight of each client method, (weight without symbol, weight with a single symbol)
+ENDPOINT_WEIGHTS = {
+    "exchange_info": (20, 20),
+    "ticker_price": (4, 2),
+    "ticker_24hr": (80, 2),
+    "klines": (2, 2),
+    "account": (20, 20),
+    "new_order_test": (1, 1),
+    "new_order": (1, 1),
+}
+DEFAULT_WEIGHT = 1
+
+# Lower values are served first when calls are queued
+ENDPOINT_PRIORITIES = {
+    "new_order": 0,
+    "new_order_test": 0,
+    "account": 1,
+    "ticker_price": 1,
+    "exchange_info": 2,
+    "ticker_24hr": 2,
+    "klines": 3,
+}
+DEFAULT_PRIORITY = 2
+
+# Status codes Binance uses for rate limit violations (429) and IP bans (418)
+RATE_LIMIT_STATUS_CODES = (418, 429)
+
+
+def get_request_weight(method_name, kwargs):
+    weight_without_symbol, weight_with_symbol = ENDPOINT_WEIGHTS.get(method_name, (DEFAULT_WEIGHT, DEFAULT_WEIGHT))
+    return weight_with_symbol if kwargs.get("symbol") else weight_without_symbol
+
+
+def get_request_priority(method_name):
+    return ENDPOINT_PRIORITIES.get(method_name, DEFAULT_PRIORITY)
+
+
+class RateLimiter:
+    def __init__(self, weight_limit=6000, safety_margin=0.1, clock=time.monotonic):
+        # Keep a margin below the exchange limit for requests that are still in flight
+        self.capacity = weight_limit * (1 - safety_margin)
+        self.refill_rate = self.capacity / 60
+        self.tokens = self.capacity
+        self.clock = clock
+        self.last_refill = clock()
+        self.blocked_until = 0.0
+
+        # Queue of waiting requests ordered by (priority, arrival)
+        self.queue = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+
+        # Metrics
+        self.metrics = {
+            "requests": 0,
+            "weight_used": 0,
+            "stalls": 0,
+            "stall_seconds": 0.0,
+            "rate_limit_errors": 0,
+            "last_used_weight": None,
+        }
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+        return now
+
+    def _wait_time(self, weight, now):
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return max((weight - self.tokens) / self.refill_rate, 0.0)
+
+    def acquire(self, weight, priority=DEFAULT_PRIORITY):
+        # A single request can never need more than the whole bucket
+        weight = min(weight, self.capacity)
+
+        with self.condition:
+            ticket = (priority, next(self.counter))
+            heapq.heappush(self.queue, ticket)
+            started_at = self.clock()
+            stalled = False
+
+            while True:
+                now = self._refill()
+                is_next = self.queue[0] == ticket
+                if is_next and now >= self.blocked_until and self.tokens >= weight:
+                    break
+
+                # Only the first request in the queue needs to know how long to sleep
+                stalled = True
+                self.condition.wait(timeout=self._wait_time(weight, now) if is_next else None)
+
+            heapq.heappop(self.queue)
+            self.tokens -= weight
+
+            # Update metrics
+            self.metrics["requests"] += 1
+            self.metrics["weight_used"] += weight
+            if stalled:
+                self.metrics["stalls"] += 1
+                self.metrics["stall_seconds"] += self.clock() - started_at
+
+            # Wake up the next request in the queue
+            self.condition.notify_all()
+
+    def update_used_weight(self, used_weight):
+        # The exchange's own count wins when it is higher than what we think we used
+        with self.condition:
+            self._refill()
+            self.tokens = min(self.tokens, self.capacity - used_weight)
+            self.metrics["last_used_weight"] = used_weight
+
+    def block(self, seconds):
+        # Stop all requests after the exchange reported a rate limit violation
+        with self.condition:
+            self._refill()
+            self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+            self.tokens = 0.0
+            self.metrics["rate_limit_errors"] += 1
+            self.condition.notify_all()
+
+    def get_metrics(self):
+        with self.condition:
+            return dict(self.metrics)
+
+
+class RateLimitedClient:
+    def __init__(self, client, rate_limiter, max_retries=3, default_retry_after=60):
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        def rate_limited_call(*args, **kwargs):
+            return self._call(name, attribute, args, kwargs)
+
+        return rate_limited_call
+
+    def _call(self, method_name, method, args, kwargs):
+        weight = get_request_weight(method_name, kwargs)
+        priority = get_request_priority(method_name)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(weight, priority)
+            try:
+                response = method(*args, **kwargs)
+            except ClientError as e:
+                if e.status_code not in RATE_LIMIT_STATUS_CODES or attempt == self.max_retries:
+                    raise
+
+                # Take over the exchange's count of the used weight, then back off for as long as it asks
+                header = e.header or {}
+                used_weight = header.get("x-mbx-used-weight-1m")
+                if used_weight is not None:
+                    self.rate_limiter.update_used_weight(int(used_weight))
+                retry_after = header.get("Retry-After", self.default_retry_after)
+                self.rate_limiter.block(float(retry_after))
+                continue
+
+            return self._unwrap_response(response)
+
+    def _unwrap_response(self, response):
+        # The client returns the used weight next to the data when `show_limit_usage` is enabled
+        if isinstance(response, dict) and "limit_usage" in response and "data" in response:
+            used_weight = response["limit_usage"].get("x-mbx-used-weight-1m")
+            if used_weight is not None:
+                self.rate_limiter.update_used_weight(int(used_weight))
+            return response["data"]
+
+        return response
@@ -0,0 +1,124 @@
+import glob
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+
+# Endpoints that only validate a request, the exchange always answers them with an empty object
+SIMULATED_RESPONSES = {
+    "new_order_test": {},
+}
+
+
+def get_request_key(method_name, args, kwargs):
+    # Identify a request by its method and arguments, independent of the keyword order
+    return json.dumps([method_name, list(args), kwargs], sort_keys=True, separators=(",", ":"))
+
+
+def save_snapshot(responses, file_path):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with gzip.open(file_path, "wt", encoding="utf-8") as file:
+        json.dump({"responses": responses}, file, separators=(",", ":"))
+
+
+def load_snapshot(file_path):
+    with gzip.open(file_path, "rt", encoding="utf-8") as file:
+        return json.load(file)["responses"]
+
+
+def get_snapshot_path(directory):
+    # Mirror the layout of the other data files, one folder per day
+    now = datetime.now()
+    return os.path.join(directory, now.strftime("%Y-%m-%d"), f"snapshot_{now.strftime('%Y-%m-%d_%H-%M-%S')}.json.gz")
+
+
+def list_snapshots(directory):
+    # Oldest first, so that replayed cycles run in the order they were recorded
+    return sorted(glob.glob(os.path.join(directory, "*", "snapshot_*.json.gz")))
+
+
+class RecordingClient:
+    def __init__(self, client):
+        self.client = client
+        self.lock = threading.Lock()
+
+        # Responses of the current cycle, in the order they were received per request
+        self.responses = {}
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        def recorded_call(*args, **kwargs):
+            response = attribute(*args, **kwargs)
+            with self.lock:
+                self.responses.setdefault(get_request_key(name, args, kwargs), []).append(response)
+            return response
+
+        return recorded_call
+
+    def save(self, directory):
+        # Write the responses recorded so far into one snapshot and start recording a new one
+        with self.lock:
+            responses, self.responses = self.responses, {}
+
+        file_path = get_snapshot_path(directory)
+        save_snapshot(responses, file_path)
+
+        return file_path
+
+
+class ReplayClient:
+    def __init__(self, responses=None):
+        self.lock = threading.Lock()
+        self.responses = {}
+        self.positions = {}
+
+        if responses is not None:
+            self.set_responses(responses)
+
+    def set_responses(self, responses):
+        with self.lock:
+            self.responses = responses
+            self.positions = {}
+
+    def load(self, file_path):
+        self.set_responses(load_snapshot(file_path))
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def replayed_call(*args, **kwargs):
+            return self._replay(name, args, kwargs)
+
+        return replayed_call
+
+    def _replay(self, method_name, args, kwargs):
+        key = get_request_key(method_name, args, kwargs)
+
+        with self.lock:
+            if key in self.responses:
+                # Serve repeated requests in the recorded order, the last response is repeated once they run out
+                recorded = self.responses[key]
+                position = self.positions.get(key, 0)
+                self.positions[key] = position + 1
+                return recorded[min(position, len(recorded) - 1)]
+
+        # A single symbol can be answered from a recorded request for all symbols
+        if "symbol" in kwargs:
+            other_kwargs = {name: value for name, value in kwargs.items() if name != "symbol"}
+            all_symbols_key = get_request_key(method_name, args, other_kwargs)
+            with self.lock:
+                recorded = self.responses.get(all_symbols_key)
+            if isinstance(recorded, list) and isinstance(recorded[-1], list):
+                for item in recorded[-1]:
+                    if item.get("symbol") == kwargs["symbol"]:
+                        return item
+
+        if method_name in SIMULATED_RESPONSES:
+            return SIMULATED_RESPONSES[method_name]
+
+        raise KeyError(f"No recorded response for {method_name} with arguments {args} {kwargs}")
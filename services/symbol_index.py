@@ -0,0 +1,58 @@
+from collections import defaultdict
+
+from utils.order_execution import extract_filter_parameters
+
+
+class SymbolIndex:
+    def __init__(self, symbols, active_symbols):
+        # Lookups by symbol and by asset, built once per exchange info snapshot
+        self.metadata = {}
+        self.base_pairs = defaultdict(list)
+        self.quote_pairs = defaultdict(list)
+        self.asset_pairs = defaultdict(list)
+        self.filter_params = {}
+
+        for symbol_data in symbols:
+            symbol = symbol_data["symbol"]
+            if symbol not in active_symbols:
+                continue
+
+            base_asset = symbol_data["baseAsset"]
+            quote_asset = symbol_data["quoteAsset"]
+            self.metadata[symbol] = {
+                "baseAsset": base_asset,
+                "quoteAsset": quote_asset,
+                "pricePrecision": symbol_data["baseAssetPrecision"],
+                "qtyPrecision": symbol_data["quotePrecision"],
+                "filters": symbol_data["filters"],
+            }
+
+            # Keep pairs in exchange order so that each coin's pairings stay stable
+            self.base_pairs[base_asset].append(symbol)
+            self.quote_pairs[quote_asset].append(symbol)
+            self.asset_pairs[base_asset].append(symbol)
+            self.asset_pairs[quote_asset].append(symbol)
+
+    def __contains__(self, symbol):
+        return symbol in self.metadata
+
+    def get_pairs(self, asset):
+        # Active pairs where the asset is either the base or the quote asset, as a copy the caller may change
+        return list(self.asset_pairs.get(asset, []))
+
+    def get_base_asset(self, symbol):
+        return self.metadata[symbol]["baseAsset"]
+
+    def get_filter_params(self, symbol):
+        # Parse the filters of a symbol on first use only, symbols without the required filters map to None
+        if symbol not in self.filter_params:
+            try:
+                self.filter_params[symbol] = extract_filter_parameters(self.metadata[symbol]["filters"])
+            except (ValueError, KeyError):
+                self.filter_params[symbol] = None
+
+        return self.filter_params[symbol]
+
+    def parse_all_filters(self):
+        for symbol in self.metadata:
+            self.get_filter_params(symbol)
@@ -1,4 +1,4 @@
-from services.binance_auth import client
+from services.binance_auth import get_client
 from utils.file_utils import save_data_to_file
 
 
@@ -12,7 +12,7 @@ def extract_balance(wallet_info):
     ]
 
     # Fetch coin prices
-    prices = {price['symbol']: float(price['price']) for price in client.ticker_price()}
+    prices = {price['symbol']: float(price['price']) for price in get_client().ticker_price()}
 
     # Add USDT values and handle USDT as a special case
     for balance in wallet_info['balances']:
@@ -49,7 +49,7 @@ def extract_balance(wallet_info):
 
 def fetch_wallet_balance():
     # Fetch wallet info
-    wallet_info = client.account()
+    wallet_info = get_client().account()
 
     # Extract the wallet's balance
     wallet_balance = extract_balance(wallet_info)
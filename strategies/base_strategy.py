@@ -1,22 +1,30 @@
-from strategies.scoring_systems import calculate_score
+from strategies.scoring_engine import ScoringEngine
 from utils.file_utils import load_config_values, save_data_to_file
 
 config = load_config_values("BUY_CONDITION", "SELL_CONDITION")
 
+# Scoring systems compiled by the first ranking
+scoring_engine = None
+
 
 def is_coin_in_wallet(coin, wallet):
     return any(entry["asset"] == coin and entry["free"] > 0 for entry in wallet)
 
 
-def rank_coins(indicators):
-    rankings = []
+def get_scoring_engine():
+    global scoring_engine
+
+    if scoring_engine is None:
+        scoring_engine = ScoringEngine()
 
-    for coin, coin_indicators in indicators.items():
-        # Calculate composite score
-        score = calculate_score(coin_indicators)
+    return scoring_engine
+
+
+def rank_coins(indicators):
+    # Composite score of every coin at once, the average of the scoring systems
+    scores = get_scoring_engine().calculate_scores(indicators)
 
-        # Append coin and score to rankings
-        rankings.append({"coin": coin, "score": score})
+    rankings = [{"coin": coin, "score": score} for coin, score in scores.items()]
 
     # Rank coins by score in descending order
     rankings.sort(key=lambda x: x["score"], reverse=True)
@@ -0,0 +1,83 @@
+from strategies.scoring_systems import FEATURES, INPUTS, MISSING, SCORING_SYSTEMS, get_features, get_inputs, \
+    get_term_parts
+from utils.import_utils import lazy_import
+
+# Only loaded once coins are scored, importing a strategy stays cheap
+np = lazy_import("numpy")
+
+# Scores are clamped to this range like `max(-100, min(100, score))`
+SCORE_LIMIT = 100
+
+
+class ScoringEngine:
+    # Scoring systems compiled into a feature index and a weight per (system, term, part of a term), so every coin is
+    # scored by every system with a few array operations instead of one Python call per coin and system
+    def __init__(self, scoring_systems=None):
+        self.scoring_systems = SCORING_SYSTEMS if scoring_systems is None else scoring_systems
+        self.features = get_features(self.scoring_systems)
+        self.inputs = get_inputs(self.features)
+
+        terms = [get_term_parts(system) for system in self.scoring_systems]
+        term_count = max((len(system_terms) for system_terms in terms), default=0)
+        part_count = max((len(parts) for system_terms in terms for parts in system_terms), default=0)
+
+        # Unused slots multiply the zero column after the features by -0.0, adding -0.0 leaves every sum unchanged,
+        # including its sign
+        shape = (len(self.scoring_systems), term_count, part_count)
+        self.feature_index = np.full(shape, len(self.features))
+        self.weights = np.full(shape, -0.0)
+        for system, system_terms in enumerate(terms):
+            for term, parts in enumerate(system_terms):
+                for part, (feature, weight) in enumerate(parts):
+                    self.feature_index[system, term, part] = self.features.index(feature)
+                    self.weights[system, term, part] = weight
+
+        self.divisors = np.array([system["divisor"] for system in self.scoring_systems], dtype=np.float64)
+
+    def extract_features(self, indicators):
+        # Each field is read once per coin, column by column, the way the scoring systems always read it
+        categories = {}
+        fields = {}
+        columns = {}
+        for name in self.inputs:
+            category, field, reader, default = INPUTS[name]
+            if category not in categories:
+                categories[category] = [coin_indicators[category] for coin_indicators in indicators.values()]
+            if (category, field) not in fields:
+                if default is MISSING:
+                    fields[category, field] = [values[field] for values in categories[category]]
+                else:
+                    fields[category, field] = [values.get(field, default) for values in categories[category]]
+            columns[name] = np.array(reader(fields[category, field]), dtype=np.float64)
+
+        # Feature columns of (coins, features), followed by the zero column the unused slots point to
+        feature_columns = [
+            FEATURES[feature][1](*[columns[name] for name in FEATURES[feature][0]]) for feature in self.features
+        ]
+        return np.column_stack(feature_columns + [np.zeros(len(indicators))])
+
+    def score_features(self, feature_matrix):
+        # The result holds the clamped score of every (coin, system)
+        products = feature_matrix[:, self.feature_index] * self.weights
+
+        # Cumulative sums add strictly from left to right, so the scores do not depend on how NumPy would group a sum
+        term_values = np.cumsum(products, axis=3)[..., -1]
+        raw_scores = np.cumsum(term_values, axis=2)[..., -1] / self.divisors
+
+        # `min(100, score)` keeps 100 unless the score is smaller and `max(-100, ...)` likewise, so NaN becomes 100
+        limited = np.where(raw_scores < SCORE_LIMIT, raw_scores, float(SCORE_LIMIT))
+        return np.where(limited > -SCORE_LIMIT, limited, float(-SCORE_LIMIT))
+
+    def score_matrix(self, indicators):
+        return self.score_features(self.extract_features(indicators))
+
+    def calculate_scores(self, indicators):
+        # Average score of the systems per coin
+        if not indicators:
+            return {}
+
+        scores = self.score_matrix(indicators)
+
+        # Like `sum`, start at 0 and add the systems in their order
+        totals = np.cumsum(np.column_stack([np.zeros(len(scores)), scores]), axis=1)[:, -1]
+        return dict(zip(indicators, (totals / len(self.scoring_systems)).tolist()))
@@ -1,108 +1,141 @@
-def calculate_score(indicators):
-    scoring_systems = [
-        scoring_system_1,
-        scoring_system_2,
-        scoring_system_3,
-        scoring_system_4,
-        scoring_system_5,
-        scoring_system_6,
-        scoring_system_7,
-        scoring_system_8,
-        scoring_system_9,
-        scoring_system_10,
-    ]
-
-    # Calculate the individual scores for each system
-    scores = [scoring_system(indicators) for scoring_system in scoring_systems]
-
-    # Calculate the average score
-    final_score = sum(scores) / len(scores)
-
-    return final_score
-
-
-def scoring_system_1(indicators):
-    rsi_score = indicators['momentum']['RSI'] * 1.2
-    sma_score_weighted = indicators['trend']['SMA'] * -1.8
-    macd_histogram = indicators['trend'].get('MACD_histogram', 0)
-    macd_score = macd_histogram * 2.5
-    raw_score = rsi_score + sma_score_weighted + macd_score
-    return max(-100, min(100, raw_score / 1.5))
-
-
-def scoring_system_2(indicators):
-    rsi_score = indicators['momentum']['RSI'] * 1.7
-    sma_score_weighted = indicators['trend']['SMA'] * -2.5
-    raw_score = rsi_score + sma_score_weighted
-    return max(-100, min(100, raw_score / 2))
-
-
-def scoring_system_3(indicators):
-    sma_score_weighted = indicators['trend']['SMA'] * -3.5
-    rsi_score = indicators['momentum']['RSI'] * 0.8
-    raw_score = sma_score_weighted + rsi_score
-    return max(-100, min(100, raw_score / 2))
-
-
-def scoring_system_4(indicators):
-    atr_score = indicators['volatility']['ATR'] * -0.8
-    sma_score_weighted = indicators['trend']['SMA'] * -1.5
-    above_sma_score = 8 if indicators['trend']['above_SMA'] else -8
-    bollinger_width_score = indicators['volatility']['Bollinger_width'] * 0.7
-    raw_score = atr_score + sma_score_weighted + above_sma_score + bollinger_width_score
-    return max(-100, min(100, raw_score / 2))
-
-
-def scoring_system_5(indicators):
-    ema_score = indicators['trend']['EMA'] * (0.8 if indicators['trend']['above_SMA'] else -0.8)
-    stochastic_score = 8 if indicators['momentum']['Stochastic_signal'] == "bullish" else -8
-    momentum_score = indicators['momentum']['RSI'] * 1.5 + stochastic_score
-    volatility_score = indicators['volatility']['ATR'] * -0.7
-    raw_score = ema_score + momentum_score + volatility_score
-    return max(-100, min(100, raw_score / 1.8))
-
-
-def scoring_system_6(indicators):
-    sma_deviation_score = -abs(indicators['trend']['SMA']) * 1.8
-    bollinger_deviation_score = -abs(indicators['volatility']['Bollinger_width']) * 2.7
-    rsi_score = indicators['momentum']['RSI'] * 1.3
-    raw_score = sma_deviation_score + bollinger_deviation_score + rsi_score
-    return max(-100, min(100, raw_score / 1.8))
-
-
-def scoring_system_7(indicators):
-    rsi_score = indicators['momentum']['RSI'] * 1.8
-    volatility_score = indicators['volatility']['ATR'] * -0.8
-    trend_score = indicators['trend']['SMA'] * -0.8
-    raw_score = rsi_score + volatility_score + trend_score
-    return max(-100, min(100, raw_score / 2))
-
-
-def scoring_system_8(indicators):
-    macd_trend = indicators['trend'].get('MACD_trend', "neutral")
-    macd_histogram = indicators['trend'].get('MACD_histogram', 0)
-    macd_trend_score = 10 if macd_trend == "bullish" else (-10 if macd_trend == "bearish" else 0)
-    macd_histogram_score = macd_histogram * 3
-    rsi_score = (indicators['momentum']['RSI'] - 30) * 1.5
-    volatility_score = indicators['volatility']['ATR'] * -0.5
-    raw_score = macd_trend_score + macd_histogram_score + rsi_score + volatility_score
-    return max(-100, min(100, raw_score / 2))
-
-
-def scoring_system_9(indicators):
-    stochastic_score = (indicators['momentum']['Stochastic_%K'] - indicators['momentum']['Stochastic_%D']) * 2
-    ema_score = indicators['trend']['EMA'] * (1.2 if indicators['trend']['above_SMA'] else -1.2)
-    stochastic_signal_score = 10 if indicators['momentum']['Stochastic_signal'] == "bullish" else -10
-    rsi_score = max(0, (indicators['momentum']['RSI'] - 30)) * 1.1
-    raw_score = stochastic_score + ema_score + stochastic_signal_score + rsi_score
-    return max(-100, min(100, raw_score / 2.5))
-
-
-def scoring_system_10(indicators):
-    bollinger_position_score = 10 if indicators['volatility']['close_above_upper'] else (
-        -10 if indicators['volatility']['close_below_lower'] else 0)
-    rsi_score = indicators['momentum']['RSI'] * 1.6
-    volatility_penalty = indicators['volatility']['ATR'] * -0.9
-    stochastic_score = 5 if indicators['momentum']['Stochastic_signal'] == "bullish" else -5
-    raw_score = bollinger_position_score + rsi_score + volatility_penalty + stochastic_score
-    return max(-100, min(100, raw_score / 2))
+from utils.import_utils import lazy_import
+
+# Only loaded once coins are scored, importing a strategy stays cheap
+np = lazy_import("numpy")
+
+
+# Readers turning the values of a field of every coin into numbers
+def read_numbers(values):
+    return [float(value) for value in values]
+
+
+def read_flags(values):
+    return [1.0 if value else 0.0 for value in values]
+
+
+def read_bullish(values):
+    return [1.0 if value == "bullish" else 0.0 for value in values]
+
+
+def read_bearish(values):
+    return [1.0 if value == "bearish" else 0.0 for value in values]
+
+
+# Values read from the indicators of each coin as (category, field, reader, default for a missing field). Only the
+# MACD fields may be missing, every other missing field raises a KeyError.
+MISSING = object()
+INPUTS = {
+    'SMA': ('trend', 'SMA', read_numbers, MISSING),
+    'above_SMA': ('trend', 'above_SMA', read_flags, MISSING),
+    'EMA': ('trend', 'EMA', read_numbers, MISSING),
+    'MACD_histogram': ('trend', 'MACD_histogram', read_numbers, 0),
+    'MACD_bullish': ('trend', 'MACD_trend', read_bullish, "neutral"),
+    'MACD_bearish': ('trend', 'MACD_trend', read_bearish, "neutral"),
+    'RSI': ('momentum', 'RSI', read_numbers, MISSING),
+    'Stochastic_%K': ('momentum', 'Stochastic_%K', read_numbers, MISSING),
+    'Stochastic_%D': ('momentum', 'Stochastic_%D', read_numbers, MISSING),
+    'Stochastic_bullish': ('momentum', 'Stochastic_signal', read_bullish, MISSING),
+    'ATR': ('volatility', 'ATR', read_numbers, MISSING),
+    'Bollinger_width': ('volatility', 'Bollinger_width', read_numbers, MISSING),
+    'close_above_upper': ('volatility', 'close_above_upper', read_flags, MISSING),
+    'close_below_lower': ('volatility', 'close_below_lower', read_flags, MISSING),
+}
+
+# Features the scoring terms multiply with their weight, as (inputs, calculation over the input columns of all coins).
+# Flags and signals become a sign of +1/-1 (or 0 for a third state), so `8 if above_SMA else -8` is the sign times 8.
+FEATURES = {
+    'SMA': (['SMA'], lambda sma: sma),
+    'abs_SMA': (['SMA'], lambda sma: np.abs(sma)),
+    'EMA_by_above_SMA': (['EMA', 'above_SMA'], lambda ema, above_sma: np.where(above_sma > 0, ema, -ema)),
+    'above_SMA_sign': (['above_SMA'], lambda above_sma: np.where(above_sma > 0, 1.0, -1.0)),
+    'MACD_histogram': (['MACD_histogram'], lambda macd_histogram: macd_histogram),
+    'MACD_trend_sign': (['MACD_bullish', 'MACD_bearish'], lambda bullish, bearish: bullish - bearish),
+    'RSI': (['RSI'], lambda rsi: rsi),
+    'RSI_minus_30': (['RSI'], lambda rsi: rsi - 30),
+    # `max(0, value)` keeps 0 unless the value is larger, so NaN becomes 0 as well
+    'RSI_above_30': (['RSI'], lambda rsi: np.where(rsi - 30 > 0, rsi - 30, 0.0)),
+    'Stochastic_K_minus_D': (['Stochastic_%K', 'Stochastic_%D'], lambda k, d: k - d),
+    'Stochastic_bullish_sign': (['Stochastic_bullish'], lambda bullish: np.where(bullish > 0, 1.0, -1.0)),
+    'ATR': (['ATR'], lambda atr: atr),
+    'Bollinger_width': (['Bollinger_width'], lambda width: width),
+    'abs_Bollinger_width': (['Bollinger_width'], lambda width: np.abs(width)),
+    'Bollinger_position': (['close_above_upper', 'close_below_lower'],
+                           lambda above, below: np.where(above > 0, 1.0, np.where(below > 0, -1.0, 0.0))),
+}
+
+# Each system adds its weighted features from left to right, divides the sum by the divisor and clamps it to
+# [-100, 100] like `max(-100, min(100, score))`. A term that is a list is summed on its own before it is added.
+# The final score of a coin is the average of the systems. The formula above each system reads `feature * weight`.
+SCORING_SYSTEMS = [
+    # (RSI * 1.2 + SMA * -1.8 + MACD_histogram * 2.5) / 1.5
+    {"name": "scoring_system_1", "divisor": 1.5,
+     "terms": [('RSI', 1.2), ('SMA', -1.8), ('MACD_histogram', 2.5)]},
+    # (RSI * 1.7 + SMA * -2.5) / 2
+    {"name": "scoring_system_2", "divisor": 2,
+     "terms": [('RSI', 1.7), ('SMA', -2.5)]},
+    # (SMA * -3.5 + RSI * 0.8) / 2
+    {"name": "scoring_system_3", "divisor": 2,
+     "terms": [('SMA', -3.5), ('RSI', 0.8)]},
+    # (ATR * -0.8 + SMA * -1.5 + (8 if above_SMA else -8) + Bollinger_width * 0.7) / 2
+    {"name": "scoring_system_4", "divisor": 2,
+     "terms": [('ATR', -0.8), ('SMA', -1.5), ('above_SMA_sign', 8), ('Bollinger_width', 0.7)]},
+    # (EMA * (0.8 if above_SMA else -0.8) + (RSI * 1.5 + (8 if Stochastic_signal is bullish else -8))
+    #  + ATR * -0.7) / 1.8
+    {"name": "scoring_system_5", "divisor": 1.8,
+     "terms": [('EMA_by_above_SMA', 0.8), [('RSI', 1.5), ('Stochastic_bullish_sign', 8)], ('ATR', -0.7)]},
+    # (-abs(SMA) * 1.8 - abs(Bollinger_width) * 2.7 + RSI * 1.3) / 1.8
+    {"name": "scoring_system_6", "divisor": 1.8,
+     "terms": [('abs_SMA', -1.8), ('abs_Bollinger_width', -2.7), ('RSI', 1.3)]},
+    # (RSI * 1.8 + ATR * -0.8 + SMA * -0.8) / 2
+    {"name": "scoring_system_7", "divisor": 2,
+     "terms": [('RSI', 1.8), ('ATR', -0.8), ('SMA', -0.8)]},
+    # ((10 if MACD_trend is bullish, -10 if bearish, else 0) + MACD_histogram * 3 + (RSI - 30) * 1.5 + ATR * -0.5) / 2
+    {"name": "scoring_system_8", "divisor": 2,
+     "terms": [('MACD_trend_sign', 10), ('MACD_histogram', 3), ('RSI_minus_30', 1.5), ('ATR', -0.5)]},
+    # ((%K - %D) * 2 + EMA * (1.2 if above_SMA else -1.2) + (10 if Stochastic_signal is bullish else -10)
+    #  + max(0, RSI - 30) * 1.1) / 2.5
+    {"name": "scoring_system_9", "divisor": 2.5,
+     "terms": [('Stochastic_K_minus_D', 2), ('EMA_by_above_SMA', 1.2), ('Stochastic_bullish_sign', 10),
+               ('RSI_above_30', 1.1)]},
+    # ((10 if close_above_upper, -10 if close_below_lower, else 0) + RSI * 1.6 + ATR * -0.9
+    #  + (5 if Stochastic_signal is bullish else -5)) / 2
+    {"name": "scoring_system_10", "divisor": 2,
+     "terms": [('Bollinger_position', 10), ('RSI', 1.6), ('ATR', -0.9), ('Stochastic_bullish_sign', 5)]},
+]
+
+
+def get_term_parts(system):
+    # Terms of a system as lists of (feature, weight) parts
+    return [term if isinstance(term, list) else [term] for term in system["terms"]]
+
+
+def get_features(scoring_systems):
+    # Features read by the systems, in the order they are first used
+    features = []
+    for system in scoring_systems:
+        for parts in get_term_parts(system):
+            for feature, _ in parts:
+                if feature not in FEATURES:
+                    raise ValueError(f"Unknown scoring feature '{feature}' in {system['name']}")
+                if feature not in features:
+                    features.append(feature)
+    return features
+
+
+def get_inputs(features):
+    return list(dict.fromkeys(name for feature in features for name in FEATURES[feature][0]))
+
+
+def get_required_fields(scoring_systems):
+    # Indicator fields per category the systems read
+    required_fields = {}
+    for name in get_inputs(get_features(scoring_systems)):
+        category, field = INPUTS[name][:2]
+        fields = required_fields.setdefault(category, [])
+        if field not in fields:
+            fields.append(field)
+    return required_fields
+
+
+# Indicator fields read by the scoring systems, only the indicators producing them are calculated
+REQUIRED_INDICATOR_FIELDS = get_required_fields(SCORING_SYSTEMS)
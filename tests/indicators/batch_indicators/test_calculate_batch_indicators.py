@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from tests.indicators.mock_data import MOCK_CONFIG_VALUES, make_prices
+
+# Mock `load_config_values`
+with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUES):
+    from indicators import batch_indicators, indicator_base, momentum_indicators, trend_indicators, \
+        volatility_indicators
+    from indicators.batch_indicators import calculate_batch_indicators, select_coin_indicators, stack_prices
+
+
+def calculate_per_coin(high_prices, low_prices, close_prices):
+    # Indicators of a single coin with the NumPy backend
+    with patch.dict(trend_indicators.config, {"INDICATOR_BACKEND": "numpy"}), \
+            patch.dict(momentum_indicators.config, {"INDICATOR_BACKEND": "numpy"}), \
+            patch.dict(volatility_indicators.config, {"INDICATOR_BACKEND": "numpy"}):
+        return {
+            'trend': trend_indicators.simplify_trend_indicators(
+                trend_indicators.calculate_trend_indicators(high_prices, low_prices, close_prices), close_prices),
+            'momentum': momentum_indicators.simplify_momentum_indicators(
+                momentum_indicators.calculate_momentum_indicators(high_prices, low_prices, close_prices)),
+            'volatility': volatility_indicators.simplify_volatility_indicators(
+                volatility_indicators.calculate_volatility_indicators(high_prices, low_prices, close_prices),
+                close_prices),
+        }
+
+
+def assert_same_indicators(result, expected):
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_same_indicators(result[key], value)
+        elif isinstance(value, float) and np.isnan(value):
+            assert np.isnan(result[key])
+        else:
+            assert result[key] == value, key
+
+
+def test_stack_prices_aligns_latest_candles():
+    matrix, lengths = stack_prices([[1.0, 2.0, 3.0], [4.0], []])
+
+    np.testing.assert_array_equal(matrix, [[1.0, 2.0, 3.0], [np.nan, np.nan, 4.0], [np.nan, np.nan, np.nan]])
+    np.testing.assert_array_equal(lengths, [3, 1, 0])
+
+
+def test_select_coin_indicators_applies_masks():
+    batch = {
+        'SMA': (np.array([[1.0, 2.0], [3.0, 4.0]]), np.array([True, False])),
+        'MACD': ({'macd_line': np.array([[5.0], [6.0]])}, np.array([True, True])),
+    }
+
+    assert select_coin_indicators(batch, 1).keys() == {'MACD'}
+    np.testing.assert_array_equal(select_coin_indicators(batch, 0)['SMA'], [1.0, 2.0])
+    np.testing.assert_array_equal(select_coin_indicators(batch, 1)['MACD']['macd_line'], [6.0])
+
+
+def test_batch_matches_per_coin_indicators_with_ragged_histories():
+    prices = {f"COIN{count}": make_prices(count, seed) for seed, count in enumerate([10, 15, 20, 26, 60])}
+
+    result = calculate_batch_indicators(prices)
+
+    assert result.keys() == prices.keys()
+    for coin, (high_prices, low_prices, close_prices) in prices.items():
+        assert_same_indicators(result[coin], calculate_per_coin(high_prices, low_prices, close_prices))
+
+
+def test_batch_with_whole_series_gives_the_same_indicators():
+    prices = {f"COIN{count}": make_prices(count, seed) for seed, count in enumerate([20, 60])}
+
+    with patch.dict(batch_indicators.config, {"INDICATOR_TAIL_LENGTH": 0}):
+        result = calculate_batch_indicators(prices)
+
+    assert result == calculate_batch_indicators(prices)
+
+
+def test_batch_leaves_out_indicators_of_short_histories():
+    result = calculate_batch_indicators({"SHORT": make_prices(10, 0), "LONG": make_prices(30, 1)})
+
+    assert "RSI" not in result["SHORT"]["momentum"]
+    assert "MACD_trend" not in result["SHORT"]["trend"]
+    assert "RSI" in result["LONG"]["momentum"]
+    assert "MACD_trend" in result["LONG"]["trend"]
+
+
+def test_batch_without_coins():
+    assert calculate_batch_indicators({}) == {}
+
+
+def test_apply_indicators_in_batch_mode():
+    high_prices, low_prices, close_prices = make_prices(30, 3)
+    coins_data = {
+        "BTC": {"candlesticks": {"BTCUSDT": [[0, 0, high, low, close] for high, low, close in
+                                             zip(high_prices, low_prices, close_prices)]}},
+        "ETH": {"candlesticks": {"ETHUSDT": [[0, 0, 2.0, 1.0, 1.5]]}},
+    }
+
+    with patch.dict(indicator_base.config, {"INDICATOR_BACKEND": "batch"}):
+        result = indicator_base.apply_indicators(coins_data)
+
+    # Coins without enough candles are skipped like in the per-coin loop
+    assert result.keys() == {"BTC"}
+    assert_same_indicators(result["BTC"], calculate_per_coin(high_prices, low_prices, close_prices))
@@ -20,12 +20,12 @@ coins_data = {
     }
 }
 
-# Mock cleaned indicators after apply_indicators and clean_indicators
-cleaned_indicators_mock = {
+# Mock simplified indicators returned by apply_indicators
+indicators_mock = {
     "BTC": {
-        "trend": "up",
-        "momentum": 50,
-        "volatility": 5
+        "trend": {"SMA": 45500.0},
+        "momentum": {"RSI": 50.0},
+        "volatility": {"ATR": 5.0}
     }
 }
 
@@ -33,46 +33,47 @@ cleaned_indicators_mock = {
 def test_calculate_indicators_calls_apply_indicators():
     with patch("indicators.indicator_base.apply_indicators") as mock_apply_indicators:
         # Mock the return value of apply_indicators
-        mock_apply_indicators.return_value = cleaned_indicators_mock
+        mock_apply_indicators.return_value = indicators_mock
 
         # Call the function
         result = calculate_indicators(coins_data)
 
-        # Assert that apply_indicators was called with the correct coins_data
-        mock_apply_indicators.assert_called_once_with(coins_data)
+        # Assert that apply_indicators was called with the correct coins_data, without a selection of indicators
+        mock_apply_indicators.assert_called_once_with(coins_data, None)
 
 
-def test_calculate_indicators_calls_clean_indicators():
-    with patch("indicators.indicator_base.apply_indicators", return_value=cleaned_indicators_mock), \
-            patch("indicators.indicator_base.clean_indicators",
-                  return_value=cleaned_indicators_mock) as mock_clean_indicators:
+def test_calculate_indicators_calls_build_indicator_records():
+    with patch("indicators.indicator_base.apply_indicators", return_value=indicators_mock), \
+            patch("indicators.indicator_base.build_indicator_records",
+                  return_value={}) as mock_build_indicator_records:
         # Call the function
         result = calculate_indicators(coins_data)
 
-        # Assert that clean_indicators was called with the output from apply_indicators
-        mock_clean_indicators.assert_called_once_with(cleaned_indicators_mock)
+        # Assert that build_indicator_records was called with the output from apply_indicators
+        mock_build_indicator_records.assert_called_once_with(indicators_mock)
 
 
 # TODO: Fix this one test
 def test_calculate_indicators_calls_save_data_to_file():
-    with patch("indicators.indicator_base.apply_indicators", return_value=cleaned_indicators_mock), \
-            patch("indicators.indicator_base.clean_indicators", return_value=cleaned_indicators_mock), \
+    with patch("indicators.indicator_base.apply_indicators", return_value=indicators_mock), \
             patch("utils.file_utils.save_data_to_file") as mock_save_data_to_file:
         # Call the function
         result = calculate_indicators(coins_data)
 
         # Assert that save_data_to_file was called with the correct arguments
-        mock_save_data_to_file.assert_called_once_with(cleaned_indicators_mock, "indicators", "indicators")
+        mock_save_data_to_file.assert_called_once_with(indicators_mock, "indicators", "indicators")
 
 
-def test_calculate_indicators_returns_cleaned_indicators():
-    with patch("indicators.indicator_base.apply_indicators", return_value=cleaned_indicators_mock), \
-            patch("indicators.indicator_base.clean_indicators", return_value=cleaned_indicators_mock):
+def test_calculate_indicators_returns_indicator_records():
+    with patch("indicators.indicator_base.apply_indicators", return_value=indicators_mock), \
+            patch("indicators.indicator_base.save_data_to_file"):
         # Call the function
         result = calculate_indicators(coins_data)
 
-        # Assert that the function returns the cleaned indicators
-        assert result == cleaned_indicators_mock
+        # Assert that the function returns typed records that read like the simplified indicators
+        assert result["BTC"]["trend"]["SMA"] == 45500.0
+        assert result["BTC"]["momentum"].get("RSI") == 50.0
+        assert result["BTC"].to_dict() == indicators_mock["BTC"]
 
 
 def test_calculate_indicators_handles_exception():
@@ -1,10 +1,14 @@
 from unittest.mock import patch
 
+import numpy as np
+
 from tests.indicators.mock_data import MOCK_CONFIG_VALUES
 
 # Mock `load_config_values`
 with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUES):
-    from indicators.indicator_base import extract_ohlc_prices
+    from indicators import indicator_base
+    from indicators.indicator_base import extract_ohlc_prices, select_primary_pair
+    from services.candle_store import klines_to_records
 
 
 def test_extract_ohlc_prices_success():
@@ -12,29 +16,114 @@ def test_extract_ohlc_prices_success():
     coins_data = {
         'DOGE': {
             'candlesticks': {
-                'pair1': [
+                'DOGEBTC': [
+                    [1632328900, 0.1, 0.2, 0.1, 0.1],
+                    [1632328960, 0.1, 0.2, 0.1, 0.2]
+                ],
+                'DOGEUSDT': [
                     [1632328900, 53.5, 54.5, 53.0, 53.3],
                     [1632328960, 53.3, 55.0, 53.1, 54.2]
-                ],
-                'pair2': [
-                    [1632329020, 54.3, 55.1, 53.8, 54.6],
-                    [1632329080, 54.6, 55.3, 54.0, 54.9]
                 ]
             }
         }
     }
 
-    expected_high_prices = [54.5, 55.0, 55.1, 55.3]
-    expected_low_prices = [53.0, 53.1, 53.8, 54.0]
-    expected_close_prices = [53.3, 54.2, 54.6, 54.9]
+    expected_high_prices = [54.5, 55.0]
+    expected_low_prices = [53.0, 53.1]
+    expected_close_prices = [53.3, 54.2]
+
+    # Call function
+    high_prices, low_prices, close_prices = extract_ohlc_prices(coins_data, 'DOGE')
+
+    # Assert that only the candles of the primary pair are returned, as contiguous float64 arrays
+    np.testing.assert_array_equal(high_prices, expected_high_prices)
+    np.testing.assert_array_equal(low_prices, expected_low_prices)
+    np.testing.assert_array_equal(close_prices, expected_close_prices)
+    assert close_prices.dtype == np.float64
+    assert close_prices.flags['C_CONTIGUOUS']
+
+
+def test_extract_ohlc_prices_from_candle_records():
+    # Mock coins_data with the candle records the data fetcher passes on
+    coins_data = {
+        'DOGE': {
+            'candlesticks': {
+                'DOGEUSDT': klines_to_records([
+                    [1632328900, "53.5", "54.5", "53.0", "53.3", "10", 1632328959, "533", 4, "5", "266", "0"],
+                    [1632328960, "53.3", "55.0", "53.1", "54.2", "12", 1632329019, "650", 6, "6", "325", "0"]
+                ])
+            }
+        }
+    }
 
     # Call function
     high_prices, low_prices, close_prices = extract_ohlc_prices(coins_data, 'DOGE')
 
-    # Assert that the output lists match expected values
-    assert high_prices == expected_high_prices
-    assert low_prices == expected_low_prices
-    assert close_prices == expected_close_prices
+    # Assert that the prices are copied out of the records as contiguous float64 arrays
+    np.testing.assert_array_equal(high_prices, [54.5, 55.0])
+    np.testing.assert_array_equal(low_prices, [53.0, 53.1])
+    np.testing.assert_array_equal(close_prices, [53.3, 54.2])
+    assert close_prices.dtype == np.float64
+    assert close_prices.flags['C_CONTIGUOUS']
+
+
+def test_extract_ohlc_prices_of_a_given_pair():
+    # Mock coins_data with candlesticks of two pairs
+    coins_data = {
+        'DOGE': {
+            'candlesticks': {
+                'DOGEUSDT': [[1632328900, 53.5, 54.5, 53.0, 53.3]],
+                'DOGEBTC': [[1632328900, 0.1, 0.3, 0.1, 0.2]]
+            }
+        }
+    }
+
+    # Call function for the pair that is not the primary one
+    high_prices, low_prices, close_prices = extract_ohlc_prices(coins_data, 'DOGE', 'DOGEBTC')
+
+    # Assert that the candles of that pair are returned
+    np.testing.assert_array_equal(high_prices, [0.3])
+    np.testing.assert_array_equal(low_prices, [0.1])
+    np.testing.assert_array_equal(close_prices, [0.2])
+
+
+def test_select_primary_pair_by_quote_asset_preference():
+    # USDC is preferred over BTC, XRPDOGE is quoted in the coin itself
+    coin_data = {
+        'candlesticks': {
+            'XRPDOGE': [[0, 0, 1, 1, 1]] * 3,
+            'DOGEBTC': [[0, 0, 1, 1, 1]] * 3,
+            'DOGEUSDC': [[0, 0, 1, 1, 1]],
+            'DOGEUSDT': []
+        }
+    }
+
+    # Pairs without candles are never selected
+    assert select_primary_pair(coin_data, 'DOGE') == 'DOGEUSDC'
+
+
+def test_select_primary_pair_without_preferred_quote_asset():
+    # The quote assets are read from the pair metadata when present
+    coin_data = {
+        'candlesticks': {
+            'XRPDOGE': [[0, 0, 1, 1, 1]] * 3,
+            'DOGETRY': [[0, 0, 1, 1, 1]],
+            'DOGEEUR': [[0, 0, 1, 1, 1]] * 2
+        },
+        'pair_metadata': {
+            'XRPDOGE': {'baseAsset': 'XRP', 'quoteAsset': 'DOGE'},
+            'DOGETRY': {'baseAsset': 'DOGE', 'quoteAsset': 'TRY'},
+            'DOGEEUR': {'baseAsset': 'DOGE', 'quoteAsset': 'EUR'}
+        }
+    }
+
+    # Pairs where the coin is the base asset come first, then the one with the most candles
+    assert select_primary_pair(coin_data, 'DOGE') == 'DOGEEUR'
+
+    with patch.dict(indicator_base.config, {'INDICATOR_QUOTE_ASSETS': ['TRY']}):
+        assert select_primary_pair(coin_data, 'DOGE') == 'DOGETRY'
+
+    assert select_primary_pair({'candlesticks': {'DOGEUSDT': []}}, 'DOGE') is None
 
 
 def test_extract_ohlc_prices_no_candlesticks():
@@ -46,10 +135,10 @@ def test_extract_ohlc_prices_no_candlesticks():
     # Call function with missing candlesticks data
     high_prices, low_prices, close_prices = extract_ohlc_prices(coins_data, 'DOGE')
 
-    # Assert that the lists are empty
-    assert high_prices == []
-    assert low_prices == []
-    assert close_prices == []
+    # Assert that the arrays are empty
+    assert len(high_prices) == 0
+    assert len(low_prices) == 0
+    assert len(close_prices) == 0
 
 
 def test_extract_ohlc_prices_empty_data():
@@ -66,10 +155,10 @@ def test_extract_ohlc_prices_empty_data():
     # Call function with empty candlesticks data
     high_prices, low_prices, close_prices = extract_ohlc_prices(coins_data, 'DOGE')
 
-    # Assert that the lists are empty
-    assert high_prices == []
-    assert low_prices == []
-    assert close_prices == []
+    # Assert that the arrays are empty
+    assert len(high_prices) == 0
+    assert len(low_prices) == 0
+    assert len(close_prices) == 0
 
 
 def test_extract_ohlc_prices_invalid_data():
@@ -93,9 +182,9 @@ def test_extract_ohlc_prices_invalid_data():
     high_prices, low_prices, close_prices = extract_ohlc_prices(coins_data, 'DOGE')
 
     # Assert that non-float values are correctly converted
-    assert high_prices == expected_high_prices
-    assert low_prices == expected_low_prices
-    assert close_prices == expected_close_prices
+    np.testing.assert_array_equal(high_prices, expected_high_prices)
+    np.testing.assert_array_equal(low_prices, expected_low_prices)
+    np.testing.assert_array_equal(close_prices, expected_close_prices)
 
 
 def test_extract_ohlc_prices_missing_coin():
@@ -105,7 +194,7 @@ def test_extract_ohlc_prices_missing_coin():
     # Call function with a coin that's not in the data
     high_prices, low_prices, close_prices = extract_ohlc_prices(coins_data, 'DOGE')
 
-    # Assert that the lists are empty since the coin doesn't exist in the data
-    assert high_prices == []
-    assert low_prices == []
-    assert close_prices == []
+    # Assert that the arrays are empty since the coin doesn't exist in the data
+    assert len(high_prices) == 0
+    assert len(low_prices) == 0
+    assert len(close_prices) == 0
@@ -0,0 +1,138 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from tests.indicators.mock_data import MOCK_CONFIG_VALUES
+
+# Mock `load_config_values`
+with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUES):
+    from indicators import indicator_base, streaming_indicators
+    from indicators.indicator_cache import IndicatorCache, get_cache_key, get_settings_hash
+    from services.candle_store import klines_to_records
+
+HOUR_MS = 3_600_000
+
+
+def make_klines(count, close=100.0):
+    # Full hourly klines with a rising close
+    return [
+        [i * HOUR_MS, str(close + i), str(close + i + 1), str(close + i - 1), str(close + i), "10.0",
+         (i + 1) * HOUR_MS - 1, "1000.0", 5, "5.0", "500.0", "0"]
+        for i in range(count)
+    ]
+
+
+def make_coins_data(btc_close=100.0):
+    return {
+        "BTC": {"candlesticks": {"BTCUSDT": klines_to_records(make_klines(30, btc_close))}},
+        "ETH": {"candlesticks": {"ETHUSDT": klines_to_records(make_klines(30, 50.0))}},
+        "XRP": {"candlesticks": {"XRPUSDT": klines_to_records(make_klines(1))}},
+    }
+
+
+def test_least_recently_used_entries_are_dropped():
+    cache = IndicatorCache(2)
+    cache.put("a", {"trend": {}})
+    cache.put("b", {"trend": {}})
+
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == {"trend": {}}
+    cache.put("c", {"trend": {}})
+
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.get("b") is None
+    assert cache.get_report() == {"hits": 1, "misses": 1, "hit_ratio": 0.5, "entries": 2}
+
+    # Every report starts counting again
+    assert cache.get_report()["hits"] == 0
+
+
+def test_save_and_load_keep_the_order(tmp_path):
+    cache = IndicatorCache(10)
+    cache.put("a", {"trend": {"SMA": np.float64(1.5), "above_SMA": np.bool_(True)}})
+    cache.put("b", {"trend": {}})
+    file_path = str(tmp_path / "cache" / "indicator_results.json")
+
+    cache.save(file_path)
+    restored = IndicatorCache(10)
+
+    assert restored.load(file_path)
+    assert list(restored.entries.items()) == [("a", {"trend": {"SMA": 1.5, "above_SMA": True}}), ("b", {"trend": {}})]
+    assert not IndicatorCache(10).load(str(tmp_path / "missing.json"))
+
+
+def test_cache_key_follows_the_candles_and_settings():
+    candles = klines_to_records(make_klines(30))
+    settings_hash = get_settings_hash("pandas")
+    key = get_cache_key("BTCUSDT", candles, settings_hash)
+
+    # The same candles as raw klines or records always give the same key
+    assert get_cache_key("BTCUSDT", candles.copy(), settings_hash) == key
+    assert get_cache_key("BTCUSDT", make_klines(30), settings_hash) == get_cache_key("BTCUSDT", make_klines(30),
+                                                                                     settings_hash)
+
+    # The still open last candle changed
+    changed = candles.copy()
+    changed["close"][-1] += 1
+    assert get_cache_key("BTCUSDT", changed, settings_hash) != key
+
+    # Another pair, number of candles, selection or indicator parameters
+    assert get_cache_key("ETHUSDT", candles, settings_hash) != key
+    assert get_cache_key("BTCUSDT", candles[1:], settings_hash) != key
+    assert get_cache_key("BTCUSDT", candles, get_settings_hash("pandas", {"RSI"})) != key
+    other_config = {**streaming_indicators.config['TREND_INDICATORS'], "SMA_WINDOW": 7}
+    with patch.dict(streaming_indicators.config, {"TREND_INDICATORS": other_config}):
+        assert get_cache_key("BTCUSDT", candles, get_settings_hash("pandas")) != key
+
+    # Another backend
+    assert get_cache_key("BTCUSDT", candles, get_settings_hash("streaming")) != key
+
+
+def test_unchanged_coins_are_served_from_the_cache(capsys):
+    cache_config = {"INDICATOR_CACHE": {"MAX_ENTRIES": 10, "CACHE_FILE": ""}}
+    with patch.dict(indicator_base.config, cache_config), patch.object(indicator_base, "indicator_cache", None), \
+            patch.object(indicator_base, "save_data_to_file"):
+        first = indicator_base.calculate_indicators(make_coins_data())
+
+        # Only BTC has a new price, XRP has too few candles to be calculated or cached
+        with patch.object(indicator_base, "apply_indicators", wraps=indicator_base.apply_indicators) as mock_apply:
+            second = indicator_base.calculate_indicators(make_coins_data(btc_close=101.0))
+
+        assert list(mock_apply.call_args.args[0]) == ["BTC", "XRP"]
+
+    # The entry of the old BTC candles stays until it is the least recently used one
+    report = {"hits": 1, "misses": 2, "hit_ratio": 0.3333, "entries": 3}
+    assert capsys.readouterr().out.splitlines().count(f"Indicator cache: {report}") == 1
+
+    assert list(second) == ["BTC", "ETH"]
+    assert second["ETH"].to_dict() == first["ETH"].to_dict()
+    assert second["BTC"]["trend"]["SMA"] != first["BTC"]["trend"]["SMA"]
+
+
+def test_streaming_backend_bypasses_the_cache():
+    cache_config = {"INDICATOR_CACHE": {"MAX_ENTRIES": 10, "CACHE_FILE": ""}, "INDICATOR_BACKEND": "streaming"}
+    with patch.dict(indicator_base.config, cache_config), patch.object(indicator_base, "indicator_cache", None), \
+            patch.object(indicator_base, "streaming_indicators", None), \
+            patch.object(indicator_base, "save_data_to_file"), \
+            patch.object(streaming_indicators.StreamingIndicators, "update",
+                         wraps=streaming_indicators.StreamingIndicators.update, autospec=True) as mock_update:
+        indicator_base.calculate_indicators(make_coins_data())
+        indicator_base.calculate_indicators(make_coins_data())
+
+    # Every coin updated its streaming state in both cycles
+    assert mock_update.call_count == 6
+    assert indicator_base.indicator_cache is None
+
+
+def test_cache_file_is_only_written_when_entries_were_added(tmp_path):
+    cache_config = {"INDICATOR_CACHE": {"MAX_ENTRIES": 10, "CACHE_FILE": "cache/indicator_results.json"}}
+    with patch.dict(indicator_base.config, cache_config), patch.object(indicator_base, "indicator_cache", None), \
+            patch.object(indicator_base, "save_data_to_file"), \
+            patch.object(indicator_base, "get_data_path", side_effect=lambda path: str(tmp_path / path)), \
+            patch.object(indicator_base.IndicatorCache, "save") as mock_save:
+        coins_data = make_coins_data()
+        del coins_data["XRP"]
+        indicator_base.calculate_indicators(coins_data)
+        indicator_base.calculate_indicators(coins_data)
+
+    mock_save.assert_called_once_with(str(tmp_path / "cache/indicator_results.json"))
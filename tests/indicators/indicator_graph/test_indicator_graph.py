@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from indicators import indicator_graph, numpy_kernels
+from indicators.indicator_graph import IndicatorGraph, format_node
+from tests.indicators.mock_data import make_prices
+
+
+def assert_identical(graph_result, kernel_result):
+    if isinstance(kernel_result, dict):
+        assert graph_result.keys() == kernel_result.keys()
+        for key in kernel_result:
+            assert_identical(graph_result[key], kernel_result[key])
+        return
+
+    np.testing.assert_array_equal(graph_result, kernel_result)
+
+
+@pytest.mark.parametrize("rows", [1, 3])
+def test_graph_indicators_are_identical_to_the_kernels(rows):
+    prices = [make_prices(80, seed) for seed in range(rows)]
+    highs, lows, closes = (np.array([price[i] for price in prices]) for i in range(3))
+    if rows == 1:
+        highs, lows, closes = highs[0], lows[0], closes[0]
+    graph = IndicatorGraph(highs, lows, closes)
+
+    assert_identical(indicator_graph.calculate_sma(graph, 14), numpy_kernels.calculate_sma(closes, 14))
+    assert_identical(indicator_graph.calculate_ema(graph, 14), numpy_kernels.calculate_ema(closes, 14))
+    assert_identical(indicator_graph.calculate_macd(graph, 12, 26, 9), numpy_kernels.calculate_macd(closes, 12, 26, 9))
+    assert_identical(indicator_graph.calculate_ichimoku_cloud(graph, 9, 26, 52, 26),
+                     numpy_kernels.calculate_ichimoku_cloud(highs, lows, closes, 9, 26, 52, 26))
+    assert_identical(indicator_graph.calculate_rsi(graph, 14), numpy_kernels.calculate_rsi(closes, 14))
+    assert_identical(indicator_graph.calculate_stochastic_oscillator(graph, 14, 3),
+                     numpy_kernels.calculate_stochastic_oscillator(highs, lows, closes, 14, 3))
+    assert_identical(indicator_graph.calculate_williams_r(graph, 14),
+                     numpy_kernels.calculate_williams_r(highs, lows, closes, 14))
+    assert_identical(indicator_graph.calculate_cci(graph, 20), numpy_kernels.calculate_cci(highs, lows, closes, 20))
+    assert_identical(indicator_graph.calculate_bollinger_bands(graph, 20, 2),
+                     numpy_kernels.calculate_bollinger_bands(closes, 20, 2))
+    assert_identical(indicator_graph.calculate_atr(graph, 14), numpy_kernels.calculate_atr(highs, lows, closes, 14))
+
+
+def test_shared_intermediates_are_calculated_once():
+    graph = IndicatorGraph(*make_prices(80))
+
+    indicator_graph.calculate_stochastic_oscillator(graph, 14, 3)
+    indicator_graph.calculate_williams_r(graph, 14)
+    indicator_graph.calculate_bollinger_bands(graph, 14, 2)
+    indicator_graph.calculate_sma(graph, 14)
+
+    report = graph.get_report()
+    assert report["reused_nodes"] == {
+        "percent_k(14)": 1,  # Smoothed into %D
+        "rolling_max(high, 14)": 1,
+        "rolling_min(low, 14)": 1,
+        "rolling_mean(close, 14)": 1,
+    }
+    assert report["reused"] == 4
+    assert report["computed"] == len(set(graph.computed))
+
+
+def test_ichimoku_lines_share_their_midpoints():
+    graph = IndicatorGraph(*make_prices(80))
+
+    # Same window for the conversion and base line
+    indicator_graph.calculate_ichimoku_cloud(graph, 9, 9, 52, 26)
+
+    assert graph.get_report()["reused_nodes"] == {"midpoint(9)": 1}
+
+
+def test_format_node():
+    assert format_node(("close",)) == "close"
+    assert format_node(("rolling_max", ("high",), 14)) == "rolling_max(high, 14)"
+    assert format_node(("ewm_mean", ("macd_line", 12, 26), 9)) == "ewm_mean(macd_line(12, 26), 9)"
+
+
+def test_invalid_windows():
+    graph = IndicatorGraph(*make_prices(80))
+
+    with pytest.raises(ValueError):
+        indicator_graph.calculate_sma(graph, 0)
+    with pytest.raises(ValueError):
+        indicator_graph.calculate_williams_r(graph, 1)
+
+
+def calculate_all(graph):
+    return {
+        'SMA': indicator_graph.calculate_sma(graph, 14),
+        'EMA': indicator_graph.calculate_ema(graph, 14),
+        'MACD': indicator_graph.calculate_macd(graph, 12, 26, 9),
+        'Ichimoku': indicator_graph.calculate_ichimoku_cloud(graph, 9, 26, 52, 26),
+        'RSI': indicator_graph.calculate_rsi(graph, 14),
+        'StochasticOscillator': indicator_graph.calculate_stochastic_oscillator(graph, 14, 3),
+        'Williams%R': indicator_graph.calculate_williams_r(graph, 14),
+        'CCI': indicator_graph.calculate_cci(graph, 20),
+        'BollingerBands': indicator_graph.calculate_bollinger_bands(graph, 20, 2),
+        'ATR': indicator_graph.calculate_atr(graph, 14),
+    }
+
+
+def take_tail(result, length):
+    if isinstance(result, dict):
+        return {key: take_tail(value, length) for key, value in result.items()}
+    return result[..., -length:]
+
+
+@pytest.mark.parametrize("tail_length", [1, 3])
+@pytest.mark.parametrize("rows", [1, 3])
+def test_tail_values_are_identical_to_the_full_series(tail_length, rows):
+    prices = np.array([make_prices(120, seed) for seed in range(rows)])
+    highs, lows, closes = prices[:, 0], prices[:, 1], prices[:, 2]
+    if rows == 1:
+        highs, lows, closes = highs[0], lows[0], closes[0]
+
+    full = calculate_all(IndicatorGraph(highs, lows, closes))
+    tail = calculate_all(IndicatorGraph(highs, lows, closes, tail_length))
+
+    assert_identical(tail, take_tail(full, tail_length))
+
+
+def test_tail_only_reads_the_trailing_windows():
+    graph = IndicatorGraph(*make_prices(500), tail_length=1)
+
+    indicator_graph.calculate_cci(graph, 20)
+    indicator_graph.calculate_stochastic_oscillator(graph, 14, 3)
+    indicator_graph.calculate_williams_r(graph, 14)
+
+    assert graph.values[("typical_price",)].shape == (20,)
+    assert graph.values[("rolling_max", ("high",), 14)].shape == (3,)
+    assert graph.values[("percent_k", 14)].shape == (3,)
+    # %K and Williams %R use the last value of the nodes calculated for %D
+    assert graph.get_report()["reused_nodes"] == {
+        "typical_price": 2,
+        "percent_k(14)": 1,
+        "rolling_max(high, 14)": 1,
+        "rolling_min(low, 14)": 1,
+    }
+
+
+def test_tail_longer_than_the_prices():
+    highs, lows, closes = make_prices(30)
+
+    full = calculate_all(IndicatorGraph(highs, lows, closes))
+    tail = calculate_all(IndicatorGraph(highs, lows, closes, tail_length=100))
+
+    assert_identical(tail, full)
@@ -0,0 +1,77 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from tests.indicators.mock_data import MOCK_CONFIG_VALUES
+
+# Mock `load_config_values`
+with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUES):
+    from indicators.indicator_records import MomentumRecord, TrendRecord, VolatilityRecord, \
+        build_indicator_records, records_to_dict
+
+# Simplified indicators of one coin like the backends return them
+MOCK_INDICATORS = {
+    "BTC": {
+        "trend": {
+            "SMA": np.float64(53.325714285714284),
+            "above_SMA": np.bool_(True),
+            "MACD_histogram": None,
+            "MACD_trend": "bullish",
+        },
+        "momentum": {"RSI": np.float32(41.23456), "Stochastic_%K": np.float64(12.0), "Stochastic_signal": "oversold"},
+        "volatility": {"ATR": 12.34567, "close_below_lower": np.bool_(False)},
+    }
+}
+
+
+def test_values_are_converted_by_field_type():
+    record = TrendRecord(MOCK_INDICATORS["BTC"]["trend"])
+
+    assert record["SMA"] == 53.3257
+    assert type(record["SMA"]) is float
+    assert record["above_SMA"] is True
+    assert record["MACD_histogram"] is None
+    assert record["MACD_trend"] == "bullish"
+
+
+def test_fields_with_symbols_in_their_name():
+    record = MomentumRecord(MOCK_INDICATORS["BTC"]["momentum"])
+
+    assert record["RSI"] == 41.2346
+    assert record["Stochastic_%K"] == 12.0
+    assert record.to_dict() == {"RSI": 41.2346, "Stochastic_%K": 12.0, "Stochastic_signal": "oversold"}
+
+
+def test_missing_fields_behave_like_missing_dict_keys():
+    record = VolatilityRecord(MOCK_INDICATORS["BTC"]["volatility"])
+
+    assert "ATR" in record
+    assert "Bollinger_width" not in record
+    assert record.get("Bollinger_width", 0) == 0
+    with pytest.raises(KeyError):
+        record["Bollinger_width"]
+    with pytest.raises(KeyError):
+        VolatilityRecord({"unknown": 1.0})
+
+
+def test_build_indicator_records_reads_like_nested_dicts():
+    records = build_indicator_records(MOCK_INDICATORS)
+
+    assert records["BTC"]["trend"]["SMA"] == 53.3257
+    assert records["BTC"]["volatility"].get("ATR") == 12.3457
+    with pytest.raises(KeyError):
+        records["BTC"]["unknown"]
+
+
+def test_records_to_dict_writes_plain_json():
+    records = build_indicator_records(MOCK_INDICATORS)
+
+    assert json.loads(json.dumps(records_to_dict(records))) == {
+        "BTC": {
+            "trend": {"SMA": 53.3257, "above_SMA": True, "MACD_histogram": None, "MACD_trend": "bullish"},
+            "momentum": {"RSI": 41.2346, "Stochastic_%K": 12.0, "Stochastic_signal": "oversold"},
+            "volatility": {"ATR": 12.3457, "close_below_lower": False},
+        }
+    }
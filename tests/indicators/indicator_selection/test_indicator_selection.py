@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from tests.indicators.mock_data import MOCK_CONFIG_VALUES
+
+# Mock `load_config_values`
+with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUES):
+    from indicators import indicator_base
+    from indicators.indicator_selection import INDICATOR_FIELDS, get_selection_report, select_indicators
+
+
+def make_coins_data(count=60, seed=0):
+    # One pair of hourly candles with a random walk of prices
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.02, count))
+    klines = [
+        [i * 3_600_000, close, close * 1.01, close * 0.99, close, 1.0, (i + 1) * 3_600_000 - 1]
+        for i, close in enumerate(closes.tolist())
+    ]
+    return {"BTC": {"candlesticks": {"BTCUSDT": klines}}}
+
+
+REQUIRED_FIELDS = {
+    'trend': ['SMA'],
+    'momentum': ['Stochastic_signal'],
+    'volatility': [],
+}
+
+
+def test_select_indicators_of_the_required_fields():
+    assert select_indicators(REQUIRED_FIELDS) == {'SMA', 'StochasticOscillator'}
+    assert select_indicators(None) is None
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError):
+        select_indicators({'trend': ['SMA_200']})
+    with pytest.raises(ValueError):
+        select_indicators({'sentiment': ['RSI']})
+
+
+def test_selection_report():
+    report = get_selection_report({'SMA', 'RSI'}, coin_count=3)
+
+    assert report["calculated"] == ['SMA', 'RSI']
+    assert len(report["skipped"]) == 8
+    assert report["skipped_calculations"] == 24
+    assert get_selection_report(None, 3)["skipped"] == []
+
+
+@pytest.mark.parametrize("backend", ["pandas", "numpy", "batch", "streaming"])
+def test_indicator_fields_match_the_simplified_indicators(backend):
+    with patch.dict(indicator_base.config, {"INDICATOR_BACKEND": backend}), \
+            patch.object(indicator_base, "streaming_indicators", None):
+        indicators = indicator_base.apply_indicators(make_coins_data())
+
+    for category, fields in indicators["BTC"].items():
+        assert set(fields) == {field for names in INDICATOR_FIELDS[category].values() for field in names}
+
+
+@pytest.mark.parametrize("backend", ["pandas", "numpy", "batch", "streaming"])
+def test_only_selected_indicators_are_calculated(backend):
+    with patch.dict(indicator_base.config, {"INDICATOR_BACKEND": backend}), \
+            patch.object(indicator_base, "streaming_indicators", None):
+        indicators = indicator_base.apply_indicators(make_coins_data(), select_indicators(REQUIRED_FIELDS))
+
+    assert {category: set(fields) for category, fields in indicators["BTC"].items()} == {
+        'trend': {'SMA', 'above_SMA'},
+        'momentum': {'Stochastic_%K', 'Stochastic_%D', 'Stochastic_signal'},
+        'volatility': set(),
+    }
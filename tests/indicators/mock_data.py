@@ -1,4 +1,20 @@
+import numpy as np
+
 MOCK_CONFIG_VALUES = {
+    "INDICATOR_BACKEND": "pandas",  # Backend used to calculate the indicators
+    "INDICATOR_TAIL_LENGTH": 1,  # Values per indicator calculated by the batch backend
+    "INDICATOR_QUOTE_ASSETS": ["USDT", "FDUSD", "USDC", "BTC"],  # Preferred quote assets of the indicator pair
+    "PARALLEL_INDICATORS": {
+        "WORKERS": 0,  # Calculate the indicators in the test process
+        "MIN_COINS_PER_WORKER": 1,  # Split even a few coins over the workers
+    },
+    "INDICATOR_CACHE": {
+        "MAX_ENTRIES": 0,  # Calculate every coin in every test
+        "CACHE_FILE": "",  # Keep the cache in memory
+    },
+    "STREAMING_INDICATORS": {
+        "CHECKPOINT_FILE": "",  # Keep the streaming indicator states in memory only
+    },
     "TREND_INDICATORS": {
         "SMA_WINDOW": 14,  # Window for Simple Moving Average
         "EMA_WINDOW": 14,  # Window for Exponential Moving Average
@@ -31,3 +47,12 @@ MOCK_CONFIG_VALUES = {
         "ATR_WINDOW": 14,  # Window for Average True Range calculation
     }
 }
+
+
+def make_prices(count=60, seed=0):
+    # Random walk of highs, lows and closes
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.02, count))
+    highs = closes * (1 + rng.random(count) * 0.01)
+    lows = closes * (1 - rng.random(count) * 0.01)
+    return highs.tolist(), lows.tolist(), closes.tolist()
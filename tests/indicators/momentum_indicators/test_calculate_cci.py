@@ -29,7 +29,7 @@ def test_calculate_cci_with_valid_data():
     assert len(result) == len(expected_cci)
 
     # Check if the values are equal, but ignore NaNs at the start
-    pd.testing.assert_series_equal(result, expected_cci, check_like=True)
+    pd.testing.assert_series_equal(result, expected_cci, check_like=True, check_exact=True)
 
 
 def test_calculate_cci_with_window_less_than_two():
@@ -85,4 +85,23 @@ def test_calculate_cci_with_valid_data_large_window():
     assert len(result) == len(expected_cci)
 
     # Check if the values are equal, but ignore NaNs at the start
-    pd.testing.assert_series_equal(result, expected_cci, check_like=True)
+    pd.testing.assert_series_equal(result, expected_cci, check_like=True, check_exact=True)
+
+
+def test_calculate_cci_matches_rolling_apply_on_long_history():
+    # Random walk long enough to cover many windows
+    closes = (100 + pd.Series(range(2000)).map(lambda i: (i * 7919 % 113) - 56) / 10).tolist()
+    highs = [close + 1 for close in closes]
+    lows = [close - 1 for close in closes]
+    window = 20
+    result = calculate_cci(highs, lows, closes, window=window)
+
+    # Mean deviation calculated window by window
+    typical_price = (pd.Series(highs) + pd.Series(lows) + pd.Series(closes)) / 3
+    tp_sma = typical_price.rolling(window=window).mean()
+    mean_deviation = typical_price.rolling(window=window).apply(
+        lambda x: pd.Series(x).sub(x.mean()).abs().mean(), raw=False
+    )
+    expected_cci = (typical_price - tp_sma) / (0.015 * mean_deviation)
+
+    pd.testing.assert_series_equal(result, expected_cci, check_exact=True)
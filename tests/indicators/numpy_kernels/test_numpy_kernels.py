@@ -0,0 +1,154 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import numpy_kernels
+from tests.indicators.mock_data import MOCK_CONFIG_VALUES, make_prices
+
+with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUES):
+    from indicators import momentum_indicators, trend_indicators, volatility_indicators
+
+
+def assert_same(numpy_result, pandas_result):
+    # Compare plain results as well as dictionaries of results
+    if isinstance(pandas_result, dict):
+        assert numpy_result.keys() == pandas_result.keys()
+        for key in pandas_result:
+            assert_same(numpy_result[key], pandas_result[key])
+        return
+
+    assert isinstance(numpy_result, np.ndarray)
+    np.testing.assert_allclose(numpy_result, pandas_result.to_numpy(), rtol=1e-10, atol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_single_price_indicators_match_pandas(seed):
+    _, _, closes = make_prices(seed=seed)
+
+    assert_same(numpy_kernels.calculate_sma(closes, 14), trend_indicators.calculate_sma(closes, 14))
+    assert_same(numpy_kernels.calculate_ema(closes, 14), trend_indicators.calculate_ema(closes, 14))
+    assert_same(numpy_kernels.calculate_macd(closes, 12, 26, 9), trend_indicators.calculate_macd(closes, 12, 26, 9))
+    assert_same(numpy_kernels.calculate_rsi(closes, 14), momentum_indicators.calculate_rsi(closes, 14))
+    assert_same(numpy_kernels.calculate_bollinger_bands(closes, 20, 2),
+                volatility_indicators.calculate_bollinger_bands(closes, 20, 2))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_ohlc_indicators_match_pandas(seed):
+    highs, lows, closes = make_prices(seed=seed)
+
+    assert_same(numpy_kernels.calculate_ichimoku_cloud(highs, lows, closes, 9, 26, 52, 26),
+                trend_indicators.calculate_ichimoku_cloud(highs, lows, closes, 9, 26, 52, 26))
+    assert_same(numpy_kernels.calculate_stochastic_oscillator(highs, lows, closes, 14, 3),
+                momentum_indicators.calculate_stochastic_oscillator(highs, lows, closes, 14, 3))
+    assert_same(numpy_kernels.calculate_williams_r(highs, lows, closes, 14),
+                momentum_indicators.calculate_williams_r(highs, lows, closes, 14))
+    assert_same(numpy_kernels.calculate_cci(highs, lows, closes, 20),
+                momentum_indicators.calculate_cci(highs, lows, closes, 20))
+    assert_same(numpy_kernels.calculate_atr(highs, lows, closes, 14),
+                volatility_indicators.calculate_atr(highs, lows, closes, 14))
+
+
+def test_ewm_mean_is_identical_to_pandas():
+    _, _, closes = make_prices()
+
+    expected = pd.Series(closes).ewm(span=12, adjust=False).mean().to_numpy()
+
+    assert np.array_equal(numpy_kernels.ewm_mean(closes, 12), expected)
+
+
+def test_ewm_mean_skips_leading_nan_like_pandas():
+    values = [np.nan, np.nan, 1.0, 2.0, np.nan, 4.0]
+
+    expected = pd.Series(values).ewm(span=3, adjust=False).mean().to_numpy()
+
+    np.testing.assert_array_equal(numpy_kernels.ewm_mean(values, 3), expected)
+    np.testing.assert_array_equal(numpy_kernels.ewm_mean(np.array([values, values]), 3), [expected, expected])
+
+
+def test_kernels_work_on_one_row_per_coin():
+    rows = np.array([make_prices(seed=seed)[2] for seed in range(3)])
+
+    sma = numpy_kernels.rolling_mean(rows, 14)
+    ema = numpy_kernels.ewm_mean(rows, 14)
+
+    for row, sma_row, ema_row in zip(rows, sma, ema):
+        np.testing.assert_allclose(sma_row, pd.Series(row).rolling(14).mean(), equal_nan=True)
+        np.testing.assert_array_equal(ema_row, pd.Series(row).ewm(span=14, adjust=False).mean())
+
+
+def test_rsi_without_losses():
+    # A rising series has no losses, so RSI is 100 like in pandas
+    prices = list(range(1, 21))
+
+    assert_same(numpy_kernels.calculate_rsi(prices, 14), momentum_indicators.calculate_rsi(prices, 14))
+    assert numpy_kernels.calculate_rsi(prices, 14)[-1] == 100
+
+
+def test_shift():
+    values = [1.0, 2.0, 3.0]
+
+    np.testing.assert_array_equal(numpy_kernels.shift(values, 1), [np.nan, 1.0, 2.0])
+    np.testing.assert_array_equal(numpy_kernels.shift(values, -1), [2.0, 3.0, np.nan])
+    np.testing.assert_array_equal(numpy_kernels.shift(values, 5), [np.nan, np.nan, np.nan])
+
+
+def test_windows_longer_than_the_data():
+    assert np.isnan(numpy_kernels.rolling_mean([1.0, 2.0], 3)).all()
+
+
+def test_invalid_windows():
+    with pytest.raises(ValueError):
+        numpy_kernels.calculate_sma([1.0, 2.0], 0)
+    with pytest.raises(ValueError):
+        numpy_kernels.calculate_williams_r([1.0] * 5, [1.0] * 5, [1.0] * 5, 1)
+
+    assert numpy_kernels.calculate_sma([], 14) is None
+    assert numpy_kernels.calculate_macd([1.0] * 10, 12, 26, 9) is None
+
+
+def test_select_backend():
+    assert numpy_kernels.select_backend("numpy", trend_indicators) is numpy_kernels
+    assert numpy_kernels.select_backend("pandas", trend_indicators) is trend_indicators
+
+    with pytest.raises(ValueError):
+        numpy_kernels.select_backend("unknown", trend_indicators)
+
+
+def test_numpy_backend_gives_the_same_simplified_indicators():
+    highs, lows, closes = make_prices()
+
+    def simplify():
+        return (
+            trend_indicators.simplify_trend_indicators(
+                trend_indicators.calculate_trend_indicators(highs, lows, closes), closes),
+            momentum_indicators.simplify_momentum_indicators(
+                momentum_indicators.calculate_momentum_indicators(highs, lows, closes)),
+            volatility_indicators.simplify_volatility_indicators(
+                volatility_indicators.calculate_volatility_indicators(highs, lows, closes), closes),
+        )
+
+    pandas_results = simplify()
+    with patch.dict(trend_indicators.config, {"INDICATOR_BACKEND": "numpy"}), \
+            patch.dict(momentum_indicators.config, {"INDICATOR_BACKEND": "numpy"}), \
+            patch.dict(volatility_indicators.config, {"INDICATOR_BACKEND": "numpy"}):
+        numpy_results = simplify()
+
+    for numpy_simplified, pandas_simplified in zip(numpy_results, pandas_results):
+        assert numpy_simplified.keys() == pandas_simplified.keys()
+        for key, value in pandas_simplified.items():
+            if isinstance(value, str) or isinstance(value, (bool, np.bool_)):
+                assert numpy_simplified[key] == value
+            else:
+                assert numpy_simplified[key] == pytest.approx(value, rel=1e-10)
+
+
+def test_rolling_mean_deviation_in_chunks():
+    rows = np.array([make_prices(count=500, seed=seed)[2] for seed in range(4)])
+
+    expected = numpy_kernels.rolling_reduce(rows, 20, numpy_kernels.mean_deviation)
+
+    np.testing.assert_array_equal(numpy_kernels.rolling_mean_deviation(rows, 20, chunk_size=37), expected)
+    np.testing.assert_array_equal(numpy_kernels.rolling_mean_deviation(rows[0], 20, chunk_size=1), expected[0])
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from tests.indicators.mock_data import MOCK_CONFIG_VALUES, make_prices
+
+# Mock `load_config_values`
+with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUES):
+    from indicators import indicator_base, parallel_indicators
+    from indicators.batch_indicators import calculate_batch_indicators, calculate_matrix_indicators
+    from indicators.parallel_indicators import calculate_in_parallel, split_rows
+
+
+def assert_same_indicators(result, expected):
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_same_indicators(result[key], value)
+        elif isinstance(value, float) and np.isnan(value):
+            assert np.isnan(result[key])
+        else:
+            assert result[key] == value, key
+
+
+@pytest.fixture(autouse=True)
+def shutdown_executor():
+    yield
+    if parallel_indicators.executor is not None:
+        parallel_indicators.executor.shutdown()
+        parallel_indicators.executor = None
+
+
+def test_split_rows_covers_every_row_in_order():
+    assert split_rows(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert split_rows(2, 2) == [(0, 1), (1, 2)]
+
+
+def test_parallel_batch_matches_the_batch_backend():
+    prices = {f"COIN{seed}": make_prices(count, seed) for seed, count in enumerate([10, 26, 40, 15, 60])}
+
+    result = calculate_in_parallel(prices, calculate_matrix_indicators, workers=2)
+
+    # Shards are merged in order, so even the coin order is the same
+    assert list(result) == list(prices)
+    assert_same_indicators(result, calculate_batch_indicators(prices))
+
+
+def test_parallel_rows_match_the_per_coin_loop():
+    prices = {f"COIN{seed}": make_prices(count, seed) for seed, count in enumerate([20, 30, 26])}
+    coins_data = {
+        coin: {"candlesticks": {f"{coin}USDT": [[0, 0, high, low, close] for high, low, close in zip(*coin_prices)]}}
+        for coin, coin_prices in prices.items()
+    }
+
+    result = calculate_in_parallel(prices, indicator_base.calculate_rows_indicators, workers=3)
+
+    assert list(result) == list(prices)
+    assert_same_indicators(result, indicator_base.apply_indicators(coins_data))
+
+
+def test_few_coins_are_calculated_in_this_process():
+    prices = {"BTC": make_prices(30, 0), "ETH": make_prices(30, 1)}
+
+    result = calculate_in_parallel(prices, calculate_matrix_indicators, workers=4, min_coins_per_worker=2)
+
+    assert parallel_indicators.executor is None
+    assert_same_indicators(result, calculate_batch_indicators(prices))
+
+
+def test_apply_indicators_with_workers():
+    high_prices, low_prices, close_prices = make_prices(30, 3)
+    coins_data = {
+        "BTC": {"candlesticks": {"BTCUSDT": [[0, 0, high, low, close] for high, low, close in
+                                             zip(high_prices, low_prices, close_prices)]}},
+        "SOL": {"candlesticks": {"SOLUSDT": [[0, 0, high, low, close] for high, low, close in
+                                             zip(low_prices, low_prices, low_prices)]}},
+        "ETH": {"candlesticks": {"ETHUSDT": [[0, 0, 2.0, 1.0, 1.5]]}},
+    }
+    expected = indicator_base.apply_indicators(coins_data)
+
+    with patch.dict(indicator_base.config, {"PARALLEL_INDICATORS": {"WORKERS": 2, "MIN_COINS_PER_WORKER": 1}}):
+        result = indicator_base.apply_indicators(coins_data)
+
+    # Coins without enough candles are skipped like in the per-coin loop
+    assert result.keys() == {"BTC", "SOL"}
+    assert_same_indicators(result, expected)
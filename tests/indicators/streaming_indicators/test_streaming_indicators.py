@@ -0,0 +1,296 @@
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from indicators import numpy_kernels
+from tests.indicators.mock_data import MOCK_CONFIG_VALUES, make_prices
+
+# Mock `load_config_values`
+with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUES):
+    from indicators import indicator_base, momentum_indicators, streaming_indicators, trend_indicators, \
+        volatility_indicators
+    from indicators.streaming_indicators import IndicatorState, RollingExtreme, RollingWindow, StreamingIndicators
+    from services.candle_store import klines_to_records
+
+HOUR_MS = 3_600_000
+
+
+def make_klines(high_prices, low_prices, close_prices, start=0):
+    # Hourly klines with the open time, prices and close time the streaming states read
+    return [
+        [(start + i) * HOUR_MS, str(close), str(high), str(low), str(close), "1.0", (start + i + 1) * HOUR_MS - 1]
+        for i, (high, low, close) in enumerate(zip(high_prices, low_prices, close_prices))
+    ]
+
+
+def feed(high_prices, low_prices, close_prices):
+    state = IndicatorState()
+    for high, low, close in zip(high_prices, low_prices, close_prices):
+        state.update(high, low, close)
+    return state
+
+
+def calculate_per_coin(high_prices, low_prices, close_prices):
+    # Indicators of the full history with the NumPy backend
+    with patch.dict(trend_indicators.config, {"INDICATOR_BACKEND": "numpy"}), \
+            patch.dict(momentum_indicators.config, {"INDICATOR_BACKEND": "numpy"}), \
+            patch.dict(volatility_indicators.config, {"INDICATOR_BACKEND": "numpy"}):
+        return {
+            'trend': trend_indicators.simplify_trend_indicators(
+                trend_indicators.calculate_trend_indicators(high_prices, low_prices, close_prices), close_prices),
+            'momentum': momentum_indicators.simplify_momentum_indicators(
+                momentum_indicators.calculate_momentum_indicators(high_prices, low_prices, close_prices)),
+            'volatility': volatility_indicators.simplify_volatility_indicators(
+                volatility_indicators.calculate_volatility_indicators(high_prices, low_prices, close_prices),
+                close_prices),
+        }
+
+
+def assert_same_indicators(result, expected):
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_same_indicators(result[key], value)
+        elif isinstance(value, (str, bool, np.bool_)) or value is None:
+            assert result[key] == value, key
+        elif np.isnan(value):
+            assert np.isnan(result[key]), key
+        else:
+            assert result[key] == pytest.approx(value, rel=1e-9), key
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_latest_values_match_the_full_calculation(seed):
+    highs, lows, closes = make_prices(120, seed)
+
+    state = feed(highs, lows, closes)
+
+    assert state.sma.mean() == pytest.approx(numpy_kernels.calculate_sma(closes, 14)[-1], rel=1e-12)
+    assert state.ema.weighted == numpy_kernels.calculate_ema(closes, 14)[-1]
+    macd = numpy_kernels.calculate_macd(closes, 12, 26, 9)
+    for key, value in state.macd.value().items():
+        assert value == macd[key][-1]
+    assert state.rsi.value() == pytest.approx(numpy_kernels.calculate_rsi(closes, 14)[-1], rel=1e-9)
+    stochastic = numpy_kernels.calculate_stochastic_oscillator(highs, lows, closes, 14, 3)
+    assert state.stochastic.value()['%K'] == pytest.approx(stochastic['%K'][-1], rel=1e-12)
+    assert state.stochastic.value()['%D'] == pytest.approx(stochastic['%D'][-1], rel=1e-9)
+    assert state.williams_r.value() == pytest.approx(numpy_kernels.calculate_williams_r(highs, lows, closes, 14)[-1])
+    assert state.cci.value() == pytest.approx(numpy_kernels.calculate_cci(highs, lows, closes, 20)[-1], rel=1e-9)
+    assert state.atr.value() == pytest.approx(numpy_kernels.calculate_atr(highs, lows, closes, 14)[-1], rel=1e-9)
+    bollinger = numpy_kernels.calculate_bollinger_bands(closes, 20, 2)
+    for key, value in state.bollinger.value().items():
+        assert value == pytest.approx(bollinger[key][-1], rel=1e-9)
+    ichimoku = numpy_kernels.calculate_ichimoku_cloud(highs, lows, closes, 9, 26, 52, 26)
+    for key in ['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b']:
+        assert state.ichimoku.value()[key] == pytest.approx(ichimoku[key][-1], rel=1e-12)
+
+
+@pytest.mark.parametrize("count", [2, 10, 20, 26, 60])
+def test_simplified_indicators_match_the_numpy_backend(count):
+    highs, lows, closes = make_prices(count, count)
+
+    assert_same_indicators(feed(highs, lows, closes).get_indicators(), calculate_per_coin(highs, lows, closes))
+
+
+def test_rolling_window_stays_accurate_over_long_histories():
+    _, _, closes = make_prices(2500, 3)
+    window = RollingWindow(20)
+
+    means = []
+    stds = []
+    for close in closes:
+        window.update(close)
+        means.append(window.mean())
+        stds.append(window.std())
+
+    np.testing.assert_allclose(means, numpy_kernels.rolling_mean(closes, 20), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(stds, numpy_kernels.rolling_std(closes, 20), rtol=1e-8, equal_nan=True)
+
+
+def test_rolling_extreme_matches_rolling_max_and_min():
+    values = np.random.default_rng(4).integers(0, 10, 300).astype(float).tolist()
+    maximum = RollingExtreme(7, True)
+    minimum = RollingExtreme(7, False)
+
+    maximums = []
+    minimums = []
+    for value in values:
+        maximum.update(value)
+        minimum.update(value)
+        maximums.append(maximum.value())
+        minimums.append(minimum.value())
+
+    np.testing.assert_array_equal(maximums, numpy_kernels.rolling_max(values, 7))
+    np.testing.assert_array_equal(minimums, numpy_kernels.rolling_min(values, 7))
+
+
+def test_rolling_window_with_missing_values():
+    window = RollingWindow(2)
+
+    window.update(1.0)
+    window.update(float("nan"))
+    assert np.isnan(window.mean())
+
+    # The window is valid again once the missing value left it
+    window.update(3.0)
+    assert np.isnan(window.mean())
+    window.update(5.0)
+    assert window.mean() == 4.0
+
+
+def test_checkpoint_continues_like_an_uninterrupted_state():
+    highs, lows, closes = make_prices(80, 5)
+    state = feed(highs[:50], lows[:50], closes[:50])
+
+    restored = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+    for high, low, close in zip(highs[50:], lows[50:], closes[50:]):
+        state.update(high, low, close)
+        restored.update(high, low, close)
+
+    assert json.dumps(restored.to_dict()) == json.dumps(state.to_dict())
+    assert_same_indicators(restored.get_indicators(), calculate_per_coin(highs, lows, closes))
+
+
+def test_update_only_processes_new_closed_candles():
+    highs, lows, closes = make_prices(40, 6)
+    klines = make_klines(highs, lows, closes)
+    states = StreamingIndicators()
+
+    # The 30th candle only closes after 30 hours, so it is still open
+    state = states.update("BTCUSDT", klines[:30], now_ms=29 * HOUR_MS + 1)
+    assert state.count == 29
+    assert state.last_open_time == 28 * HOUR_MS
+
+    # The overlapping candles are skipped, the open candle of before is processed now
+    state = states.update("BTCUSDT", klines[20:], now_ms=40 * HOUR_MS)
+    assert state.count == 40
+    assert_same_indicators(state.get_indicators(), calculate_per_coin(highs, lows, closes))
+
+
+def test_update_reads_candle_records():
+    highs, lows, closes = make_prices(30, 11)
+    klines = make_klines(highs, lows, closes)
+    records = klines_to_records([kline + ["0", 1, "0", "0", "0"] for kline in klines])
+
+    state = StreamingIndicators().update("BTCUSDT", records, now_ms=100 * HOUR_MS)
+    expected = StreamingIndicators().update("BTCUSDT", klines, now_ms=100 * HOUR_MS)
+
+    # The state matches the one of the raw klines, which also means it can still be written as JSON
+    assert json.dumps(state.to_dict()) == json.dumps(expected.to_dict())
+    assert_same_indicators(state.get_indicators(), calculate_per_coin(highs, lows, closes))
+
+
+def test_update_continues_with_only_the_new_candles():
+    highs, lows, closes = make_prices(40, 8)
+    states = StreamingIndicators()
+    states.update("BTCUSDT", make_klines(highs[:30], lows[:30], closes[:30]), now_ms=100 * HOUR_MS)
+
+    # The batch starts right after the last processed candle, so no candle is missing
+    state = states.update("BTCUSDT", make_klines(highs[30:], lows[30:], closes[30:], start=30),
+                          now_ms=100 * HOUR_MS)
+
+    assert state.count == 40
+    assert_same_indicators(state.get_indicators(), calculate_per_coin(highs, lows, closes))
+
+
+def test_update_starts_over_after_missing_candles():
+    highs, lows, closes = make_prices(40, 7)
+    states = StreamingIndicators()
+    states.update("BTCUSDT", make_klines(highs[:10], lows[:10], closes[:10]), now_ms=100 * HOUR_MS)
+
+    # Candles 10 to 19 were never seen, so the state is rebuilt from the new candles only
+    state = states.update("BTCUSDT", make_klines(highs[20:], lows[20:], closes[20:], start=20),
+                          now_ms=100 * HOUR_MS)
+
+    assert state.count == 20
+    assert_same_indicators(state.get_indicators(), calculate_per_coin(highs[20:], lows[20:], closes[20:]))
+
+
+def test_save_and_load_checkpoints(tmp_path):
+    highs, lows, closes = make_prices(30, 8)
+    states = StreamingIndicators()
+    states.update("BTCUSDT", make_klines(highs, lows, closes), now_ms=100 * HOUR_MS)
+    file_path = str(tmp_path / "cache" / "indicator_states.json")
+
+    states.save(file_path)
+    restored = StreamingIndicators()
+
+    assert restored.load(file_path)
+    # NaN values are compared by their JSON text
+    assert json.dumps(restored.states["BTCUSDT"].to_dict()) == json.dumps(states.states["BTCUSDT"].to_dict())
+
+
+def test_checkpoints_of_other_parameters_are_ignored(tmp_path):
+    file_path = str(tmp_path / "indicator_states.json")
+    states = StreamingIndicators()
+    states.update("BTCUSDT", make_klines(*make_prices(5, 9)), now_ms=100 * HOUR_MS)
+    states.save(file_path)
+
+    other_config = {**streaming_indicators.config['TREND_INDICATORS'], "SMA_WINDOW": 7}
+    with patch.dict(streaming_indicators.config, {"TREND_INDICATORS": other_config}):
+        restored = StreamingIndicators()
+        assert not restored.load(file_path)
+
+    assert restored.states == {}
+    assert not StreamingIndicators().load(str(tmp_path / "missing.json"))
+
+
+def test_apply_indicators_in_streaming_mode():
+    highs, lows, closes = make_prices(30, 10)
+    coins_data = {
+        "BTC": {"candlesticks": {"BTCUSDT": make_klines(highs, lows, closes)}},
+        "ETH": {"candlesticks": {"ETHUSDT": make_klines([2.0], [1.0], [1.5])}},
+    }
+
+    with patch.dict(indicator_base.config, {"INDICATOR_BACKEND": "streaming"}), \
+            patch.object(indicator_base, "streaming_indicators", None):
+        result = indicator_base.apply_indicators(coins_data)
+
+    # Coins without enough closed candles are skipped like in the per-coin loop
+    assert result.keys() == {"BTC"}
+    assert_same_indicators(result["BTC"], calculate_per_coin(highs, lows, closes))
+
+
+def test_open_candle_is_evaluated_on_a_copy():
+    highs, lows, closes = make_prices(40, 12)
+    klines = make_klines(highs, lows, closes)
+    states = StreamingIndicators()
+
+    # The last candle is still open
+    now_ms = 39 * HOUR_MS + 1
+    state = states.update("BTCUSDT", klines, now_ms)
+    checkpoint = json.dumps(state.to_dict())
+    preview = streaming_indicators.include_open_candle(state, klines, now_ms)
+
+    # The open candle is included like in the other backends, the state itself still ends at the last closed candle
+    assert preview.count == 40
+    assert_same_indicators(preview.get_indicators(), calculate_per_coin(highs, lows, closes))
+    assert json.dumps(state.to_dict()) == checkpoint
+
+    # Once every candle closed, there is nothing to add
+    state = states.update("BTCUSDT", klines, now_ms=40 * HOUR_MS)
+    assert streaming_indicators.include_open_candle(state, klines, 40 * HOUR_MS) is state
+
+
+def test_streaming_backend_matches_the_pandas_backend():
+    highs, lows, closes = make_prices(60, 13)
+    coins_data = {"BTC": {"candlesticks": {"BTCUSDT": make_klines(highs, lows, closes)}}}
+
+    # The last candle is still open in both cycles, its price changed in the second one
+    with patch.object(indicator_base.time, "time", return_value=59.5 * HOUR_MS / 1000):
+        with patch.dict(indicator_base.config, {"INDICATOR_BACKEND": "streaming"}), \
+                patch.object(indicator_base, "streaming_indicators", None):
+            indicator_base.apply_indicators(coins_data)
+            coins_data["BTC"]["candlesticks"]["BTCUSDT"][-1][4] = str(closes[-1] * 1.01)
+            streaming = indicator_base.apply_indicators(coins_data)
+
+        closes[-1] *= 1.01
+        coins_data["BTC"]["candlesticks"]["BTCUSDT"] = make_klines(highs, lows, closes)
+        with patch.dict(indicator_base.config, {"INDICATOR_BACKEND": "pandas"}):
+            pandas_result = indicator_base.apply_indicators(coins_data)
+
+    # The streaming states use the formulas of the pandas backend (the RSI with rolling means of gains and losses,
+    # the first candle counting as no change), so only rounding differs
+    assert_same_indicators(streaming["BTC"], pandas_result["BTC"])
@@ -0,0 +1,134 @@
+import pytest
+from binance.error import ClientError, ServerError
+from binance.spot import Spot
+
+from mock_exchange.rest_server import MockExchangeServer, SnapshotMarket, SyntheticMarket, select_klines
+from services.rate_limiter import RateLimiter, RateLimitedClient
+from services.snapshot import get_request_key
+from tests.services.mock_data import MOCK_EXCHANGE_INFO, MOCK_PRICES, MOCK_STATS, make_klines
+from utils.order_execution import extract_filter_parameters
+
+
+@pytest.fixture
+def mock_server():
+    server = MockExchangeServer(SyntheticMarket(symbol_count=10, seed=1), seed=1).start()
+    yield server
+    server.stop()
+
+
+def make_client(server):
+    return Spot(api_key="mock_key", api_secret="mock_secret", base_url=server.url, show_limit_usage=True)
+
+
+def test_select_klines():
+    klines = make_klines(0, 5)
+
+    assert select_klines(klines, 2) == klines[-2:]
+    assert select_klines(klines, 2, start_time=klines[1][0]) == klines[1:3]
+    assert select_klines(klines, 2, end_time=klines[2][0]) == klines[1:3]
+    assert select_klines(klines, 5, start_time=klines[1][0], end_time=klines[2][0]) == klines[1:3]
+
+
+def test_synthetic_market_is_deterministic():
+    first_market = SyntheticMarket(symbol_count=5, seed=3)
+    second_market = SyntheticMarket(symbol_count=5, seed=3)
+
+    assert first_market.stats == second_market.stats
+    assert first_market.klines("COIN0USDT", 10) == second_market.klines("COIN0USDT", 10)
+
+
+def test_synthetic_market_filters_can_be_parsed():
+    market = SyntheticMarket(symbol_count=5)
+
+    for symbol in market.exchange_info["symbols"]:
+        assert extract_filter_parameters(symbol["filters"])["notional"]["min_notional"] == 5.0
+
+
+def test_snapshot_market_serves_recorded_responses():
+    responses = {
+        get_request_key("exchange_info", (), {}): [MOCK_EXCHANGE_INFO],
+        get_request_key("ticker_price", (), {}): [MOCK_PRICES],
+        get_request_key("ticker_24hr", (), {}): [MOCK_STATS],
+        get_request_key("account", (), {}): [{"balances": []}],
+        get_request_key("klines", (), {"symbol": "BTCUSDT", "interval": "1h", "limit": 3}): [make_klines(0, 3)],
+    }
+
+    market = SnapshotMarket(responses)
+
+    assert market.exchange_info == MOCK_EXCHANGE_INFO
+    assert market.klines("BTCUSDT", 2) == make_klines(0, 3)[-2:]
+    assert market.klines("ETHUSDT", 2) == []
+
+
+def test_serves_market_data(mock_server):
+    client = make_client(mock_server)
+
+    exchange_info = client.exchange_info()["data"]
+    klines = client.klines(symbol="COIN0USDT", interval="1h", limit=26)["data"]
+    price = client.ticker_price(symbol="COIN0USDT")
+
+    assert len(exchange_info["symbols"]) == 10
+    assert len(klines) == 26
+    assert price["data"] == {"symbol": "COIN0USDT", "price": klines[-1][4]}
+    assert int(price["limit_usage"]["x-mbx-used-weight-1m"]) == 20 + 2 + 2
+
+
+def test_serves_klines_up_to_the_end_time(mock_server):
+    client = make_client(mock_server)
+    klines = client.klines(symbol="COIN0USDT", interval="1h", limit=10)["data"]
+
+    earlier = client.klines(symbol="COIN0USDT", interval="1h", limit=3, endTime=klines[-4][0])["data"]
+
+    assert earlier == klines[-6:-3]
+
+
+def test_serves_signed_endpoints(mock_server):
+    client = make_client(mock_server)
+
+    assert client.account()["data"]["balances"][0]["asset"] == "USDT"
+    assert client.new_order_test(symbol="COIN0USDT", side="BUY", type="MARKET", quantity=1)["data"] == {}
+
+
+def test_rejects_unknown_symbols(mock_server):
+    with pytest.raises(ClientError) as exc_info:
+        make_client(mock_server).ticker_price(symbol="UNKNOWN")
+
+    assert exc_info.value.status_code == 400
+
+
+def test_rejects_requests_over_the_weight_limit():
+    server = MockExchangeServer(SyntheticMarket(symbol_count=10), weight_limit=30).start()
+    client = make_client(server)
+
+    try:
+        client.exchange_info()
+        with pytest.raises(ClientError) as exc_info:
+            client.exchange_info()
+    finally:
+        server.stop()
+
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.header["Retry-After"]) > 0
+    assert server.get_metrics()["rate_limited"] == 1
+
+
+def test_fails_requests_at_the_error_rate():
+    server = MockExchangeServer(SyntheticMarket(symbol_count=10), error_rate=1.0).start()
+
+    try:
+        with pytest.raises(ServerError):
+            make_client(server).exchange_info()
+    finally:
+        server.stop()
+
+    assert server.get_metrics()["errors"] == 1
+
+
+def test_rate_limited_client_tracks_server_weight(mock_server):
+    rate_limiter = RateLimiter(weight_limit=6000, safety_margin=0)
+    client = RateLimitedClient(make_client(mock_server), rate_limiter)
+
+    client.ticker_24hr()
+
+    assert rate_limiter.get_metrics()["last_used_weight"] == 80
+    assert mock_server.get_metrics()["weight_used"] == 80
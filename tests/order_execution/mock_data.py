@@ -1,3 +1,20 @@
 MOCK_CONFIG_VALUES = {
-    "ORDER_VALUE": 10
+    "ORDER_VALUE": 10,
+    "SNAPSHOT": {
+        "MODE": "live",
+        "DIRECTORY": "snapshots",
+    },
+    "HTTP_CONNECTIONS": {
+        "POOL_SIZE": 0,
+        "MAX_HOSTS": 4,
+        "COMPRESSION": True,
+    },
+    "DATA_FETCHING": {
+        "MAX_CONCURRENT_REQUESTS": 4,
+    },
+    "RATE_LIMITS": {
+        "WEIGHT_LIMIT_PER_MINUTE": 6000,
+        "SAFETY_MARGIN": 0.1,
+        "MAX_RETRIES": 3,
+    },
 }
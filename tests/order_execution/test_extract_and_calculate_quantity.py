@@ -23,7 +23,7 @@ def mock_client():
 
 def test_extract_and_calculate_quantity_valid_no_balance(mock_client):
     # Test when coin_balance is not provided, calculate the quantity based on the amount_to_use
-    with patch("order_execution.executor_base.client", mock_client):
+    with patch("order_execution.executor_base.get_client", return_value=mock_client):
         coins_data = {
             'BTC': {
                 'pair_metadata': {
@@ -44,7 +44,7 @@ def test_extract_and_calculate_quantity_valid_no_balance(mock_client):
 
 def test_extract_and_calculate_quantity_with_balance(mock_client):
     # Test when coin_balance is provided, return the minimum of calculated quantity and coin_balance
-    with patch("order_execution.executor_base.client", mock_client):
+    with patch("order_execution.executor_base.get_client", return_value=mock_client):
         coins_data = {
             'BTC': {
                 'pair_metadata': {
@@ -66,7 +66,7 @@ def test_extract_and_calculate_quantity_with_balance(mock_client):
 
 def test_extract_and_calculate_quantity_invalid_quantity_below_min(mock_client):
     # Test when quantity is below the minimum allowed quantity
-    with patch("order_execution.executor_base.client", mock_client):
+    with patch("order_execution.executor_base.get_client", return_value=mock_client):
         coins_data = {
             'BTC': {
                 'pair_metadata': {
@@ -87,7 +87,7 @@ def test_extract_and_calculate_quantity_invalid_quantity_below_min(mock_client):
 
 def test_extract_and_calculate_quantity_invalid_quantity_above_max(mock_client):
     # Test when quantity exceeds the maximum allowed quantity
-    with patch("order_execution.executor_base.client", mock_client):
+    with patch("order_execution.executor_base.get_client", return_value=mock_client):
         coins_data = {
             'BTC': {
                 'pair_metadata': {
@@ -108,7 +108,7 @@ def test_extract_and_calculate_quantity_invalid_quantity_above_max(mock_client):
 
 def test_extract_and_calculate_quantity_invalid_notional(mock_client):
     # Test when the total value is below the minimum notional
-    with patch("order_execution.executor_base.client", mock_client):
+    with patch("order_execution.executor_base.get_client", return_value=mock_client):
         coins_data = {
             'BTC': {
                 'pair_metadata': {
@@ -129,7 +129,7 @@ def test_extract_and_calculate_quantity_invalid_notional(mock_client):
 
 def test_extract_and_calculate_quantity_invalid_coin_balance(mock_client):
     # Test when coin_balance is provided but less than the calculated quantity
-    with patch("order_execution.executor_base.client", mock_client):
+    with patch("order_execution.executor_base.get_client", return_value=mock_client):
         coins_data = {
             'BTC': {
                 'pair_metadata': {
@@ -151,7 +151,7 @@ def test_extract_and_calculate_quantity_invalid_coin_balance(mock_client):
 
 def test_extract_and_calculate_quantity_no_balance(mock_client):
     # Test when coin_balance is None, calculate and return the quantity
-    with patch("order_execution.executor_base.client", mock_client):
+    with patch("order_execution.executor_base.get_client", return_value=mock_client):
         coins_data = {
             'BTC': {
                 'pair_metadata': {
@@ -23,7 +23,7 @@ def mock_client():
 
 def test_sell_coin_for_usdt_successful(mock_client):
     # Test a successful sell transaction
-    with patch("order_execution.executor_base.client", mock_client), \
+    with patch("order_execution.executor_base.get_client", return_value=mock_client), \
             patch("order_execution.executor_base.check_coin_balance", return_value=10), \
             patch("order_execution.executor_base.extract_and_calculate_quantity", return_value=5), \
             patch("order_execution.executor_base.save_data_to_file") as mock_save_data:
@@ -55,7 +55,7 @@ def test_sell_coin_for_usdt_insufficient_balance(mock_client, capsys):
     mock_client.ticker_price = MagicMock(return_value={"price": "50000.0"})  # Mock price
 
     # Test when the wallet balance is insufficient
-    with patch("order_execution.executor_base.client", mock_client), \
+    with patch("order_execution.executor_base.get_client", return_value=mock_client), \
             patch("order_execution.executor_base.check_coin_balance", return_value=0.0005), \
             patch("order_execution.executor_base.validate_quantity") as mock_validate_quantity, \
             patch("order_execution.executor_base.save_data_to_file"):
@@ -88,7 +88,7 @@ def test_sell_coin_for_usdt_insufficient_balance(mock_client, capsys):
 
 def test_sell_coin_for_usdt_invalid_trading_pair(mock_client, capsys):
     # Test when the trading pair is invalid
-    with patch("order_execution.executor_base.client", mock_client), \
+    with patch("order_execution.executor_base.get_client", return_value=mock_client), \
             patch("order_execution.executor_base.check_coin_balance", return_value=10), \
             patch("order_execution.executor_base.extract_and_calculate_quantity",
                   side_effect=KeyError("Invalid trading pair")), \
@@ -112,10 +112,10 @@ def test_sell_coin_for_usdt_invalid_trading_pair(mock_client, capsys):
 
 def test_sell_coin_for_usdt_order_placement_failure(mock_client, capsys):
     # Test when order placement fails
-    with patch("order_execution.executor_base.client", mock_client), \
+    with patch("order_execution.executor_base.get_client", return_value=mock_client), \
             patch("order_execution.executor_base.check_coin_balance", return_value=10), \
             patch("order_execution.executor_base.extract_and_calculate_quantity", return_value=5), \
-            patch("order_execution.executor_base.client.new_order_test",
+            patch.object(mock_client, "new_order_test",
                   side_effect=Exception("Order placement failed")), \
             patch("order_execution.executor_base.save_data_to_file"):
         coins_data = {
@@ -1,14 +1,51 @@
+from services.symbol_index import SymbolIndex
+
 # Global Mock Data
 MOCK_CONFIG_VALUES = {
     "PRICE_CHANGE_THRESHOLD": 2,
     "PRICE_RANGE_VOLATILITY_THRESHOLD": 0.05,
+    "MIN_QUOTE_VOLUME": 0,
+    "QUOTE_ASSETS": [],
+    "MAX_SPREAD": 0,
+    "DATA_FETCHING": {
+        "CANDLESTICK_INTERVAL": "1h",
+        "CANDLESTICK_LIMIT": 26,
+        "MAX_CONCURRENT_REQUESTS": 4,
+        "USE_CANDLE_STORE": False,
+    },
+    "EXCHANGE_INFO_CACHE": {
+        "TTL_SECONDS": 0,
+    },
+    "MARKET_STREAM": {
+        "ENABLED": False,
+        "STREAM_URL": "ws://127.0.0.1:9443",
+        "CYCLE_INTERVAL_SECONDS": 60,
+        "RELOAD_CONFIG": False,
+    },
+    "SNAPSHOT": {
+        "MODE": "live",
+        "DIRECTORY": "snapshots",
+    },
+    "HTTP_CONNECTIONS": {
+        "POOL_SIZE": 0,
+        "MAX_HOSTS": 4,
+        "COMPRESSION": True,
+    },
+    "RATE_LIMITS": {
+        "WEIGHT_LIMIT_PER_MINUTE": 6000,
+        "SAFETY_MARGIN": 0.1,
+        "MAX_RETRIES": 3,
+    },
 }
 
 MOCK_EXCHANGE_INFO = {
     "symbols": [
-        {"symbol": "BTCUSDT", "status": "TRADING"},
-        {"symbol": "ETHUSDT", "status": "TRADING"},
-        {"symbol": "XRPUSDT", "status": "BREAK"},
+        {"symbol": "BTCUSDT", "status": "TRADING", "baseAsset": "BTC", "quoteAsset": "USDT", "baseAssetPrecision": 8,
+         "quotePrecision": 2, "filters": []},
+        {"symbol": "ETHUSDT", "status": "TRADING", "baseAsset": "ETH", "quoteAsset": "USDT", "baseAssetPrecision": 8,
+         "quotePrecision": 2, "filters": []},
+        {"symbol": "XRPUSDT", "status": "BREAK", "baseAsset": "XRP", "quoteAsset": "USDT", "baseAssetPrecision": 8,
+         "quotePrecision": 2, "filters": []},
     ]
 }
 
@@ -48,9 +85,15 @@ MOCK_ALL_SYMBOLS_DATA = {
     ],
 }
 
+MOCK_ALL_SYMBOLS_DATA["symbol_index"] = SymbolIndex(
+    MOCK_ALL_SYMBOLS_DATA["exchange_info"]["symbols"], MOCK_ALL_SYMBOLS_DATA["active_symbols"]
+)
+
 MOCK_CANDLESTICKS = [
-    [1639040400000, "50000.00", "51000.00", "49000.00", "50500.00", "1000"],
-    [1639044000000, "50500.00", "51500.00", "49500.00", "51000.00", "800"],
+    [1639040400000, "50000.00", "51000.00", "49000.00", "50500.00", "1000", 1639043999999, "50500000.0", 120, "500",
+     "25250000.0", "0"],
+    [1639044000000, "50500.00", "51500.00", "49500.00", "51000.00", "800", 1639047599999, "40800000.0", 95, "400",
+     "20400000.0", "0"],
 ]
 
 MOCK_WALLET_BALANCE = [
@@ -72,3 +115,50 @@ MOCK_COINS_DATA = {
         "candlesticks": {"ETHUSDT": MOCK_CANDLESTICKS},
     },
 }
+
+HOUR_MS = 3_600_000
+
+
+def make_klines(start_open_time, count, close=100.0):
+    # Build full 12-field klines like the exchange returns them
+    return [
+        [
+            start_open_time + i * HOUR_MS, str(close + i), str(close + i + 1), str(close + i - 1), str(close + i),
+            "10.5", start_open_time + (i + 1) * HOUR_MS - 1, "1050.0", 7, "5.0", "500.0", "0",
+        ]
+        for i in range(count)
+    ]
+
+
+def make_kline_event(symbol, open_time, close, is_closed=False):
+    # Kline stream event as sent on a combined stream
+    return {
+        "stream": f"{symbol.lower()}@kline_1h",
+        "data": {
+            "e": "kline", "E": open_time + 1000, "s": symbol,
+            "k": {
+                "t": open_time, "T": open_time + HOUR_MS - 1, "s": symbol, "i": "1h", "o": str(close),
+                "c": str(close), "h": str(close + 1), "l": str(close - 1), "v": "10.5", "n": 7, "x": is_closed,
+                "q": "1050.0", "V": "5.0", "Q": "500.0", "B": "0",
+            },
+        },
+    }
+
+
+MOCK_STREAM_FRAMES = [
+    {
+        "stream": "!miniTicker@arr",
+        "data": [
+            {"e": "24hrMiniTicker", "E": 1, "s": "BTCUSDT", "c": "55000", "o": "50000", "h": "56000", "l": "49000",
+             "v": "100", "q": "5500000"},
+            {"e": "24hrMiniTicker", "E": 1, "s": "ETHUSDT", "c": "3900", "o": "4000", "h": "4100", "l": "3800",
+             "v": "200", "q": "780000"},
+        ],
+    },
+    {
+        "stream": "btcusdt@bookTicker",
+        "data": {"u": 1, "s": "BTCUSDT", "b": "54999.99", "B": "1", "a": "55000.01", "A": "2"},
+    },
+    make_kline_event("BTCUSDT", 1_700_000_000_000 + 25 * HOUR_MS, 600.0),
+    make_kline_event("BTCUSDT", 1_700_000_000_000 + 26 * HOUR_MS, 700.0),
+]
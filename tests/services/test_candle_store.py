@@ -0,0 +1,89 @@
+import numpy as np
+
+from services.candle_store import CandleStore, interval_to_milliseconds, klines_to_records, records_to_klines
+from tests.services.mock_data import HOUR_MS, make_klines
+
+def test_interval_to_milliseconds():
+    assert interval_to_milliseconds("1m") == 60_000
+    assert interval_to_milliseconds("1h") == HOUR_MS
+    assert interval_to_milliseconds("4h") == 4 * HOUR_MS
+    assert interval_to_milliseconds("1d") == 24 * HOUR_MS
+
+
+def test_klines_round_trip():
+    klines = make_klines(1_700_000_000_000, 3)
+
+    result = records_to_klines(klines_to_records(klines))
+
+    # Values keep their types and numeric values
+    assert len(result) == 3
+    for original, converted in zip(klines, result):
+        assert converted[0] == original[0]
+        assert converted[6] == original[6]
+        assert converted[8] == original[8]
+        assert [float(value) for value in converted[1:6]] == [float(value) for value in original[1:6]]
+
+
+def test_load_from_empty_store(tmp_path):
+    store = CandleStore(str(tmp_path))
+
+    assert len(store.load("BTCUSDT", "1h")) == 0
+    assert store.last_open_time("BTCUSDT", "1h") is None
+
+
+def test_append_and_load_last_records(tmp_path):
+    store = CandleStore(str(tmp_path))
+    klines = make_klines(1_700_000_000_000, 5)
+
+    store.append("BTCUSDT", "1h", klines)
+
+    assert store.count("BTCUSDT", "1h") == 5
+    assert store.last_open_time("BTCUSDT", "1h") == klines[-1][0]
+    np.testing.assert_array_equal(store.load("BTCUSDT", "1h", limit=2)["open_time"], [klines[3][0], klines[4][0]])
+
+
+def test_append_replaces_overlapping_candles(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", make_klines(1_700_000_000_000, 5, close=100.0))
+
+    # The last stored candle is updated and two new ones are added
+    store.append("BTCUSDT", "1h", make_klines(1_700_000_000_000 + 4 * HOUR_MS, 3, close=200.0))
+
+    records = store.load("BTCUSDT", "1h")
+    assert len(records) == 7
+    assert np.all(np.diff(records["open_time"]) == HOUR_MS)
+    assert records["close"][3] == 103.0
+    assert records["close"][4] == 200.0
+
+
+def test_symbols_and_intervals_are_stored_separately(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", make_klines(1_700_000_000_000, 2))
+    store.append("ETHUSDT", "1h", make_klines(1_700_000_000_000, 3))
+
+    assert store.count("BTCUSDT", "1h") == 2
+    assert store.count("ETHUSDT", "1h") == 3
+    assert store.count("BTCUSDT", "4h") == 0
+
+
+def test_reset(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", make_klines(1_700_000_000_000, 2))
+
+    store.reset("BTCUSDT", "1h")
+
+    assert store.count("BTCUSDT", "1h") == 0
+
+
+def test_prepend_older_candles(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", make_klines(1_700_000_000_000, 3, close=200.0))
+
+    # The last older candle overlaps the first stored one and is left out
+    store.prepend("BTCUSDT", "1h", make_klines(1_700_000_000_000 - 2 * HOUR_MS, 3, close=100.0))
+
+    records = store.load("BTCUSDT", "1h")
+    assert len(records) == 5
+    assert np.all(np.diff(records["open_time"]) == HOUR_MS)
+    assert store.first_open_time("BTCUSDT", "1h") == 1_700_000_000_000 - 2 * HOUR_MS
+    assert records["close"][2] == 200.0
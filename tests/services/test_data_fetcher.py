@@ -1,5 +1,8 @@
+import threading
+import time
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from tests.services.mock_data import (
@@ -10,7 +13,9 @@ from tests.services.mock_data import (
     MOCK_ALL_SYMBOLS_DATA,
     MOCK_CANDLESTICKS,
     MOCK_WALLET_BALANCE,
-    MOCK_COINS_DATA
+    MOCK_COINS_DATA,
+    HOUR_MS,
+    make_klines,
 )
 
 # Mock `load_config_values` globally for all imports
@@ -19,15 +24,18 @@ with patch("utils.file_utils.load_config_values", return_value=MOCK_CONFIG_VALUE
         fetch_all_symbols_data,
         filter_potential_coins,
         fetch_coins_data,
+        fetch_candlesticks,
+        fetch_pair_candlesticks,
         get_coins_data,
     )
+from services.candle_store import CandleStore, klines_to_records
 
 
 @pytest.fixture
 def mock_client():
     """Fixture to mock the 'client' object."""
-    with patch("services.data_fetcher.client") as mock_client:
-        yield mock_client
+    with patch("services.data_fetcher.get_client") as mock_get_client:
+        yield mock_get_client.return_value
 
 
 def test_fetch_all_symbols_data(mock_client):
@@ -42,11 +50,13 @@ def test_fetch_all_symbols_data(mock_client):
     # Assertions
     assert "exchange_info" in result
     assert "active_symbols" in result
+    assert "symbol_index" in result
     assert "prices" in result
     assert "stats" in result
 
     # Validate that active_symbols only includes trading pairs
     assert result["active_symbols"] == {"BTCUSDT", "ETHUSDT"}
+    assert "XRPUSDT" not in result["symbol_index"]
 
     # Check that the filtered prices only contain active trading pairs
     assert result["prices"] == [
@@ -96,7 +106,7 @@ def test_fetch_coins_data(mock_client):
     assert btc_market_stat["priceChangePercent"] == "6"
     assert btc_market_stat["highPrice"] == "52000"
     assert btc_market_stat["lowPrice"] == "49000"
-    assert btc_data["candlesticks"]["BTCUSDT"] == MOCK_CANDLESTICKS
+    np.testing.assert_array_equal(btc_data["candlesticks"]["BTCUSDT"], klines_to_records(MOCK_CANDLESTICKS))
 
     # Validate ETH data
     eth_data = result["ETH"]
@@ -109,7 +119,151 @@ def test_fetch_coins_data(mock_client):
     assert eth_market_stat["highPrice"] == "4200"
     assert eth_market_stat["lowPrice"] == "4000"
 
-    assert eth_data["candlesticks"]["ETHUSDT"] == MOCK_CANDLESTICKS
+    np.testing.assert_array_equal(eth_data["candlesticks"]["ETHUSDT"], klines_to_records(MOCK_CANDLESTICKS))
+
+
+def test_fetch_coins_data_fetches_shared_pairs_once(mock_client):
+    # Assign global mocks
+    mock_client.klines.return_value = MOCK_CANDLESTICKS
+
+    # Call the function under test, BTCETH is a pairing of both BTC and ETH
+    fetch_coins_data(MOCK_ALL_SYMBOLS_DATA, ["BTC", "ETH"])
+
+    # Each active pair should be requested exactly once
+    requested_pairs = sorted(call.kwargs["symbol"] for call in mock_client.klines.call_args_list)
+    assert requested_pairs == ["BTCETH", "BTCUSDT", "ETHUSDT"]
+
+
+def test_fetch_candlesticks_maps_results_to_pairs(mock_client):
+    # Return different candlesticks for each pair
+    closes = {"BTCUSDT": 50000.0, "ETHUSDT": 4000.0}
+    mock_client.klines.side_effect = lambda symbol, interval, limit: make_klines(0, limit, close=closes[symbol])
+
+    # Call the function under test
+    result = fetch_candlesticks(["BTCUSDT", "ETHUSDT", "BTCUSDT"])
+
+    # Assertions, the klines are parsed into candle records
+    assert list(result) == ["BTCUSDT", "ETHUSDT"]
+    assert result["BTCUSDT"]["close"][0] == 50000.0
+    assert result["ETHUSDT"]["close"][0] == 4000.0
+    assert len(result["ETHUSDT"]) == 26
+
+
+def test_fetch_candlesticks_runs_requests_concurrently(mock_client):
+    # Every request waits until all four of them are in flight at the same time
+    barrier = threading.Barrier(4, timeout=5)
+
+    def klines(symbol, interval, limit):
+        barrier.wait()
+        return MOCK_CANDLESTICKS
+
+    mock_client.klines.side_effect = klines
+
+    # Call the function under test, a sequential fetch would break the barrier
+    result = fetch_candlesticks(["AUSDT", "BUSDT", "CUSDT", "DUSDT"])
+
+    # Assertions
+    assert len(result) == 4
+    for candles in result.values():
+        np.testing.assert_array_equal(candles, klines_to_records(MOCK_CANDLESTICKS))
+
+
+def test_fetch_candlesticks_with_no_pairs(mock_client):
+    # Call the function under test
+    result = fetch_candlesticks([])
+
+    # Assertions
+    assert result == {}
+    mock_client.klines.assert_not_called()
+
+
+def test_fetch_pair_candlesticks_syncs_only_new_candles(mock_client, tmp_path):
+    # Store already holds the candles up to the current hour
+    current_hour = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    stored_klines = make_klines(current_hour - 29 * HOUR_MS, 30)
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", stored_klines)
+
+    # The exchange returns the still-open candle again plus one new candle
+    mock_client.klines.return_value = make_klines(current_hour, 2, close=500.0)
+
+    with patch("services.data_fetcher.candle_store", store):
+        result = fetch_pair_candlesticks("BTCUSDT")
+
+    # Only candles from the last stored open time were requested
+    mock_client.klines.assert_called_once_with(symbol="BTCUSDT", interval="1h", startTime=current_hour, limit=1000)
+
+    # The result holds the configured number of latest candles
+    assert len(result) == 26
+    assert result["open_time"][-1] == current_hour + HOUR_MS
+    assert result["close"][-2] == 500.0
+
+
+def test_fetch_pair_candlesticks_seeds_empty_store(mock_client, tmp_path):
+    current_hour = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    mock_client.klines.return_value = make_klines(current_hour - 25 * HOUR_MS, 26)
+    store = CandleStore(str(tmp_path))
+
+    with patch("services.data_fetcher.candle_store", store):
+        result = fetch_pair_candlesticks("BTCUSDT")
+
+    mock_client.klines.assert_called_once_with(symbol="BTCUSDT", interval="1h", limit=26)
+    assert len(result) == 26
+    assert store.count("BTCUSDT", "1h") == 26
+
+
+def test_fetch_pair_candlesticks_restarts_outdated_store(mock_client, tmp_path):
+    # Stored candles are older than a single request can cover
+    current_hour = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", make_klines(current_hour - 2000 * HOUR_MS, 5))
+    mock_client.klines.return_value = make_klines(current_hour - 25 * HOUR_MS, 26)
+
+    with patch("services.data_fetcher.candle_store", store):
+        result = fetch_pair_candlesticks("BTCUSDT")
+
+    mock_client.klines.assert_called_once_with(symbol="BTCUSDT", interval="1h", limit=26)
+    assert store.count("BTCUSDT", "1h") == 26
+    assert result["open_time"][0] == current_hour - 25 * HOUR_MS
+
+
+def test_fetch_pair_candlesticks_backfills_raised_limit(mock_client, tmp_path):
+    # Store was seeded with 10 candles, before the limit was raised to 26
+    current_hour = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", make_klines(current_hour - 9 * HOUR_MS, 10))
+    first_open_time = current_hour - 9 * HOUR_MS
+    mock_client.klines.side_effect = [
+        make_klines(current_hour, 1),
+        make_klines(first_open_time - 16 * HOUR_MS, 16),
+    ]
+
+    with patch("services.data_fetcher.candle_store", store), \
+            patch("services.data_fetcher.complete_histories", set()):
+        result = fetch_pair_candlesticks("BTCUSDT")
+
+    # The older candles are requested up to the first stored one
+    mock_client.klines.assert_called_with(symbol="BTCUSDT", interval="1h", endTime=first_open_time - 1, limit=16)
+    assert len(result) == 26
+    assert result["open_time"][0] == first_open_time - 16 * HOUR_MS
+    assert np.all(np.diff(result["open_time"]) == HOUR_MS)
+
+
+def test_fetch_pair_candlesticks_stops_backfilling_at_listing(mock_client, tmp_path):
+    # The exchange has no candles before the stored ones
+    current_hour = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    store = CandleStore(str(tmp_path))
+    store.append("BTCUSDT", "1h", make_klines(current_hour - 9 * HOUR_MS, 10))
+    mock_client.klines.side_effect = [make_klines(current_hour, 1), [], make_klines(current_hour, 1)]
+
+    with patch("services.data_fetcher.candle_store", store), \
+            patch("services.data_fetcher.complete_histories", set()):
+        fetch_pair_candlesticks("BTCUSDT")
+        result = fetch_pair_candlesticks("BTCUSDT")
+
+    # The second cycle does not ask for older candles again
+    assert mock_client.klines.call_count == 3
+    assert len(result) == 10
 
 
 @patch("services.data_fetcher.fetch_all_symbols_data", return_value=MOCK_ALL_SYMBOLS_DATA)
@@ -0,0 +1,112 @@
+import json
+import os
+from unittest.mock import MagicMock
+
+from services.exchange_info_cache import ExchangeInfoCache, get_checksum
+
+EXCHANGE_INFO = {
+    "serverTime": 1,
+    "symbols": [
+        {"symbol": "BTCUSDT", "status": "TRADING", "baseAsset": "BTC", "quoteAsset": "USDT", "baseAssetPrecision": 8,
+         "quotePrecision": 8, "filters": []},
+        {"symbol": "XRPUSDT", "status": "BREAK", "baseAsset": "XRP", "quoteAsset": "USDT", "baseAssetPrecision": 8,
+         "quotePrecision": 8, "filters": []},
+    ],
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, ttl_seconds=3600, exchange_info=EXCHANGE_INFO):
+    fetch_exchange_info = MagicMock(return_value=exchange_info)
+    clock = FakeClock()
+    cache = ExchangeInfoCache(fetch_exchange_info, os.path.join(tmp_path, "exchange_info.json"), ttl_seconds, clock)
+    return cache, fetch_exchange_info, clock
+
+
+def test_get_checksum_ignores_server_time():
+    assert get_checksum(EXCHANGE_INFO) == get_checksum({**EXCHANGE_INFO, "serverTime": 2})
+
+
+def test_get_downloads_once_within_ttl(tmp_path):
+    cache, fetch_exchange_info, clock = make_cache(tmp_path)
+
+    exchange_info, active_symbols, symbol_index = cache.get()
+    clock.now += 60
+    cache.get()
+
+    fetch_exchange_info.assert_called_once()
+    assert exchange_info == EXCHANGE_INFO
+    assert active_symbols == {"BTCUSDT"}
+    assert "BTCUSDT" in symbol_index
+    assert cache.metrics == {"hits": 1, "downloads": 1, "changes": 0}
+
+
+def test_get_downloads_again_after_ttl(tmp_path):
+    cache, fetch_exchange_info, clock = make_cache(tmp_path)
+
+    _, _, first_index = cache.get()
+    clock.now += 3601
+    _, _, second_index = cache.get()
+
+    # Nothing changed, so the symbol index and its parsed filters are kept
+    assert fetch_exchange_info.call_count == 2
+    assert second_index is first_index
+
+
+def test_get_rebuilds_index_when_symbols_change(tmp_path):
+    cache, fetch_exchange_info, clock = make_cache(tmp_path)
+    _, _, first_index = cache.get()
+
+    # A symbol starts trading
+    changed_exchange_info = json.loads(json.dumps(EXCHANGE_INFO))
+    changed_exchange_info["symbols"][1]["status"] = "TRADING"
+    fetch_exchange_info.return_value = changed_exchange_info
+    clock.now += 3601
+    _, active_symbols, second_index = cache.get()
+
+    assert second_index is not first_index
+    assert active_symbols == {"BTCUSDT", "XRPUSDT"}
+    assert cache.metrics["changes"] == 1
+
+
+def test_get_uses_persisted_copy(tmp_path):
+    cache, _, _ = make_cache(tmp_path)
+    cache.get()
+
+    # A new process starts with an empty memory cache
+    new_cache, fetch_exchange_info, _ = make_cache(tmp_path)
+    new_cache.clock.now += 60
+    exchange_info, active_symbols, symbol_index = new_cache.get()
+
+    fetch_exchange_info.assert_not_called()
+    assert exchange_info == EXCHANGE_INFO
+    assert active_symbols == {"BTCUSDT"}
+    assert symbol_index.filter_params == {"BTCUSDT": None}
+
+
+def test_get_ignores_unreadable_persisted_copy(tmp_path):
+    with open(os.path.join(tmp_path, "exchange_info.json"), "w") as file:
+        file.write("not json")
+    cache, fetch_exchange_info, _ = make_cache(tmp_path)
+
+    exchange_info, _, _ = cache.get()
+
+    fetch_exchange_info.assert_called_once()
+    assert exchange_info == EXCHANGE_INFO
+
+
+def test_get_without_ttl_always_downloads(tmp_path):
+    cache, fetch_exchange_info, _ = make_cache(tmp_path, ttl_seconds=0)
+
+    cache.get()
+    cache.get()
+
+    assert fetch_exchange_info.call_count == 2
+    assert not os.path.exists(os.path.join(tmp_path, "exchange_info.json"))
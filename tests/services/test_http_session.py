@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from mock_exchange.rest_server import MockExchangeServer, SyntheticMarket
+from services.http_session import configure_session, get_connection_stats
+
+
+@pytest.fixture
+def mock_server():
+    server = MockExchangeServer(SyntheticMarket(symbol_count=5), latency=0.01).start()
+    yield server
+    server.stop()
+
+
+def test_configure_session_mounts_pooled_adapter():
+    session = requests.Session()
+
+    adapter = configure_session(session, pool_size=8, max_hosts=2)
+
+    assert session.get_adapter("https://api.binance.com") is adapter
+    assert session.get_adapter("http://127.0.0.1") is adapter
+    assert adapter._pool_maxsize == 8
+    assert adapter._pool_connections == 2
+    assert session.headers["Accept-Encoding"] == "gzip, deflate"
+
+
+def test_configure_session_without_compression():
+    session = requests.Session()
+
+    configure_session(session, pool_size=1, compression=False)
+
+    assert session.headers["Accept-Encoding"] == "identity"
+
+
+def test_connection_stats_without_requests():
+    stats = get_connection_stats(requests.Session())
+
+    assert stats == {"requests": 0, "connections_opened": 0, "connections_reused": 0, "reuse_ratio": 0.0}
+
+
+def test_sequential_requests_reuse_one_connection(mock_server):
+    session = requests.Session()
+    configure_session(session, pool_size=4)
+
+    for _ in range(5):
+        session.get(f"{mock_server.url}/api/v3/ticker/price").raise_for_status()
+
+    stats = get_connection_stats(session)
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
+
+
+def test_concurrent_requests_stay_within_the_pool(mock_server):
+    session = requests.Session()
+    configure_session(session, pool_size=4)
+
+    def fetch(_):
+        session.get(f"{mock_server.url}/api/v3/klines", params={"symbol": "COIN0USDT", "limit": 5}).raise_for_status()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(fetch, range(40)))
+
+    stats = get_connection_stats(session)
+    assert stats["requests"] == 40
+    assert stats["connections_opened"] <= 4
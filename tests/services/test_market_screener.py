@@ -0,0 +1,80 @@
+import numpy as np
+
+from services.market_screener import load_ticker_table, screen_tickers
+from services.symbol_index import SymbolIndex
+
+SYMBOLS = [
+    {"symbol": symbol, "baseAsset": base, "quoteAsset": quote, "baseAssetPrecision": 8, "quotePrecision": 8,
+     "filters": []}
+    for symbol, base, quote in [
+        ("BTCUSDT", "BTC", "USDT"),
+        ("ETHBTC", "ETH", "BTC"),
+        ("SOLUSDT", "SOL", "USDT"),
+        ("DOGEFDUSD", "DOGE", "FDUSD"),
+    ]
+]
+SYMBOL_INDEX = SymbolIndex(SYMBOLS, {"BTCUSDT", "ETHBTC", "SOLUSDT", "DOGEFDUSD"})
+
+STATS = [
+    {"symbol": "BTCUSDT", "priceChangePercent": "6", "highPrice": "52000", "lowPrice": "49000",
+     "quoteVolume": "900000000", "bidPrice": "50000.00", "askPrice": "50000.01"},
+    {"symbol": "ETHBTC", "priceChangePercent": "-8", "highPrice": "0.060", "lowPrice": "0.050",
+     "quoteVolume": "1000", "bidPrice": "0.0550", "askPrice": "0.0551"},
+    {"symbol": "SOLUSDT", "priceChangePercent": "1", "highPrice": "110", "lowPrice": "100",
+     "quoteVolume": "50000000", "bidPrice": "105.00", "askPrice": "105.01"},
+    {"symbol": "DOGEFDUSD", "priceChangePercent": "12", "highPrice": "0.12", "lowPrice": "0.10",
+     "quoteVolume": "200000", "bidPrice": "0.100", "askPrice": "0.110"},
+    {"symbol": "XRPUSDT", "priceChangePercent": "20", "highPrice": "1.1", "lowPrice": "0.9"},
+]
+
+
+def screened_symbols(**screens):
+    table = load_ticker_table(STATS, SYMBOL_INDEX)
+    mask = screen_tickers(table, price_change_threshold=2, price_range_volatility_threshold=0.05, **screens)
+    return set(table["symbol"][mask])
+
+
+def test_load_ticker_table_skips_inactive_symbols():
+    table = load_ticker_table(STATS, SYMBOL_INDEX)
+
+    assert list(table["symbol"]) == ["BTCUSDT", "ETHBTC", "SOLUSDT", "DOGEFDUSD"]
+    assert list(table["base_asset"]) == ["BTC", "ETH", "SOL", "DOGE"]
+    assert list(table["quote_asset"]) == ["USDT", "BTC", "USDT", "FDUSD"]
+    np.testing.assert_array_equal(table["price_change_percent"], [6.0, -8.0, 1.0, 12.0])
+
+
+def test_load_ticker_table_missing_fields_are_nan():
+    table = load_ticker_table([{"symbol": "BTCUSDT", "priceChangePercent": "6"}], SYMBOL_INDEX)
+
+    assert table["price_change_percent"][0] == 6.0
+    assert np.isnan(table["quote_volume"][0])
+
+
+def test_load_ticker_table_empty():
+    table = load_ticker_table([], SYMBOL_INDEX)
+    mask = screen_tickers(table, price_change_threshold=2, price_range_volatility_threshold=0.05)
+
+    assert len(table["symbol"]) == 0
+    assert len(mask) == 0
+
+
+def test_screen_tickers_price_thresholds():
+    # SOLUSDT moved too little, the other ones pass both thresholds
+    assert screened_symbols() == {"BTCUSDT", "ETHBTC", "DOGEFDUSD"}
+
+
+def test_screen_tickers_min_quote_volume():
+    assert screened_symbols(min_quote_volume=100000) == {"BTCUSDT", "DOGEFDUSD"}
+
+
+def test_screen_tickers_quote_assets():
+    assert screened_symbols(quote_assets=["USDT", "FDUSD"]) == {"BTCUSDT", "DOGEFDUSD"}
+
+
+def test_screen_tickers_max_spread():
+    # DOGEFDUSD has a spread of almost 10%
+    assert screened_symbols(max_spread=0.01) == {"BTCUSDT", "ETHBTC"}
+
+
+def test_screen_tickers_combined():
+    assert screened_symbols(min_quote_volume=100000, quote_assets=["USDT"], max_spread=0.01) == {"BTCUSDT"}
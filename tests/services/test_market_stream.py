@@ -0,0 +1,159 @@
+import json
+import time
+
+import pytest
+
+from mock_exchange.stream_server import StreamReplayServer
+from services.market_stream import MarketState, MarketStream, kline_event_to_kline
+from tests.services.mock_data import HOUR_MS, MOCK_STREAM_FRAMES, make_kline_event, make_klines
+
+START = 1_700_000_000_000
+
+
+def wait_for(condition, timeout=5.0):
+    # Poll until the stream has delivered what the test waits for
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class FakeRestFetcher:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbols):
+        self.calls.append(list(symbols))
+        return {symbol: make_klines(START, 26) for symbol in symbols}
+
+
+@pytest.fixture
+def stream_server():
+    server = StreamReplayServer(MOCK_STREAM_FRAMES).start()
+    yield server
+    server.stop()
+
+
+def test_kline_event_to_kline():
+    kline = kline_event_to_kline(make_kline_event("BTCUSDT", START, 100.0)["data"]["k"])
+
+    assert kline == [START, "100.0", "101.0", "99.0", "100.0", "10.5", START + HOUR_MS - 1, "1050.0", 7, "5.0",
+                     "500.0", "0"]
+
+
+def test_market_state_merges_candles_by_open_time():
+    market_state = MarketState(candle_limit=26)
+    market_state.set_candlesticks("BTCUSDT", make_klines(START, 26))
+
+    # The open candle is updated and a new one starts
+    market_state.apply_message(make_kline_event("BTCUSDT", START + 25 * HOUR_MS, 600.0))
+    market_state.apply_message(make_kline_event("BTCUSDT", START + 26 * HOUR_MS, 700.0))
+
+    candles = market_state.get_candlesticks("BTCUSDT")
+    assert len(candles) == 26
+    assert candles[0][0] == START + HOUR_MS
+    assert candles[-2][4] == "600.0"
+    assert candles[-1][0] == START + 26 * HOUR_MS
+
+
+def test_market_state_tickers():
+    market_state = MarketState(candle_limit=26)
+    for frame in MOCK_STREAM_FRAMES[:2]:
+        market_state.apply_message(frame)
+
+    prices = market_state.get_prices()
+    stats = {stat["symbol"]: stat for stat in market_state.get_ticker_stats()}
+
+    assert {"symbol": "BTCUSDT", "price": "55000"} in prices
+    assert float(stats["BTCUSDT"]["priceChangePercent"]) == 10.0
+    assert float(stats["ETHUSDT"]["priceChangePercent"]) == -2.5
+    assert stats["BTCUSDT"]["bidPrice"] == "54999.99"
+    assert stats["BTCUSDT"]["askPrice"] == "55000.01"
+    assert "bidPrice" not in stats["ETHUSDT"]
+
+
+def test_market_state_ignores_subscription_responses():
+    market_state = MarketState(candle_limit=26)
+
+    market_state.apply_message({"result": None, "id": 1})
+
+    assert market_state.last_update is None
+
+
+def test_market_stream_backfills_and_streams(stream_server):
+    fetcher = FakeRestFetcher()
+    market_state = MarketState(candle_limit=26)
+    market_stream = MarketStream(market_state, fetcher, stream_server.url, "1h")
+
+    try:
+        market_stream.start(["BTCUSDT"])
+
+        # The streamed candles are merged on top of the backfilled ones
+        assert wait_for(lambda: market_state.get_candlesticks("BTCUSDT")[-1][0] == START + 26 * HOUR_MS)
+        assert wait_for(lambda: "BTCUSDT" in market_state.mini_tickers)
+    finally:
+        market_stream.stop()
+
+    assert fetcher.calls == [["BTCUSDT"]]
+    assert "btcusdt@kline_1h" in stream_server.subscriptions
+    assert "btcusdt@bookTicker" in stream_server.subscriptions
+    assert "!miniTicker@arr" in stream_server.subscriptions
+    assert len(market_state.get_candlesticks("BTCUSDT")) == 26
+
+
+def test_market_stream_only_subscribes_new_symbols(stream_server):
+    fetcher = FakeRestFetcher()
+    market_stream = MarketStream(MarketState(candle_limit=26), fetcher, stream_server.url, "1h")
+
+    try:
+        market_stream.start(["BTCUSDT"])
+        market_stream.subscribe(["BTCUSDT", "ETHUSDT"])
+    finally:
+        market_stream.stop()
+
+    assert fetcher.calls == [["BTCUSDT"], ["ETHUSDT"]]
+
+
+def test_market_stream_reconnects_and_backfills():
+    server = StreamReplayServer(MOCK_STREAM_FRAMES, close_after_replay=True).start()
+    fetcher = FakeRestFetcher()
+    market_stream = MarketStream(MarketState(candle_limit=26), fetcher, server.url, "1h", reconnect_delay=0.05)
+
+    try:
+        market_stream.start(["BTCUSDT"])
+        assert wait_for(lambda: market_stream.metrics["reconnects"] >= 1)
+    finally:
+        market_stream.stop()
+        server.stop()
+
+    # Every reconnect backfills the candles that may have been missed
+    assert server.connections >= 2
+    assert len(fetcher.calls) >= 2
+    assert fetcher.calls[1] == ["BTCUSDT"]
+
+
+def test_market_stream_tracks_the_connection(stream_server):
+    market_stream = MarketStream(MarketState(candle_limit=26), FakeRestFetcher(), stream_server.url, "1h")
+    assert not market_stream.connected
+
+    try:
+        market_stream.start(["BTCUSDT"])
+        assert market_stream.connected
+    finally:
+        market_stream.stop()
+
+    # The client reports a closed or failed connection through the same callback
+    market_stream.on_disconnect(None, ConnectionError("closed"))
+    assert not market_stream.connected
+
+
+def test_market_stream_skips_malformed_messages(stream_server):
+    market_stream = MarketStream(MarketState(candle_limit=26), FakeRestFetcher(), stream_server.url, "1h")
+
+    market_stream.on_message(None, json.dumps({"e": "kline", "s": "BTCUSDT"}))
+    market_stream.on_message(None, "not json")
+
+    assert market_stream.metrics["messages"] == 2
+    assert market_stream.metrics["reconnects"] == 0
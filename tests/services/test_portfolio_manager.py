@@ -21,7 +21,8 @@ def test_extract_balance_with_valid_data():
     ]
 
     # Mock Binance client
-    with patch("services.binance_auth.client.ticker_price", return_value=prices):
+    with patch("services.wallet_info.get_client") as mock_get_client:
+        mock_get_client.return_value.ticker_price.return_value = prices
         result = extract_balance(wallet_info)
 
         # Assert the result is calculated correctly
@@ -51,7 +52,8 @@ def test_extract_balance_with_no_balances():
     prices = []
 
     # Mock Binance client
-    with patch("services.binance_auth.client.ticker_price", return_value=prices):
+    with patch("services.wallet_info.get_client") as mock_get_client:
+        mock_get_client.return_value.ticker_price.return_value = prices
         result = extract_balance(wallet_info)
 
         # Assert that result is empty
@@ -0,0 +1,138 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from binance.error import ClientError
+
+from services.rate_limiter import RateLimiter, RateLimitedClient, get_request_weight, get_request_priority
+
+
+def test_get_request_weight():
+    # Weights depend on the endpoint and whether a symbol is given
+    assert get_request_weight("klines", {"symbol": "BTCUSDT"}) == 2
+    assert get_request_weight("ticker_24hr", {}) == 80
+    assert get_request_weight("ticker_24hr", {"symbol": "BTCUSDT"}) == 2
+    assert get_request_weight("ticker_price", {}) == 4
+    assert get_request_weight("unknown_endpoint", {}) == 1
+
+
+def test_get_request_priority_orders_before_candles():
+    assert get_request_priority("new_order_test") < get_request_priority("klines")
+    assert get_request_priority("new_order") < get_request_priority("ticker_24hr")
+
+
+def test_acquire_without_stall():
+    rate_limiter = RateLimiter(weight_limit=6000, safety_margin=0)
+
+    rate_limiter.acquire(20)
+
+    metrics = rate_limiter.get_metrics()
+    assert metrics["requests"] == 1
+    assert metrics["weight_used"] == 20
+    assert metrics["stalls"] == 0
+
+
+def test_acquire_stalls_when_bucket_is_empty():
+    # 6000 weight per minute refills 100 weight per second
+    rate_limiter = RateLimiter(weight_limit=6000, safety_margin=0)
+    rate_limiter.acquire(6000)
+
+    started_at = time.monotonic()
+    rate_limiter.acquire(10)
+    elapsed = time.monotonic() - started_at
+
+    metrics = rate_limiter.get_metrics()
+    assert elapsed >= 0.09
+    assert metrics["stalls"] == 1
+    assert metrics["stall_seconds"] > 0
+
+
+def test_update_used_weight_caps_available_tokens():
+    rate_limiter = RateLimiter(weight_limit=6000, safety_margin=0)
+
+    # The exchange reports the whole minute budget as used
+    rate_limiter.update_used_weight(5990)
+    started_at = time.monotonic()
+    rate_limiter.acquire(20)
+
+    assert time.monotonic() - started_at >= 0.09
+    assert rate_limiter.get_metrics()["last_used_weight"] == 5990
+
+
+def test_queued_requests_are_served_by_priority():
+    rate_limiter = RateLimiter(weight_limit=6000, safety_margin=0)
+    rate_limiter.block(0.2)
+    served = []
+
+    def request(name, priority):
+        rate_limiter.acquire(1, priority)
+        served.append(name)
+
+    # Queue candles first, then an order while everything is blocked
+    threads = [threading.Thread(target=request, args=("klines", 3))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads.append(threading.Thread(target=request, args=("new_order", 0)))
+    threads[1].start()
+
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert served == ["new_order", "klines"]
+
+
+def test_rate_limited_client_unwraps_limit_usage():
+    spot_client = MagicMock()
+    spot_client.klines.return_value = {"limit_usage": {"x-mbx-used-weight-1m": "42"}, "data": [[1, "2"]]}
+    rate_limiter = RateLimiter()
+    client = RateLimitedClient(spot_client, rate_limiter)
+
+    result = client.klines(symbol="BTCUSDT", interval="1h", limit=26)
+
+    assert result == [[1, "2"]]
+    spot_client.klines.assert_called_once_with(symbol="BTCUSDT", interval="1h", limit=26)
+    assert rate_limiter.get_metrics()["last_used_weight"] == 42
+    assert rate_limiter.get_metrics()["weight_used"] == 2
+
+
+def test_rate_limited_client_retries_after_rate_limit_error():
+    spot_client = MagicMock()
+    spot_client.ticker_price.side_effect = [
+        ClientError(429, -1003, "Too many requests", {"Retry-After": "0.05"}),
+        [{"symbol": "BTCUSDT", "price": "50000"}],
+    ]
+    rate_limiter = RateLimiter()
+    client = RateLimitedClient(spot_client, rate_limiter)
+
+    result = client.ticker_price()
+
+    assert result == [{"symbol": "BTCUSDT", "price": "50000"}]
+    assert spot_client.ticker_price.call_count == 2
+    assert rate_limiter.get_metrics()["rate_limit_errors"] == 1
+
+
+def test_rate_limited_client_takes_the_used_weight_of_a_rate_limit_error():
+    spot_client = MagicMock()
+    spot_client.ticker_price.side_effect = [
+        ClientError(429, -1003, "Too many requests", {"Retry-After": "0.05", "x-mbx-used-weight-1m": "6010"}),
+        [{"symbol": "BTCUSDT", "price": "50000"}],
+    ]
+    rate_limiter = RateLimiter()
+    client = RateLimitedClient(spot_client, rate_limiter)
+
+    client.ticker_price()
+
+    assert rate_limiter.get_metrics()["last_used_weight"] == 6010
+    assert rate_limiter.get_metrics()["rate_limit_errors"] == 1
+
+
+def test_rate_limited_client_raises_other_client_errors():
+    spot_client = MagicMock()
+    spot_client.account.side_effect = ClientError(401, -2014, "API-key format invalid.", {})
+    client = RateLimitedClient(spot_client, RateLimiter())
+
+    with pytest.raises(ClientError):
+        client.account()
+
+    spot_client.account.assert_called_once()
@@ -0,0 +1,115 @@
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.snapshot import (
+    RecordingClient, ReplayClient, get_request_key, list_snapshots, load_snapshot, save_snapshot,
+)
+from tests.services.mock_data import MOCK_EXCHANGE_INFO, MOCK_PRICES, make_klines
+
+
+def make_spot_client():
+    spot_client = MagicMock()
+    spot_client.exchange_info.return_value = MOCK_EXCHANGE_INFO
+    spot_client.ticker_price.return_value = MOCK_PRICES
+    spot_client.klines.return_value = make_klines(0, 3)
+    return spot_client
+
+
+def test_get_request_key_ignores_keyword_order():
+    assert get_request_key("klines", (), {"symbol": "BTCUSDT", "limit": 26}) == \
+           get_request_key("klines", (), {"limit": 26, "symbol": "BTCUSDT"})
+    assert get_request_key("klines", (), {"symbol": "BTCUSDT"}) != get_request_key("klines", (), {"symbol": "ETHUSDT"})
+
+
+def test_recording_client_passes_responses_through():
+    spot_client = make_spot_client()
+    recording_client = RecordingClient(spot_client)
+
+    assert recording_client.exchange_info() == MOCK_EXCHANGE_INFO
+    assert recording_client.klines(symbol="BTCUSDT", interval="1h", limit=3) == make_klines(0, 3)
+
+    assert recording_client.responses[get_request_key("exchange_info", (), {})] == [MOCK_EXCHANGE_INFO]
+    spot_client.klines.assert_called_once_with(symbol="BTCUSDT", interval="1h", limit=3)
+
+
+def test_recording_client_save_starts_a_new_snapshot(tmp_path):
+    recording_client = RecordingClient(make_spot_client())
+    recording_client.ticker_price()
+
+    file_path = recording_client.save(str(tmp_path))
+
+    assert file_path.endswith(".json.gz")
+    assert load_snapshot(file_path) == {get_request_key("ticker_price", (), {}): [MOCK_PRICES]}
+    assert recording_client.responses == {}
+    assert list_snapshots(str(tmp_path)) == [file_path]
+
+
+def test_save_and_load_snapshot(tmp_path):
+    responses = {get_request_key("klines", (), {"symbol": "BTCUSDT"}): [make_klines(0, 2)]}
+    file_path = os.path.join(str(tmp_path), "2024-01-01", "snapshot_2024-01-01_00-00-00.json.gz")
+
+    save_snapshot(responses, file_path)
+
+    assert load_snapshot(file_path) == responses
+
+
+def test_list_snapshots_in_recorded_order(tmp_path):
+    for date in ["2024-01-02", "2024-01-01"]:
+        save_snapshot({}, os.path.join(str(tmp_path), date, f"snapshot_{date}_00-00-00.json.gz"))
+
+    snapshots = list_snapshots(str(tmp_path))
+
+    assert [os.path.basename(path) for path in snapshots] == [
+        "snapshot_2024-01-01_00-00-00.json.gz", "snapshot_2024-01-02_00-00-00.json.gz",
+    ]
+
+
+def test_replay_client_serves_recorded_responses():
+    recording_client = RecordingClient(make_spot_client())
+    recording_client.exchange_info()
+    recording_client.klines(symbol="BTCUSDT", interval="1h", limit=3)
+
+    replay_client = ReplayClient(recording_client.responses)
+
+    assert replay_client.exchange_info() == MOCK_EXCHANGE_INFO
+    assert replay_client.klines(interval="1h", limit=3, symbol="BTCUSDT") == make_klines(0, 3)
+
+
+def test_replay_client_serves_repeated_requests_in_order():
+    key = get_request_key("account", (), {})
+    replay_client = ReplayClient({key: [{"balances": [1]}, {"balances": [2]}]})
+
+    assert replay_client.account() == {"balances": [1]}
+    assert replay_client.account() == {"balances": [2]}
+    assert replay_client.account() == {"balances": [2]}
+
+
+def test_replay_client_answers_single_symbol_from_all_symbols():
+    replay_client = ReplayClient({get_request_key("ticker_price", (), {}): [MOCK_PRICES]})
+
+    assert replay_client.ticker_price(symbol="ETHUSDT") == {"symbol": "ETHUSDT", "price": "4000"}
+
+
+def test_replay_client_simulates_test_orders():
+    replay_client = ReplayClient({})
+
+    assert replay_client.new_order_test(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=1) == {}
+
+
+def test_replay_client_raises_for_missing_responses():
+    replay_client = ReplayClient({})
+
+    with pytest.raises(KeyError):
+        replay_client.klines(symbol="BTCUSDT", interval="1h", limit=3)
+
+
+def test_replay_client_load(tmp_path):
+    file_path = os.path.join(str(tmp_path), "2024-01-01", "snapshot_2024-01-01_00-00-00.json.gz")
+    save_snapshot({get_request_key("ticker_price", (), {}): [MOCK_PRICES]}, file_path)
+
+    replay_client = ReplayClient()
+    replay_client.load(file_path)
+
+    assert replay_client.ticker_price() == MOCK_PRICES
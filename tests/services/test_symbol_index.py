@@ -0,0 +1,76 @@
+from services.symbol_index import SymbolIndex
+
+VALID_FILTERS = [
+    {"filterType": "PRICE_FILTER", "minPrice": "0.01", "maxPrice": "1000000", "tickSize": "0.01"},
+    {"filterType": "LOT_SIZE", "minQty": "0.00001", "maxQty": "9000", "stepSize": "0.00001"},
+    {"filterType": "NOTIONAL", "minNotional": "5"},
+    {"filterType": "TRAILING_DELTA", "minTrailingAboveDelta": "10", "maxTrailingAboveDelta": "2000",
+     "minTrailingBelowDelta": "10", "maxTrailingBelowDelta": "2000"},
+]
+
+SYMBOLS = [
+    {"symbol": "BTCUSDT", "baseAsset": "BTC", "quoteAsset": "USDT", "baseAssetPrecision": 8, "quotePrecision": 8,
+     "filters": VALID_FILTERS},
+    {"symbol": "ETHBTC", "baseAsset": "ETH", "quoteAsset": "BTC", "baseAssetPrecision": 8, "quotePrecision": 8,
+     "filters": []},
+    {"symbol": "BTCFDUSD", "baseAsset": "BTC", "quoteAsset": "FDUSD", "baseAssetPrecision": 8, "quotePrecision": 8,
+     "filters": []},
+    {"symbol": "XRPBTC", "baseAsset": "XRP", "quoteAsset": "BTC", "baseAssetPrecision": 8, "quotePrecision": 8,
+     "filters": []},
+]
+ACTIVE_SYMBOLS = {"BTCUSDT", "ETHBTC", "BTCFDUSD"}
+
+
+def test_symbol_index_skips_inactive_symbols():
+    symbol_index = SymbolIndex(SYMBOLS, ACTIVE_SYMBOLS)
+
+    assert "BTCUSDT" in symbol_index
+    assert "XRPBTC" not in symbol_index
+    assert symbol_index.get_pairs("XRP") == []
+
+
+def test_symbol_index_pairs_by_asset():
+    symbol_index = SymbolIndex(SYMBOLS, ACTIVE_SYMBOLS)
+
+    # Pairs keep the exchange order, whether the coin is the base or the quote asset
+    assert symbol_index.get_pairs("BTC") == ["BTCUSDT", "ETHBTC", "BTCFDUSD"]
+    assert symbol_index.base_pairs["BTC"] == ["BTCUSDT", "BTCFDUSD"]
+    assert symbol_index.quote_pairs["BTC"] == ["ETHBTC"]
+    assert symbol_index.get_pairs("UNKNOWN") == []
+
+
+def test_symbol_index_pairs_are_a_copy():
+    symbol_index = SymbolIndex(SYMBOLS, ACTIVE_SYMBOLS)
+
+    symbol_index.get_pairs("BTC").append("XRPBTC")
+
+    assert symbol_index.get_pairs("BTC") == ["BTCUSDT", "ETHBTC", "BTCFDUSD"]
+
+
+def test_symbol_index_metadata():
+    symbol_index = SymbolIndex(SYMBOLS, ACTIVE_SYMBOLS)
+
+    assert symbol_index.get_base_asset("ETHBTC") == "ETH"
+    assert symbol_index.metadata["BTCUSDT"] == {
+        "baseAsset": "BTC",
+        "quoteAsset": "USDT",
+        "pricePrecision": 8,
+        "qtyPrecision": 8,
+        "filters": VALID_FILTERS,
+    }
+
+
+def test_symbol_index_parses_filters_once():
+    symbol_index = SymbolIndex(SYMBOLS, ACTIVE_SYMBOLS)
+
+    filter_params = symbol_index.get_filter_params("BTCUSDT")
+
+    assert filter_params["lot_size"]["step_size"] == 0.00001
+    assert filter_params["notional"]["min_notional"] == 5.0
+    assert symbol_index.get_filter_params("BTCUSDT") is filter_params
+
+
+def test_symbol_index_filters_missing():
+    symbol_index = SymbolIndex(SYMBOLS, ACTIVE_SYMBOLS)
+
+    assert symbol_index.get_filter_params("ETHBTC") is None
@@ -0,0 +1,187 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from indicators.indicator_records import build_indicator_records
+from strategies.scoring_engine import ScoringEngine
+from strategies.scoring_systems import REQUIRED_INDICATOR_FIELDS, SCORING_SYSTEMS, get_required_fields
+from tests.strategies.scoring_engine import reference_scoring_systems
+
+# Mock `load_config_values`
+with patch("utils.file_utils.load_config_values", return_value={"BUY_CONDITION": 10, "SELL_CONDITION": -10}):
+    from strategies.base_strategy import rank_coins
+
+NAN = float("nan")
+
+# Ordinary coins, missing MACD fields, signed zeros, values far beyond the clamp and NaN
+MOCK_INDICATORS = {
+    "BTC": {
+        'trend': {'SMA': 101.5, 'above_SMA': True, 'EMA': 100.25, 'MACD_histogram': 0.75, 'MACD_trend': "bullish"},
+        'momentum': {'RSI': 62.5, 'Stochastic_%K': 80.0, 'Stochastic_%D': 75.5, 'Stochastic_signal': "bullish"},
+        'volatility': {'ATR': 3.2, 'Bollinger_width': 4.1, 'close_above_upper': True, 'close_below_lower': False},
+    },
+    "ETH": {
+        'trend': {'SMA': 2.3456, 'above_SMA': False, 'EMA': 2.3111, 'MACD_histogram': -0.0123, 'MACD_trend': "bearish"},
+        'momentum': {'RSI': 24.75, 'Stochastic_%K': 12.5, 'Stochastic_%D': 18.25, 'Stochastic_signal': "oversold"},
+        'volatility': {'ATR': 0.1234, 'Bollinger_width': 0.4567, 'close_above_upper': False, 'close_below_lower': True},
+    },
+    "XRP": {
+        'trend': {'SMA': 0.5123, 'above_SMA': None, 'EMA': 0.5, 'MACD_trend': "neutral"},
+        'momentum': {'RSI': 30.0, 'Stochastic_%K': 50.0, 'Stochastic_%D': 50.0, 'Stochastic_signal': None},
+        'volatility': {'ATR': 0.0, 'Bollinger_width': -0.0, 'close_above_upper': False, 'close_below_lower': False},
+    },
+    "DOGE": {
+        'trend': {'SMA': -250000.0, 'above_SMA': True, 'EMA': 1e6, 'MACD_histogram': 1e5},
+        'momentum': {'RSI': 99.9, 'Stochastic_%K': 100.0, 'Stochastic_%D': 0.0, 'Stochastic_signal': "bullish"},
+        'volatility': {'ATR': -1e6, 'Bollinger_width': 1e6, 'close_above_upper': True, 'close_below_lower': True},
+    },
+    "NAN": {
+        'trend': {'SMA': NAN, 'above_SMA': True, 'EMA': NAN, 'MACD_histogram': NAN, 'MACD_trend': "bullish"},
+        'momentum': {'RSI': NAN, 'Stochastic_%K': NAN, 'Stochastic_%D': 1.0, 'Stochastic_signal': "bearish"},
+        'volatility': {'ATR': NAN, 'Bollinger_width': NAN, 'close_above_upper': False, 'close_below_lower': False},
+    },
+}
+
+# Scores of scoring_system_1..10 as the reference functions calculate them
+EXPECTED_SYSTEM_SCORES = {
+    "BTC": [-70.55000000000001, -73.75, -100, -71.97, 99.83888888888887, -62.51111111111111, 14.369999999999997, 29.7,
+            70.02000000000001, 56.06],
+    "ETH": [16.964779999999998, 18.1055, 5.7952, -5.648715, 15.105411111111112, 14.844350000000002, 21.2874,
+            -8.986799999999999, -9.709328, 12.244470000000002],
+    "XRP": [23.38524, 24.859625, 11.103475, -4.384225, 20.333333333333332, 21.154366666666668, 26.79508, 0.0, -4.24,
+            21.5],
+    "DOGE": [100, 100, 100, 100, 100, -100, 100, 100, 100, 100],
+    "NAN": [100, 100, 100, 100, 100, 100, 100, 100, 100, 100],
+}
+EXPECTED_SCORES = {
+    "BTC": -10.87922222222222,
+    "ETH": 8.000226811111112,
+    "XRP": 14.0506895,
+    "DOGE": 80.0,
+    "NAN": 100.0,
+}
+
+
+def make_indicators(coin_count, seed):
+    # Random coins with NaN, signed zeros, values beyond the clamp, missing MACD fields and every signal
+    rng = random.Random(seed)
+    signals = ["bullish", "bearish", "neutral", "overbought", None]
+
+    def make_value():
+        edge_case = rng.random()
+        if edge_case < 0.05:
+            return NAN
+        if edge_case < 0.1:
+            return rng.choice([0.0, -0.0, 30.0, 1e6, -1e6])
+        return rng.uniform(-500, 500)
+
+    indicators = {}
+    for index in range(coin_count):
+        trend = {'SMA': make_value(), 'above_SMA': rng.choice([True, False, None]), 'EMA': make_value(),
+                 'MACD_histogram': make_value(), 'MACD_trend': rng.choice(signals)}
+        for field in ['MACD_histogram', 'MACD_trend']:
+            if rng.random() < 0.1:
+                del trend[field]
+        indicators[f"COIN{index}"] = {
+            'trend': trend,
+            'momentum': {'RSI': make_value(), 'Stochastic_%K': make_value(), 'Stochastic_%D': make_value(),
+                         'Stochastic_signal': rng.choice(signals)},
+            'volatility': {'ATR': make_value(), 'Bollinger_width': make_value(),
+                           'close_above_upper': rng.choice([True, False]),
+                           'close_below_lower': rng.choice([True, False])},
+        }
+    return indicators
+
+
+def test_expected_scores_are_the_scores_of_the_reference_functions():
+    for coin, coin_indicators in MOCK_INDICATORS.items():
+        assert [getattr(reference_scoring_systems, system["name"])(coin_indicators)
+                for system in SCORING_SYSTEMS] == EXPECTED_SYSTEM_SCORES[coin]
+        assert reference_scoring_systems.calculate_score(coin_indicators) == EXPECTED_SCORES[coin]
+
+
+@pytest.mark.parametrize("indicators", [MOCK_INDICATORS, make_indicators(2000, seed=7)], ids=["mock", "random"])
+def test_engine_matches_the_reference_functions(indicators):
+    engine = ScoringEngine()
+
+    system_scores = engine.score_matrix(indicators).tolist()
+    scores = engine.calculate_scores(indicators)
+
+    # Exactly, not approximately
+    for row, (coin, coin_indicators) in enumerate(indicators.items()):
+        assert system_scores[row] == [getattr(reference_scoring_systems, system["name"])(coin_indicators)
+                                      for system in SCORING_SYSTEMS]
+        assert scores[coin] == reference_scoring_systems.calculate_score(coin_indicators)
+
+
+def test_every_system_gives_the_expected_scores():
+    scores = ScoringEngine().score_matrix(MOCK_INDICATORS)
+
+    # Exactly, not approximately
+    assert scores.tolist() == list(EXPECTED_SYSTEM_SCORES.values())
+
+
+def test_calculate_scores():
+    scores = ScoringEngine().calculate_scores(MOCK_INDICATORS)
+
+    assert scores == EXPECTED_SCORES
+    assert all(type(score) is float for score in scores.values())
+
+
+def test_calculate_scores_of_indicator_records():
+    records = build_indicator_records({coin: MOCK_INDICATORS[coin] for coin in ["BTC", "ETH", "XRP"]})
+
+    assert ScoringEngine().calculate_scores(records) == {coin: EXPECTED_SCORES[coin] for coin in records}
+
+
+def test_calculate_scores_without_coins():
+    assert ScoringEngine().calculate_scores({}) == {}
+
+
+def test_missing_fields_raise_a_key_error():
+    indicators = {"BTC": {**MOCK_INDICATORS["BTC"], 'momentum': {'Stochastic_signal': "bullish"}}}
+
+    with pytest.raises(KeyError, match="RSI"):
+        ScoringEngine().calculate_scores(indicators)
+
+
+def test_candidate_systems_with_grouped_terms():
+    indicators = {"BTC": MOCK_INDICATORS["BTC"]}
+    candidates = [
+        {"name": "rsi_only", "divisor": 1, "terms": [('RSI', 1)]},
+        {"name": "grouped", "divisor": 4, "terms": [[('RSI', 0.5), ('Stochastic_bullish_sign', 4)], ('ATR', -1)]},
+        {"name": "clamped", "divisor": 0.1, "terms": [('RSI', 1)]},
+    ]
+
+    scores = ScoringEngine(candidates).score_matrix(indicators)
+
+    assert scores.tolist() == [[62.5, (31.25 + 4.0 - 3.2) / 4, 100.0]]
+
+
+def test_candidate_systems_only_read_their_fields():
+    candidates = [{"name": "rsi_only", "divisor": 1, "terms": [('RSI', 1)]}]
+
+    assert get_required_fields(candidates) == {'momentum': ['RSI']}
+    assert ScoringEngine(candidates).calculate_scores({"BTC": {'momentum': {'RSI': 50.0}}}) == {"BTC": 50.0}
+
+
+def test_required_fields_of_the_scoring_systems():
+    assert REQUIRED_INDICATOR_FIELDS == {
+        'trend': ['SMA', 'MACD_histogram', 'above_SMA', 'EMA', 'MACD_trend'],
+        'momentum': ['RSI', 'Stochastic_signal', 'Stochastic_%K', 'Stochastic_%D'],
+        'volatility': ['ATR', 'Bollinger_width', 'close_above_upper', 'close_below_lower'],
+    }
+
+
+def test_unknown_feature():
+    with pytest.raises(ValueError, match="Unknown scoring feature 'MFI' in custom"):
+        ScoringEngine([{"name": "custom", "divisor": 1, "terms": [('MFI', 1.0)]}])
+
+
+def test_rank_coins_sorts_by_score():
+    indicators = {coin: MOCK_INDICATORS[coin] for coin in ["BTC", "ETH", "XRP", "DOGE"]}
+
+    rankings = rank_coins(indicators)
+
+    assert rankings == [{"coin": coin, "score": EXPECTED_SCORES[coin]} for coin in ["DOGE", "XRP", "ETH", "BTC"]]
@@ -0,0 +1,31 @@
+from strategies.scoring_engine import ScoringEngine
+from strategies.scoring_systems import REQUIRED_INDICATOR_FIELDS
+
+
+class RecordingFields(dict):
+    # Indicator fields that remember which of them were read
+    def __init__(self, values, read_fields):
+        super().__init__(values)
+        self.read_fields = read_fields
+
+    def __getitem__(self, key):
+        self.read_fields.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.read_fields.add(key)
+        return super().get(key, default)
+
+
+def test_scoring_systems_only_read_the_required_fields():
+    values = {
+        'trend': {'SMA': 100.0, 'above_SMA': True, 'EMA': 101.0, 'MACD_histogram': 0.5, 'MACD_trend': "bullish"},
+        'momentum': {'RSI': 55.0, 'Stochastic_%K': 60.0, 'Stochastic_%D': 58.0, 'Stochastic_signal': "neutral"},
+        'volatility': {'ATR': 2.0, 'Bollinger_width': 4.0, 'close_above_upper': False, 'close_below_lower': False},
+    }
+    read_fields = {category: set() for category in values}
+    indicators = {category: RecordingFields(fields, read_fields[category]) for category, fields in values.items()}
+
+    ScoringEngine().calculate_scores({"BTC": indicators})
+
+    assert read_fields == {category: set(fields) for category, fields in REQUIRED_INDICATOR_FIELDS.items()}
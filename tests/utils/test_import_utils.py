@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.import_utils import lazy_import
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules that are executed when they are loaded, a lazily imported module only sits in sys.modules until it is used
+HEAVY_MODULES = {
+    "pandas": "pandas.core.frame",
+    "binance": "binance.spot",
+    "requests": "requests.sessions",
+    "websocket": "binance.websocket.websocket_client",
+}
+
+# NumPy is still loaded by the indicators and the candle store, only the strategies leave it out
+NUMPY_MODULE = {"numpy": "numpy.linalg"}
+
+
+def get_loaded_modules(module, heavy_modules=HEAVY_MODULES):
+    # Import the module in a fresh interpreter without API keys, like a unit test or the benchmark would
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': seconds, 'loaded': [name for name, probe in {heavy_modules!r}.items() "
+        "if probe in sys.modules]}))\n"
+    )
+    environment = {key: value for key, value in os.environ.items() if not key.startswith("BINANCE_API")}
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=environment, capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_lazy_import_loads_on_first_use():
+    module = lazy_import("colorsys")
+
+    # The module works like a normal import
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert sys.modules["colorsys"] is module
+
+
+def test_lazy_import_returns_loaded_module():
+    assert lazy_import("json") is json
+
+
+@pytest.mark.parametrize("module", ["strategies.base_strategy", "indicators.indicator_base", "services.data_fetcher"])
+def test_import_does_not_load_heavy_modules(module):
+    result = get_loaded_modules(module)
+
+    assert result["loaded"] == []
+
+    # Generous budget, importing any of these took half a second while pandas and the client were loaded eagerly
+    assert result["seconds"] < 2
+
+
+def test_strategy_import_does_not_load_numpy():
+    assert get_loaded_modules("strategies.base_strategy", NUMPY_MODULE)["loaded"] == []
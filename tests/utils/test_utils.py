@@ -2,10 +2,20 @@ import json
 import os
 from unittest.mock import patch, mock_open, MagicMock
 
+import numpy as np
 import pytest
 import yaml
 
-from utils.file_utils import save_data_to_file, load_config_values
+from services.candle_store import klines_to_records
+from utils import file_utils
+from utils.file_utils import ConfigFile, save_data_to_file, load_config_values, to_json_value
+
+
+@pytest.fixture(autouse=True)
+def unparsed_config_file():
+    # Every test reads the (mocked) config file again instead of the values parsed by an earlier test
+    with patch.object(file_utils, "config_file", ConfigFile(os.path.join("config", "config.yaml"))):
+        yield
 
 
 def test_save_data_to_file_creates_directory():
@@ -64,6 +74,17 @@ def test_save_data_to_file_creates_correct_file():
         assert written_content == json.dumps(test_data, indent=4)
 
 
+def test_to_json_value_writes_candle_records():
+    records = klines_to_records([[1000, "1.5", "2.0", "1.0", "1.8", "10", 1999, "18", 3, "5", "9", "0"]])
+
+    # Records become one list per candle, NumPy scalars their Python value
+    result = json.loads(json.dumps({"candles": records, "count": np.int64(1)}, default=to_json_value))
+
+    assert result == {"candles": [[1000, 1.5, 2.0, 1.0, 1.8, 10.0, 1999, 18.0, 3, 5.0, 9.0]], "count": 1}
+    with pytest.raises(TypeError):
+        to_json_value(object())
+
+
 def test_load_config_values_success():
     config = {
         "key1": "value1",
@@ -106,3 +127,78 @@ def test_load_config_values_missing_key():
             patch("os.path.exists", return_value=True):
         with pytest.raises(KeyError, match="Key 'key2' is missing in the config file"):
             load_config_values("key1", "key2")
+
+
+def write_config(path, values):
+    with open(path, "w") as file:
+        yaml.dump(values, file)
+
+
+def test_config_file_is_parsed_once(tmp_path):
+    config_path = str(tmp_path / "config.yaml")
+    write_config(config_path, {"key1": {"nested": 1}, "key2": 2})
+    config_file = ConfigFile(config_path)
+
+    with patch("utils.file_utils.yaml.safe_load", wraps=yaml.safe_load) as mock_safe_load:
+        first = config_file.select(["key1"])
+        second = config_file.select(["key1", "key2"])
+
+    assert mock_safe_load.call_count == 1
+    assert second == {"key1": {"nested": 1}, "key2": 2}
+
+    # Every module gets its own copy of the values
+    first["key1"]["nested"] = 5
+    assert config_file.select(["key1"]) == {"key1": {"nested": 1}}
+
+
+def test_config_reload_updates_the_loaded_values(tmp_path):
+    config_path = str(tmp_path / "config.yaml")
+    write_config(config_path, {"key1": 1, "key2": {"nested": 2}})
+    config_file = ConfigFile(config_path)
+    with patch.object(file_utils, "config_file", config_file):
+        module_config = load_config_values("key2")
+
+        # Nothing changed yet
+        assert not file_utils.reload_config_values()
+
+        write_config(config_path, {"key1": 1, "key2": {"nested": 3, "added": True}})
+        os.utime(config_path, ns=(0, os.stat(config_path).st_mtime_ns + 1_000_000))
+
+        assert file_utils.reload_config_values()
+    assert module_config == {"key2": {"nested": 3, "added": True}}
+
+
+def test_config_reload_keeps_the_values_when_a_key_is_missing(tmp_path):
+    config_path = str(tmp_path / "config.yaml")
+    write_config(config_path, {"key1": 1, "key2": 2})
+    config_file = ConfigFile(config_path)
+    first = config_file.select(["key1"])
+    second = config_file.select(["key2"])
+    config_file.handed_out.extend([first, second])
+
+    write_config(config_path, {"key1": 10})
+    os.utime(config_path, ns=(0, os.stat(config_path).st_mtime_ns + 1_000_000))
+
+    # The broken file is reported on every reload, not only the first one
+    for _ in range(2):
+        with pytest.raises(KeyError, match="Key 'key2' is missing in the config file"):
+            config_file.reload()
+    assert first == {"key1": 1}
+    assert second == {"key2": 2}
+    assert config_file.values == {"key1": 1, "key2": 2}
+
+    # Once the file is fixed, the new values are loaded
+    write_config(config_path, {"key1": 10, "key2": 20})
+    os.utime(config_path, ns=(0, os.stat(config_path).st_mtime_ns + 2_000_000))
+
+    assert config_file.reload()
+    assert first == {"key1": 10}
+    assert second == {"key2": 20}
+
+
+def test_config_file_must_hold_a_mapping(tmp_path):
+    config_path = str(tmp_path / "config.yaml")
+    write_config(config_path, ["key1", "key2"])
+
+    with pytest.raises(yaml.YAMLError, match="The config file must hold keys with values, not list"):
+        ConfigFile(config_path).select(["key1"])
@@ -1,9 +1,30 @@
+import copy
 import json
 import os
 from datetime import datetime
 
 import yaml
 
+from utils.import_utils import lazy_import
+
+# Only needed to write NumPy values, most modules reading the config never load it
+np = lazy_import("numpy")
+
+
+def get_data_path(file_path):
+    # Resolve a folder inside the project's data directory
+    base_dir = os.path.dirname(os.path.dirname(__file__))
+    return os.path.join(base_dir, "data", file_path)
+
+
+def to_json_value(value):
+    # NumPy values json can't write itself, e.g. the candle records of each pair
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
 
 def save_data_to_file(data, file_path, file_name):
     # Define timestamps, filename and folder name
@@ -19,7 +40,7 @@ def save_data_to_file(data, file_path, file_name):
     # Save the data as JSON
     file_path = os.path.join(directory, filename)
     with open(file_path, "w") as file:
-        json.dump(data, file, indent=4)
+        json.dump(data, file, indent=4, default=to_json_value)
 
 
 # TODO: Write tests for this function
@@ -59,23 +80,81 @@ def load_data_from_file(file_path, file_name):
     return data
 
 
-def load_config_values(*keys):
-    config_path = os.path.join("config", "config.yaml")
+class ConfigFile:
+    # The parsed config file, shared by every module and only parsed again once the file changed
+    def __init__(self, path):
+        self.path = path
+        self.values = None
+        self.version = None
+        self.handed_out = []
+
+    def get_version(self):
+        # None for a missing file, so parsing it reports what is wrong
+        if not os.path.exists(self.path):
+            return None
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def parse(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Config file not found at '{self.path}'")
+
+        version = self.get_version()
+        with open(self.path, "r") as file:
+            try:
+                values = yaml.safe_load(file)
+            except yaml.YAMLError as e:
+                raise yaml.YAMLError(f"Error while parsing the config file: {str(e)}")
 
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"Config file not found at '{config_path}'")
+        # Every module looks its values up by key, so the file must hold a mapping
+        if not isinstance(values, dict):
+            raise yaml.YAMLError(f"The config file must hold keys with values, not {type(values).__name__}")
 
-    with open(config_path, "r") as file:
-        try:
-            config = yaml.safe_load(file)
-        except yaml.YAMLError as e:
-            raise yaml.YAMLError(f"Error while parsing the config file: {str(e)}")
+        return values, version
 
-    # Extract the requested keys
-    requested_values = {}
-    for key in keys:
-        if key not in config:
-            raise KeyError(f"Key '{key}' is missing in the config file")
-        requested_values[key] = config[key]
+    def read(self):
+        if self.values is None or self.get_version() != self.version:
+            self.values, self.version = self.parse()
+        return self.values
 
+    def select(self, keys, values=None):
+        # Copies, so a module changing its values (e.g. a benchmark switching backends) does not change others
+        values = self.read() if values is None else values
+        requested_values = {}
+        for key in keys:
+            if key not in values:
+                raise KeyError(f"Key '{key}' is missing in the config file")
+            requested_values[key] = copy.deepcopy(values[key])
+
+        return requested_values
+
+    def reload(self):
+        # Update the values handed out before in place when the file changed, so every module reads the new ones
+        if self.values is not None and self.get_version() == self.version:
+            return False
+
+        # Select every update before anything is kept, so a broken file leaves all modules and the parsed values
+        # unchanged and raises again on every reload until it is fixed
+        values, version = self.parse()
+        updates = [self.select(list(requested_values), values) for requested_values in self.handed_out]
+
+        self.values = values
+        self.version = version
+        for requested_values, update in zip(self.handed_out, updates):
+            requested_values.update(update)
+        return True
+
+
+# Parsed once for all modules instead of once per module
+config_file = ConfigFile(os.path.join("config", "config.yaml"))
+
+
+def load_config_values(*keys):
+    requested_values = config_file.select(keys)
+    config_file.handed_out.append(requested_values)
     return requested_values
+
+
+def reload_config_values():
+    # Returns whether the config file changed, values read once at import (e.g. which caches exist) stay as they are
+    return config_file.reload()
@@ -0,0 +1,16 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    # Module that is only executed on its first attribute access, so importing code that rarely needs it stays cheap
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module